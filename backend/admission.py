@@ -0,0 +1,155 @@
+# PMO_Report_Automation/backend/admission.py
+
+# 報告請求的流量控制：
+#   - AdmissionController 限制同時產生報告的請求數；超過時請求在佇列中等待，
+#     佇列已滿時立即回應 429，等待超過時限時回應 503，兩者皆附 Retry-After。
+#   - RequestSizeLimitMiddleware 在解析 multipart 表單之前檢查請求總大小 (Content-Length 或實際讀取的位元組數)，
+#     超過上限即回應 413，不必先將整個請求寫入暫存檔。
+# 目前執行中與等待中的請求數，以及依原因統計的拒絕次數，供 /metrics 與 /admin/admission 查詢。
+
+import asyncio
+import logging
+import re
+from contextlib import asynccontextmanager
+
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+# 拒絕原因
+SHED_QUEUE_FULL = "queue_full"
+SHED_QUEUE_TIMEOUT = "queue_timeout"
+SHED_TOO_MANY_DECKS = "too_many_decks"
+SHED_REQUEST_TOO_LARGE = "request_too_large"
+SHED_UPLOAD_TOO_LARGE = "upload_too_large"
+SHED_EXECUTOR_SATURATED = "executor_saturated"
+SHED_JOBS_QUEUE_FULL = "jobs_queue_full"
+SHED_REASONS = (SHED_QUEUE_FULL, SHED_QUEUE_TIMEOUT, SHED_TOO_MANY_DECKS, SHED_REQUEST_TOO_LARGE,
+                SHED_UPLOAD_TOO_LARGE, SHED_EXECUTOR_SATURATED, SHED_JOBS_QUEUE_FULL)
+
+
+# 請求未獲准進入 (佇列已滿或等待逾時)
+class AdmissionRejected(Exception):
+    def __init__(self, status_code, reason, message, retry_after):
+        super().__init__(message)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    def __init__(self, max_concurrent, max_queue, queue_timeout, retry_after):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.active = 0
+        self.waiting = 0
+        self.shed = {reason: 0 for reason in SHED_REASONS}
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+    # 記錄一次拒絕
+    def record_shed(self, reason):
+        self.shed[reason] = self.shed.get(reason, 0) + 1
+
+    # 取得執行名額，離開時釋放；未獲准時拋出 AdmissionRejected
+    @asynccontextmanager
+    async def slot(self):
+        if not self._semaphore.locked():
+            # 有空閒名額時不經過佇列 (acquire 不會讓出事件迴圈，檢查與取得之間不會有其他請求插入)
+            await self._semaphore.acquire()
+        elif self.waiting >= self.max_queue:
+            self.record_shed(SHED_QUEUE_FULL)
+            logger.warning("⛔ 報告請求佇列已滿 (執行中 %d，等待中 %d)，拒絕請求。", self.active, self.waiting)
+            raise AdmissionRejected(429, SHED_QUEUE_FULL, "目前產生報告的請求過多，請稍後再試。", self.retry_after)
+        else:
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.record_shed(SHED_QUEUE_TIMEOUT)
+                logger.warning("⛔ 報告請求等待超過 %g 秒，拒絕請求。", self.queue_timeout)
+                raise AdmissionRejected(503, SHED_QUEUE_TIMEOUT, "等待產生報告的時間過長，請稍後再試。", self.retry_after)
+            finally:
+                self.waiting -= 1
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def stats(self):
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout,
+            "shed": dict(self.shed),
+        }
+
+
+# 限制指定路徑的請求總大小的 ASGI 中介層；max_bytes 為 0 時不限制。
+# 沒有 Content-Length (chunked) 的請求於讀取時累計位元組數，超過上限即中斷讀取並改為回應 413。
+class RequestSizeLimitMiddleware:
+    def __init__(self, app, max_bytes, path_pattern, on_reject=None):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_pattern = re.compile(path_pattern)
+        self.on_reject = on_reject
+
+    def _reject_response(self):
+        if self.on_reject is not None:
+            self.on_reject()
+        detail = f"請求總大小超過 {self.max_bytes / (1024 * 1024):.0f} MB 的上限。"
+        return JSONResponse({"detail": detail}, status_code=413, headers={"Connection": "close"})
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or not self.max_bytes or scope["method"] != "POST"
+                or not self.path_pattern.match(scope["path"])):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._reject_response()(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            if exceeded:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        # 超過上限後，內層應用程式的回應改為 413
+        async def guarded_send(message):
+            nonlocal response_started
+            if exceeded:
+                if message["type"] == "http.response.start" and not response_started:
+                    response_started = True
+                    await self._reject_response()(scope, receive, send)
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not exceeded:
+                raise
+            if not response_started:
+                await self._reject_response()(scope, receive, send)
@@ -0,0 +1,169 @@
+# PMO_Report_Automation/backend/assets.py
+
+# 前端頁面與靜態檔案的記憶體內服務：
+#   - 啟動時讀入所有檔案，文字類檔案預先以 gzip (及 brotli，若已安裝 brotli 套件) 壓縮，
+#     依請求的 Accept-Encoding 選擇回應的版本
+#   - 每個版本有各自的強 ETag，If-None-Match 符合時回應 304
+#   - 靜態檔案另提供含內容雜湊的網址 (/static/名稱.雜湊.副檔名)，可長期快取 (immutable)；
+#     前端頁面中引用靜態檔案的網址於載入時改為含雜湊的網址。前端頁面本身每次向伺服器確認 (no-cache)。
+# brotli 壓縮等級高時較耗時，由 precompress_brotli 於服務啟動後在背景執行；完成前以 gzip 回應。
+
+import copy
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from starlette.responses import Response
+
+from .cache import etag_matches
+
+# brotli 為選用套件；未安裝時只提供 gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 需要壓縮的內容類型
+_COMPRESSIBLE_PREFIXES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+# 小於此大小的檔案不壓縮
+MIN_COMPRESS_BYTES = 512
+# 壓縮格式，依偏好排序
+ENCODINGS = ("br", "gzip")
+
+# 未含雜湊的網址每次向伺服器確認；含雜湊的網址內容不會改變
+NO_CACHE = "no-cache"
+
+
+# 單一檔案：各壓縮格式的內容 ("identity" 為未壓縮) 與 ETag
+class Asset:
+    def __init__(self, data, media_type, cache_control):
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.compressible = media_type.startswith(_COMPRESSIBLE_PREFIXES) and len(data) >= MIN_COMPRESS_BYTES
+        self.digest = hashlib.sha256(data).hexdigest()
+        self.bodies = {"identity": data}
+        if self.compressible:
+            self.add_encoding("gzip", gzip.compress(data, compresslevel=9, mtime=0))
+
+    # 加入壓縮後的版本；壓縮後沒有變小時不採用
+    def add_encoding(self, encoding, body):
+        if len(body) < len(self.bodies["identity"]):
+            self.bodies[encoding] = body
+
+    # 共用同一份內容 (含之後加入的壓縮版本)，只有 Cache-Control 不同的副本
+    def with_cache_control(self, cache_control):
+        asset = copy.copy(self)
+        asset.cache_control = cache_control
+        return asset
+
+    def etag(self, encoding):
+        return f'"{self.digest[:32]}"' if encoding == "identity" else f'"{self.digest[:32]}-{encoding}"'
+
+
+# 解析 Accept-Encoding，回傳 {格式: q 值}
+def _parse_accept_encoding(header):
+    accepted = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name] = q
+    return accepted
+
+# 依 Accept-Encoding 自 available 中選擇回應的壓縮格式：用戶端接受 (q > 0) 的格式中依 ENCODINGS 的偏好順序選擇，
+# 都不接受時回傳 "identity"
+def negotiate_encoding(accept_encoding, available):
+    if not accept_encoding:
+        return "identity"
+    accepted = _parse_accept_encoding(accept_encoding)
+    default_q = accepted.get("*", 0.0)
+    for encoding in ENCODINGS:
+        if encoding in available and accepted.get(encoding, default_q) > 0:
+            return encoding
+    return "identity"
+
+
+class AssetStore:
+    def __init__(self, immutable_max_age, brotli_quality=11):
+        self.immutable_cache_control = f"public, max-age={immutable_max_age}, immutable"
+        self.brotli_quality = brotli_quality
+        self._assets = {}
+
+    def get(self, url_path):
+        return self._assets.get(url_path)
+
+    def __len__(self):
+        return len(self._assets)
+
+    def add(self, url_path, data, media_type, cache_control=NO_CACHE):
+        asset = Asset(data, media_type, cache_control)
+        self._assets[url_path] = asset
+        return asset
+
+    # 讀入目錄 (含子目錄) 中的所有檔案，同時以原網址與含內容雜湊的網址提供；回傳 {原網址: 含雜湊的網址}
+    def add_directory(self, directory, url_prefix):
+        hashed_urls = {}
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                url_name = os.path.relpath(path, directory).replace(os.sep, "/")
+                with open(path, "rb") as f:
+                    data = f.read()
+                media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                asset = self.add(f"{url_prefix}/{url_name}", data, media_type)
+                stem, ext = os.path.splitext(url_name)
+                hashed_url = f"{url_prefix}/{stem}.{asset.digest[:12]}{ext}"
+                self._assets[hashed_url] = asset.with_cache_control(self.immutable_cache_control)
+                hashed_urls[f"{url_prefix}/{url_name}"] = hashed_url
+        return hashed_urls
+
+    # 讀入前端頁面，頁面中引用的網址依 rewrites ({原網址: 新網址}) 改寫
+    def add_page(self, url_path, path, rewrites=None):
+        with open(path, "rb") as f:
+            data = f.read()
+        for original, replacement in (rewrites or {}).items():
+            data = data.replace(original.encode("utf-8"), replacement.encode("utf-8"))
+        media_type = mimetypes.guess_type(path)[0] or "text/html"
+        if media_type.startswith("text/"):
+            media_type += "; charset=utf-8"
+        return self.add(url_path, data, media_type)
+
+    # 以 brotli 壓縮所有文字類檔案，回傳壓縮的檔案數；未安裝 brotli 套件時不做任何事
+    def precompress_brotli(self):
+        if brotli is None:
+            return 0
+        count = 0
+        for asset in list(self._assets.values()):
+            if asset.compressible and "br" not in asset.bodies:
+                asset.add_encoding("br", brotli.compress(asset.bodies["identity"], quality=self.brotli_quality))
+                count += 1
+        return count
+
+    # 建立回應：依 Accept-Encoding 選擇版本，If-None-Match 符合該版本的 ETag 時回應 304
+    def response(self, request, asset):
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"), asset.bodies)
+        etag = asset.etag(encoding)
+        headers = {"ETag": etag, "Cache-Control": asset.cache_control}
+        if asset.compressible:
+            headers["Vary"] = "Accept-Encoding"
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=asset.bodies[encoding], media_type=asset.media_type, headers=headers)
+
+    def stats(self):
+        return {
+            url_path: {encoding: len(body) for encoding, body in asset.bodies.items()}
+            for url_path, asset in self._assets.items()
+        }
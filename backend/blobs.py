@@ -0,0 +1,171 @@
+# PMO_Report_Automation/backend/blobs.py
+
+# 以內容雜湊 (SHA-256) 定址的 PPT 檔案儲存區。用戶端先以雜湊詢問伺服器已有哪些檔案，
+# 只上傳缺少的檔案，產生報告時再以雜湊指定 PPT，不必重新上傳伺服器已有的檔案。
+# 檔案保存在本機磁碟，超過保存期限 (自最後一次使用起算) 或總大小超過上限時，依最近使用順序淘汰。
+# 取用檔案時以硬連結 (不支援時改為複製) 建立暫存檔，處理期間檔案被淘汰也不受影響。
+
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from .uploads import link_or_copy
+
+logger = logging.getLogger(__name__)
+
+_BLOB_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+# 雜湊是否為合法格式 (64 位元十六進位 SHA-256)
+def is_valid_blob_id(blob_id):
+    return bool(blob_id) and bool(_BLOB_ID_PATTERN.match(blob_id))
+
+
+# 以雜湊指定的 PPT 不在儲存區中 (未上傳或已淘汰)
+class BlobsMissing(Exception):
+    def __init__(self, missing):
+        super().__init__(f"伺服器上沒有 {len(missing)} 個指定的 PPT 檔案，請重新上傳。")
+        self.missing = missing
+
+
+class BlobStore:
+    def __init__(self, directory, max_bytes, ttl, suffix=".pptx"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # 雜湊 -> (檔案大小, 最後使用時間)，依最近使用排序 (最舊在前)
+        self._total_bytes = 0
+        self.present = 0
+        self.missing = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _path(self, blob_id):
+        return os.path.join(self.directory, blob_id + self.suffix)
+
+    # 啟動時掃描既有檔案，以修改時間作為最後使用時間重建索引
+    def _load_index(self):
+        found = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.suffix) or not is_valid_blob_id(name[:-len(self.suffix)]):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            found.append((stat.st_mtime, name[:-len(self.suffix)], stat.st_size))
+        with self._lock:
+            for mtime, blob_id, size in sorted(found):
+                self._entries[blob_id] = (size, mtime)
+                self._total_bytes += size
+            self._evict()
+
+    def _remove(self, blob_id):
+        size, _ = self._entries.pop(blob_id)
+        self._total_bytes -= size
+        try:
+            os.remove(self._path(blob_id))
+        except OSError:
+            pass
+
+    # 淘汰過期的項目，再依最近使用順序淘汰至總大小不超過上限；須持有鎖
+    def _evict(self):
+        expire_before = time.time() - self.ttl
+        while self._entries:
+            blob_id, (_, last_used) = next(iter(self._entries.items()))
+            if last_used >= expire_before and self._total_bytes <= self.max_bytes:
+                break
+            self._remove(blob_id)
+
+    # 更新項目的最後使用時間；須持有鎖
+    def _touch(self, blob_id):
+        now = time.time()
+        size, _ = self._entries[blob_id]
+        self._entries[blob_id] = (size, now)
+        self._entries.move_to_end(blob_id)
+        try:
+            os.utime(self._path(blob_id), (now, now))
+        except OSError:
+            pass
+
+    # 回傳 blob_ids 中不在儲存區的雜湊 (保留順序、去除重複)；存在的項目視為剛使用過
+    def find_missing(self, blob_ids):
+        missing = []
+        with self._lock:
+            self._evict()
+            for blob_id in dict.fromkeys(blob_ids):
+                if blob_id in self._entries:
+                    self._touch(blob_id)
+                    self.present += 1
+                else:
+                    missing.append(blob_id)
+                    self.missing += 1
+        return missing
+
+    # 將已計算雜湊的暫存檔加入儲存區 (以硬連結或複製，不影響原檔案)
+    def add_file(self, blob_id, path):
+        size = os.path.getsize(path)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if blob_id in self._entries:
+                self._touch(blob_id)
+                return
+            target = self._path(blob_id)
+            tmp_path = f"{target}.{threading.get_ident()}.tmp"
+            try:
+                link_or_copy(path, tmp_path)
+                os.replace(tmp_path, target)
+            except OSError as e:
+                logger.warning("無法寫入 PPT 檔案儲存區 %s: %s", target, e)
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                return
+            self._entries[blob_id] = (size, time.time())
+            self._total_bytes += size
+            self._evict()
+
+    # 以硬連結 (或複製) 在 directory 中建立檔案的暫存副本，回傳 (路徑, 大小)；不在儲存區時回傳 None
+    def checkout(self, blob_id, directory=None):
+        with self._lock:
+            if blob_id not in self._entries:
+                return None
+            fd, path = tempfile.mkstemp(prefix="pmo_upload_", suffix=self.suffix, dir=directory)
+            os.close(fd)
+            os.remove(path)
+            try:
+                link_or_copy(self._path(blob_id), path)
+            except OSError:
+                self._remove(blob_id)
+                return None
+            self._touch(blob_id)
+            return path, self._entries[blob_id][0]
+
+    def clear(self):
+        with self._lock:
+            for blob_id in list(self._entries):
+                self._remove(blob_id)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "disk_bytes": self._total_bytes,
+            "present": self.present,
+            "missing": self.missing,
+        }
+
@@ -0,0 +1,339 @@
+# PMO_Report_Automation/backend/cache.py
+
+# 以內容雜湊 (SHA-256) 為鍵的快取：重複上傳的同一份 PPT 可直接取用先前擷取的純資料，略過解析；
+# 範本與所有 PPT 都相同的報告可直接取用先前產生的 .docx (以硬連結或複製存取檔案，不讀入記憶體)。
+# 熱門項目保留在記憶體中，其餘寫入本機磁碟並依總大小以 LRU 方式淘汰。
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict, namedtuple
+
+from .tables import json_default
+from .uploads import file_sha256, link_or_copy, remove_file
+
+logger = logging.getLogger(__name__)
+
+
+# 計算內容的 SHA-256 十六進位字串
+def sha256_hex(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+# 本機磁碟上的 LRU 快取；以檔案修改時間記錄最近使用順序
+class DiskLRU:
+    def __init__(self, directory, max_bytes, suffix=".bin"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> 檔案大小，依最近使用排序 (最舊在前)
+        self._total_bytes = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    # 啟動時掃描既有檔案，重建索引
+    def _load_index(self):
+        found = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.suffix):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            found.append((stat.st_mtime, name[:-len(self.suffix)], stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    # 刪除項目的檔案
+    def _remove_files(self, key):
+        remove_file(self._path(key))
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self._remove_files(key)
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                os.utime(path)
+            except OSError:
+                self._total_bytes -= self._entries.pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            path = self._path(key)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning("無法寫入快取檔案 %s: %s", path, e)
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                return
+            self._total_bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict()
+
+    # 以硬連結 (或複製) 將檔案加入快取，不讀入記憶體；回傳是否已加入
+    def put_file(self, key, source_path):
+        size = os.path.getsize(source_path)
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            path = self._path(key)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                link_or_copy(source_path, tmp_path)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning("無法寫入快取檔案 %s: %s", path, e)
+                remove_file(tmp_path)
+                return False
+            self._total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict()
+            return key in self._entries
+
+    # 以硬連結 (或複製) 在 directory 中建立項目的暫存副本，回傳其路徑；未命中時回傳 None。
+    # 副本不受之後的淘汰影響，由呼叫端負責刪除
+    def checkout(self, key, directory=None):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            path = self._path(key)
+            fd, target = tempfile.mkstemp(prefix="pmo_cached_", suffix=self.suffix, dir=directory)
+            os.close(fd)
+            os.remove(target)
+            try:
+                link_or_copy(path, target)
+                os.utime(path)
+            except OSError:
+                remove_file(target)
+                self._total_bytes -= self._entries.pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return target
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._remove_files(key)
+            self._entries.clear()
+            self._total_bytes = 0
+
+
+# PPT 擷取結果快取；鍵為 PPT 內容的 SHA-256 加上擷取器版本
+class DeckCache:
+    def __init__(self, directory, max_bytes, memory_items, extractor_version, enabled=True):
+        self.enabled = enabled
+        self.extractor_version = extractor_version
+        self.memory_items = memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = DiskLRU(directory, max_bytes, suffix=".json") if enabled else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # content_hash 為 PPT 內容的 SHA-256 十六進位字串
+    def key(self, content_hash):
+        return f"{content_hash}.v{self.extractor_version}"
+
+    def _remember(self, key, deck):
+        self._memory[key] = deck
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    # 取得快取的擷取結果；未命中時回傳 None
+    def get(self, key):
+        if not self.enabled:
+            return None
+        with self._lock:
+            deck = self._memory.get(key)
+            if deck is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return deck
+
+        raw = self._disk.get(key)
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+                return None
+            try:
+                deck = json.loads(raw)
+            except ValueError:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, deck)
+            return deck
+
+    def put(self, key, deck):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._remember(key, deck)
+        self._disk.put(key, json.dumps(deck, ensure_ascii=False, separators=(",", ":"), default=json_default).encode("utf-8"))
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self.memory_hits = self.disk_hits = self.misses = 0
+        if self._disk is not None:
+            self._disk.clear()
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "extractor_version": self.extractor_version,
+            "memory_entries": len(self._memory),
+            "disk_entries": len(self._disk) if self._disk is not None else 0,
+            "disk_bytes": self._disk.total_bytes if self._disk is not None else 0,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+
+# 快取的整份報告：報告 ID (中間模型)、ETag 與 .docx 暫存副本的路徑
+CachedReport = namedtuple("CachedReport", ["report_id", "etag", "path"])
+
+# 分塊讀取報告檔計算強 ETag
+def report_etag(path):
+    return f'"{file_sha256(path)}"'
+
+# 判斷 If-None-Match 標頭是否符合 etag (弱比較：忽略 W/ 前綴)
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+# 報告快取的磁碟儲存：每個項目為報告的 .docx 與同名的中繼資料檔 (.meta，報告 ID 與 ETag)，兩者一併淘汰
+class _ReportFiles(DiskLRU):
+    def meta_path(self, key):
+        return os.path.join(self.directory, key + ".meta")
+
+    def _remove_files(self, key):
+        super()._remove_files(key)
+        remove_file(self.meta_path(key))
+
+
+# 整份報告的快取：鍵為範本 ID 與依序排列的 PPT (內容雜湊與檔名，檔名決定報告中的標題) 加上擷取器與寫入器版本。
+# 報告檔以硬連結 (或複製) 存入與取出，不讀入記憶體；依總大小以 LRU 方式淘汰。
+class ReportCache:
+    def __init__(self, directory, max_bytes, extractor_version, renderer_version, enabled=True):
+        self.enabled = enabled
+        self.extractor_version = extractor_version
+        self.renderer_version = renderer_version
+        self._lock = threading.Lock()
+        self._disk = _ReportFiles(directory, max_bytes, suffix=".docx") if enabled else None
+        self.hits = 0
+        self.misses = 0
+
+    # decks 為依報告順序排列的 (PPT 內容 SHA-256, 檔名)
+    def key(self, template_id, decks):
+        source = json.dumps([self.extractor_version, self.renderer_version, template_id, [list(deck) for deck in decks]],
+                            ensure_ascii=False, separators=(",", ":"))
+        return sha256_hex(source.encode("utf-8"))
+
+    # 取得快取的報告：在 directory 中建立報告的暫存副本 (由呼叫端負責刪除)，回傳 CachedReport；未命中時回傳 None
+    def get(self, key, directory=None):
+        if not self.enabled:
+            return None
+        cached = None
+        with self._lock:
+            path = self._disk.checkout(key, directory)
+            if path is not None:
+                try:
+                    with open(self._disk.meta_path(key), encoding="utf-8") as f:
+                        meta = json.load(f)
+                    cached = CachedReport(meta["report_id"], meta["etag"], path)
+                except (OSError, ValueError, KeyError, TypeError):
+                    remove_file(path)
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return cached
+
+    # 保存報告檔 (以硬連結或複製，不讀入記憶體)，回傳其 ETag；停用快取時不讀取檔案，回傳 None
+    def put(self, key, report_id, path):
+        if not self.enabled:
+            return None
+        etag = report_etag(path)
+        meta_path = self._disk.meta_path(key)
+        tmp_path = f"{meta_path}.{threading.get_ident()}.tmp"
+        with self._lock:
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"report_id": report_id, "etag": etag}, f)
+                os.replace(tmp_path, meta_path)
+            except OSError as e:
+                logger.warning("無法寫入快取檔案 %s: %s", meta_path, e)
+                remove_file(tmp_path)
+                return etag
+            if not self._disk.put_file(key, path):
+                remove_file(meta_path)
+        return etag
+
+    def clear(self):
+        with self._lock:
+            self.hits = self.misses = 0
+        if self._disk is not None:
+            self._disk.clear()
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._disk) if self._disk is not None else 0,
+            "disk_bytes": self._disk.total_bytes if self._disk is not None else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
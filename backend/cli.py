@@ -0,0 +1,261 @@
+# PMO_Report_Automation/backend/cli.py
+
+# 批次產生多份報告的命令列工具 (不經過 HTTP 服務)。報告群組可由以下兩種方式指定：
+#   --manifest 檔案   JSON 檔：{"groups": {"群組名稱": {"template": "範本.docx", "decks": ["a.pptx", ...],
+#                     "output": "輸出檔名.docx" (選填)}}, "output_dir": "輸出目錄" (選填)}；相對路徑以清單檔所在目錄為準
+#   --input-dir 目錄  每個子目錄為一個群組，內含 .pptx 與一個 .docx 範本；子目錄沒有範本時使用 --template
+# 所有 PPT 以行程池平行擷取，多個群組共用 (內容相同) 的 PPT 只擷取一次；群組所需的 PPT 都擷取完成後即開始寫入報告。
+# 用法：python -m backend.cli --input-dir 月報/2024-05 --output-dir 報告 [--workers 4] [--template 預設範本.docx]
+# 任一報告失敗時結束代碼為 1。
+
+import argparse
+import concurrent.futures
+import json
+import logging
+import os
+import sys
+import time
+
+from . import config
+from .log import ROOT_LOGGER_NAME, configured_level, init_worker_logging, setup_logging
+from .pipeline import EXTRACT_ENGINES, extract_deck, render_report
+from .uploads import file_sha256, remove_file
+
+# 以 python -m backend.cli 執行時 __name__ 為 "__main__"，明確指定 backend 底下的日誌器
+logger = logging.getLogger(f"{ROOT_LOGGER_NAME}.cli")
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+
+# 清單檔或輸入目錄的格式錯誤
+class BatchInputError(Exception):
+    pass
+
+
+# 單一報告群組
+class ReportGroup:
+    def __init__(self, name, template_path, deck_paths, output_path):
+        self.name = name
+        self.template_path = template_path
+        self.deck_paths = deck_paths
+        self.output_path = output_path
+        self.deck_keys = []
+        self.extract_seconds = 0.0
+        self.render_seconds = 0.0
+        self.submitted = False
+        self.finished_at = None
+        self.error = None
+
+
+def _report_filename(group_name):
+    return f"{group_name}_PMO_報告.docx"
+
+# 由 JSON 清單檔建立報告群組
+def load_manifest(manifest_path, output_dir=None):
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise BatchInputError(f"無法讀取清單檔 {manifest_path}：{e}")
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    groups = manifest.get("groups") if isinstance(manifest, dict) else None
+    if not isinstance(groups, dict) or not groups:
+        raise BatchInputError("清單檔須包含非空的 \"groups\" 物件。")
+    output_dir = output_dir or os.path.join(base_dir, manifest.get("output_dir", "reports"))
+
+    report_groups = []
+    for name, spec in groups.items():
+        if not isinstance(spec, dict) or not spec.get("template") or not spec.get("decks"):
+            raise BatchInputError(f"群組 '{name}' 須指定 \"template\" 與非空的 \"decks\"。")
+        report_groups.append(ReportGroup(
+            name,
+            os.path.join(base_dir, spec["template"]),
+            [os.path.join(base_dir, deck) for deck in spec["decks"]],
+            os.path.join(output_dir, spec.get("output") or _report_filename(name))
+        ))
+    return report_groups
+
+# 由目錄樹建立報告群組：每個子目錄為一個群組
+def scan_input_dir(input_dir, output_dir, default_template=None):
+    if not os.path.isdir(input_dir):
+        raise BatchInputError(f"找不到輸入目錄 {input_dir}。")
+
+    report_groups = []
+    for name in sorted(os.listdir(input_dir)):
+        group_dir = os.path.join(input_dir, name)
+        if not os.path.isdir(group_dir):
+            continue
+        files = sorted(os.listdir(group_dir))
+        deck_paths = [os.path.join(group_dir, f) for f in files if f.lower().endswith(".pptx") and not f.startswith("~$")]
+        templates = [os.path.join(group_dir, f) for f in files if f.lower().endswith(".docx") and not f.startswith("~$")]
+        if not deck_paths:
+            logger.warning("群組目錄 %s 中沒有 .pptx 檔案，略過。", group_dir)
+            continue
+        if len(templates) > 1:
+            raise BatchInputError(f"群組目錄 {group_dir} 中有多個 .docx 範本。")
+        template_path = templates[0] if templates else default_template
+        if template_path is None:
+            raise BatchInputError(f"群組目錄 {group_dir} 中沒有 .docx 範本，且未指定 --template。")
+        report_groups.append(ReportGroup(name, template_path, deck_paths, os.path.join(output_dir, _report_filename(name))))
+
+    if not report_groups:
+        raise BatchInputError(f"輸入目錄 {input_dir} 中沒有任何報告群組。")
+    return report_groups
+
+
+def _read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+# 在子行程中執行 fn(*args)，回傳 (結果, 耗時秒數)
+def _run_timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+# 產生所有群組的報告；回傳處理結果 (群組列表、實際擷取的 PPT 數)
+def run_batch(report_groups, workers, engine=None):
+    # 以內容雜湊辨識 PPT，內容相同的檔案只擷取一次；分段計算雜湊，不將整個檔案讀入記憶體
+    deck_sources = {}
+    template_ids = {}
+    for group in report_groups:
+        try:
+            for path in group.deck_paths:
+                key = file_sha256(path)
+                deck_sources.setdefault(key, path)
+                group.deck_keys.append(key)
+            template_ids[group.name] = file_sha256(group.template_path)
+        except OSError as e:
+            group.error = f"無法讀取檔案：{e}"
+
+    groups = [group for group in report_groups if group.error is None]
+    needed_keys = {key for group in groups for key in group.deck_keys}
+    extracted = {}
+    extract_errors = {}
+    extract_seconds = {}
+    start = time.perf_counter()
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker_logging,
+        initargs=(configured_level(),)
+    ) as pool:
+        pending = {}
+        for key in needed_keys:
+            path = deck_sources[key]
+            future = pool.submit(_run_timed, extract_deck, os.path.basename(path), path, engine)
+            pending[future] = ("deck", key)
+
+        # 群組所需的 PPT 都已擷取 (或失敗) 時，開始寫入報告
+        def submit_ready_groups():
+            for group in groups:
+                if group.submitted or group.finished_at is not None:
+                    continue
+                if not all(key in extracted or key in extract_errors for key in group.deck_keys):
+                    continue
+                failed = [key for key in dict.fromkeys(group.deck_keys) if key in extract_errors]
+                if failed:
+                    group.error = "PPT 擷取失敗：" + "; ".join(f"{deck_sources[key]} ({extract_errors[key]})" for key in failed)
+                    group.finished_at = time.perf_counter() - start
+                    continue
+                group.extract_seconds = sum(extract_seconds[key] for key in set(group.deck_keys))
+                # 共用的 PPT 以該群組中的檔名寫入報告
+                decks = [dict(extracted[key], filename=os.path.basename(path)) for key, path in zip(group.deck_keys, group.deck_paths)]
+                # 與 HTTP 服務相同：所有 PPT 都沒有工作總覽與本月概要時不產生報告
+                if not any(deck["work_items"] for deck in decks) and not any(deck["summary_items"] for deck in decks):
+                    group.error = "未找到工作總覽與本月概要的資料，無法產生報告"
+                    logger.error("❌ 報告 %s 產生失敗：%s", group.name, group.error)
+                    group.finished_at = time.perf_counter() - start
+                    continue
+                try:
+                    template_bytes = _read_file(group.template_path)
+                    os.makedirs(os.path.dirname(group.output_path) or ".", exist_ok=True)
+                except OSError as e:
+                    group.error = f"無法讀取範本或建立輸出目錄：{e}"
+                    group.finished_at = time.perf_counter() - start
+                    continue
+                group.submitted = True
+                # 子行程直接將報告寫入暫存檔，完成後再改名為輸出檔名
+                future = pool.submit(_run_timed, render_report, template_ids[group.name], template_bytes, decks, None,
+                                     f"{group.output_path}.tmp")
+                pending[future] = ("report", group)
+
+        submit_ready_groups()
+        while pending:
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                kind, target = pending.pop(future)
+                try:
+                    result, seconds = future.result()
+                except Exception as e:
+                    error = str(e) or type(e).__name__
+                    if kind == "deck":
+                        logger.error("❌ PPT 擷取失敗：%s - %s", deck_sources[target], error)
+                        extract_errors[target] = error
+                    else:
+                        logger.error("❌ 報告 %s 產生失敗：%s", target.name, error)
+                        remove_file(f"{target.output_path}.tmp")
+                        target.error = error
+                        target.finished_at = time.perf_counter() - start
+                    continue
+
+                if kind == "deck":
+                    extracted[target] = result
+                    extract_seconds[target] = seconds
+                else:
+                    target.render_seconds = seconds
+                    try:
+                        os.replace(result, target.output_path)
+                        logger.info("✅ 已產生報告：%s", target.output_path)
+                    except OSError as e:
+                        target.error = f"無法寫入報告：{e}"
+                    target.finished_at = time.perf_counter() - start
+            submit_ready_groups()
+
+    return report_groups, len(needed_keys)
+
+def print_summary(report_groups, parsed_decks, elapsed, stream=sys.stdout):
+    name_width = max(12, *(len(group.name) for group in report_groups))
+    print(f"{'group':<{name_width}} {'decks':>5} {'extract (s)':>11} {'render (s)':>10} {'done at (s)':>11}  result", file=stream)
+    for group in report_groups:
+        finished_at = f"{group.finished_at:>11.2f}" if group.finished_at is not None else f"{'-':>11}"
+        result = f"失敗：{group.error}" if group.error else group.output_path
+        print(f"{group.name:<{name_width}} {len(group.deck_paths):>5} {group.extract_seconds:>11.2f} "
+              f"{group.render_seconds:>10.2f} {finished_at}  {result}", file=stream)
+
+    failures = sum(1 for group in report_groups if group.error)
+    referenced = sum(len(group.deck_paths) for group in report_groups)
+    print(f"\n{len(report_groups) - failures}/{len(report_groups)} 份報告完成，"
+          f"擷取 {parsed_decks} 個 PPT (共引用 {referenced} 次)，總耗時 {elapsed:.2f} 秒。", file=stream)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m backend.cli", description="批次產生 PMO 報告")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--manifest", help="報告群組清單 (JSON)")
+    source.add_argument("--input-dir", help="每個子目錄為一個報告群組的輸入目錄")
+    parser.add_argument("--template", help="--input-dir 模式下，子目錄沒有範本時使用的預設範本")
+    parser.add_argument("--output-dir", help="報告輸出目錄 (預設為清單檔中的 output_dir 或 ./reports)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="行程池大小")
+    parser.add_argument("--engine", choices=EXTRACT_ENGINES, default=config.EXTRACT_ENGINE, help="PPT 擷取引擎")
+    parser.add_argument("--log-level", type=str.upper, choices=LOG_LEVELS, default=None,
+                        help="日誌等級 (預設為 PMO_LOG_LEVEL)")
+    args = parser.parse_args(argv)
+
+    setup_logging(args.log_level)
+    try:
+        if args.manifest:
+            report_groups = load_manifest(args.manifest, args.output_dir)
+        else:
+            report_groups = scan_input_dir(args.input_dir, args.output_dir or "reports", args.template)
+    except BatchInputError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    report_groups, parsed_decks = run_batch(report_groups, max(1, args.workers), args.engine)
+    print_summary(report_groups, parsed_decks, time.perf_counter() - start)
+    return 1 if any(group.error for group in report_groups) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+# PMO_Report_Automation/backend/config.py
+
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# --- 環境變數讀取輔助函式 ---
+
+def _env_str(name, default):
+    value = os.environ.get(name)
+    return value.strip() if value and value.strip() else default
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    try:
+        return int(value) if value else default
+    except ValueError:
+        logger.warning("環境變數 %s=%r 不是整數，改用預設值 %s。", name, value, default)
+        return default
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    if not value or not value.strip():
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off")
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    try:
+        return float(value) if value else default
+    except ValueError:
+        logger.warning("環境變數 %s=%r 不是數值，改用預設值 %s。", name, value, default)
+        return default
+
+def _env_log_level(name, default):
+    value = _env_str(name, default).upper()
+    if value not in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
+        logger.warning("環境變數 %s=%r 不是有效的日誌等級，改用預設值 %s。", name, value, default)
+        return default
+    return value
+
+# --- 日誌設定 ---
+
+# 日誌等級；DEBUG 會輸出逐張投影片與逐個表格的處理細節
+LOG_LEVEL = _env_log_level("PMO_LOG_LEVEL", "INFO")
+
+# --- 工作執行池設定 ---
+
+# 執行模式："thread" (執行緒池) 或 "process" (行程池)
+EXECUTOR_MODE = _env_str("PMO_EXECUTOR_MODE", "thread").lower()
+# 同時執行的工作數上限
+EXECUTOR_MAX_WORKERS = _env_int("PMO_EXECUTOR_MAX_WORKERS", min(4, os.cpu_count() or 1))
+# 除了執行中的工作外，最多可排隊等待的工作數；超過即回應 503
+EXECUTOR_MAX_QUEUE = _env_int("PMO_EXECUTOR_MAX_QUEUE", 16)
+# 單一工作 (單一 PPT 解析或報告組裝) 的逾時秒數
+EXECUTOR_JOB_TIMEOUT = _env_float("PMO_EXECUTOR_JOB_TIMEOUT", 120.0)
+# 執行池滿載時回應給用戶端的 Retry-After 秒數
+EXECUTOR_RETRY_AFTER = _env_int("PMO_EXECUTOR_RETRY_AFTER", 5)
+
+# --- 啟動預熱設定 ---
+
+# 預熱模式："background" (開始接受連線後於背景預熱，預設)、"startup" (預熱完成後才開始接受連線) 或 "off"
+WARMUP_MODE = _env_str("PMO_WARMUP_MODE", "background").lower()
+
+# --- PPT 擷取設定 ---
+
+# 擷取引擎："python-pptx" (完整載入簡報) 或 "lazy" (只讀取投影片 XML，略過圖片與媒體)
+EXTRACT_ENGINE = _env_str("PMO_EXTRACT_ENGINE", "python-pptx").lower()
+
+# --- 前端與靜態檔案設定 ---
+
+# 預先壓縮前端頁面與靜態檔案的 brotli 壓縮等級 (0-11)；未安裝 brotli 套件時只提供 gzip
+ASSET_BROTLI_QUALITY = _env_int("PMO_ASSET_BROTLI_QUALITY", 11)
+# 含內容雜湊的靜態檔案網址的快取秒數；內容變更時網址隨之改變，可長期快取
+ASSET_IMMUTABLE_MAX_AGE = _env_int("PMO_ASSET_IMMUTABLE_MAX_AGE", 365 * 24 * 3600)
+
+# --- 上傳檔案設定 ---
+
+# 單一上傳檔案的大小上限 (位元組)；超過即回應 413
+MAX_UPLOAD_BYTES = _env_int("PMO_MAX_UPLOAD_BYTES", 100 * 1024 * 1024)
+# 上傳檔案暫存目錄；未設定時使用系統暫存目錄
+UPLOAD_SPOOL_DIR = _env_str("PMO_UPLOAD_SPOOL_DIR", None)
+
+# --- PPT 檔案儲存區設定 ---
+
+# 以內容雜湊定址的 PPT 檔案存放目錄；用戶端可先以雜湊詢問，只上傳伺服器沒有的檔案
+BLOB_DIR = _env_str("PMO_BLOB_DIR", os.path.join(tempfile.gettempdir(), "pmo_blobs"))
+# PPT 檔案儲存區總大小上限 (位元組)
+BLOB_MAX_BYTES = _env_int("PMO_BLOB_MAX_BYTES", 2 * 1024 * 1024 * 1024)
+# 檔案自最後一次使用起保留的秒數
+BLOB_TTL = _env_int("PMO_BLOB_TTL", 7 * 24 * 3600)
+
+# --- 流量控制設定 ---
+
+# 同時產生報告 (/process-files/ 與 /reports/{report_id}/regenerate) 的請求數上限，其餘請求排隊等待
+ADMISSION_MAX_CONCURRENT = _env_int("PMO_ADMISSION_MAX_CONCURRENT", 2)
+# 排隊等待的請求數上限；超過即回應 429
+ADMISSION_MAX_QUEUE = _env_int("PMO_ADMISSION_MAX_QUEUE", 8)
+# 請求排隊等待的秒數上限；超過即回應 503
+ADMISSION_QUEUE_TIMEOUT = _env_float("PMO_ADMISSION_QUEUE_TIMEOUT", 30.0)
+# 回應 429 / 503 時給用戶端的 Retry-After 秒數
+ADMISSION_RETRY_AFTER = _env_int("PMO_ADMISSION_RETRY_AFTER", 10)
+# 單一請求 (單一報告) 的 PPT 數量上限；超過即回應 413，0 表示不限制
+MAX_DECKS_PER_REQUEST = _env_int("PMO_MAX_DECKS_PER_REQUEST", 50)
+# 單一請求的總大小上限 (位元組)，於解析上傳檔案前檢查；超過即回應 413，0 表示不限制
+MAX_REQUEST_BYTES = _env_int("PMO_MAX_REQUEST_BYTES", 300 * 1024 * 1024)
+
+# --- PPT 擷取結果快取設定 ---
+
+DECK_CACHE_ENABLED = _env_bool("PMO_DECK_CACHE_ENABLED", True)
+DECK_CACHE_DIR = _env_str("PMO_DECK_CACHE_DIR", os.path.join(tempfile.gettempdir(), "pmo_deck_cache"))
+# 磁碟快取總大小上限 (位元組)
+DECK_CACHE_MAX_BYTES = _env_int("PMO_DECK_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+# 保留在記憶體中的熱門項目數
+DECK_CACHE_MEMORY_ITEMS = _env_int("PMO_DECK_CACHE_MEMORY_ITEMS", 64)
+
+# --- 報告快取設定 ---
+
+# 範本與所有 PPT (內容與檔名) 都相同時，直接回傳先前產生的報告
+REPORT_CACHE_ENABLED = _env_bool("PMO_REPORT_CACHE_ENABLED", True)
+REPORT_CACHE_DIR = _env_str("PMO_REPORT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "pmo_report_cache"))
+# 報告快取總大小上限 (位元組)
+REPORT_CACHE_MAX_BYTES = _env_int("PMO_REPORT_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+
+# --- Word 範本登錄設定 ---
+
+TEMPLATE_DIR = _env_str("PMO_TEMPLATE_DIR", os.path.join(tempfile.gettempdir(), "pmo_templates"))
+# 範本存放的總大小上限 (位元組)
+TEMPLATE_MAX_BYTES = _env_int("PMO_TEMPLATE_MAX_BYTES", 64 * 1024 * 1024)
+# 每個工作行程保留的已解析範本數量
+TEMPLATE_BASE_CACHE_SIZE = _env_int("PMO_TEMPLATE_BASE_CACHE_SIZE", 8)
+
+# --- 報告中間模型設定 ---
+
+# 各報告的中間模型 (每個 PPT 擷取出的內容與內容雜湊) 存放目錄，供只更換部分 PPT 時重新產生報告
+REPORT_MODEL_DIR = _env_str("PMO_REPORT_MODEL_DIR", os.path.join(tempfile.gettempdir(), "pmo_report_models"))
+# 中間模型存放的總大小上限 (位元組)
+REPORT_MODEL_MAX_BYTES = _env_int("PMO_REPORT_MODEL_MAX_BYTES", 64 * 1024 * 1024)
+
+# --- 非同步報告工作設定 ---
+
+# 完成的報告存放目錄
+JOBS_DIR = _env_str("PMO_JOBS_DIR", os.path.join(tempfile.gettempdir(), "pmo_jobs"))
+# 同時產生報告的工作數上限，其餘工作排隊等待
+JOBS_MAX_CONCURRENT = _env_int("PMO_JOBS_MAX_CONCURRENT", 2)
+# 排隊與執行中的工作總數上限；超過即回應 503
+JOBS_MAX_PENDING = _env_int("PMO_JOBS_MAX_PENDING", 32)
+# 工作結束後保留狀態與報告檔案的秒數
+JOBS_TTL = _env_int("PMO_JOBS_TTL", 3600)
+# 清除過期工作的間隔秒數
+JOBS_CLEANUP_INTERVAL = _env_int("PMO_JOBS_CLEANUP_INTERVAL", 60)
+
+# --- 管理端點設定 ---
+
+# 若有設定，呼叫 /admin/* 端點時須在 X-Admin-Token 標頭帶入相同的值
+ADMIN_TOKEN = _env_str("PMO_ADMIN_TOKEN", "")
@@ -0,0 +1,141 @@
+# PMO_Report_Automation/backend/executor.py
+
+# 將 PPT 解析與 Word 組裝等 CPU 密集的同步工作移出 asyncio 事件迴圈，
+# 交由執行緒池或行程池執行，並以有上限的佇列提供背壓 (backpressure)。
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .log import configured_level, get_request_id, init_worker_logging, run_with_request_id
+
+logger = logging.getLogger(__name__)
+
+
+# 執行池已滿 (執行中 + 排隊中的工作數達上限)
+class ExecutorSaturated(Exception):
+    def __init__(self, retry_after):
+        super().__init__("工作執行池已滿載，請稍後再試。")
+        self.retry_after = retry_after
+
+
+# 單一工作超過允許的執行時間
+class JobTimeout(Exception):
+    def __init__(self, timeout):
+        super().__init__(f"工作執行超過 {timeout:g} 秒的時間限制。")
+        self.timeout = timeout
+
+
+# 行程池工作行程的初始化：設定日誌，並於有提供 warm_up 時先行預熱
+def _init_process_worker(level, warm_up=None):
+    init_worker_logging(level)
+    if warm_up is not None:
+        try:
+            warm_up()
+        except Exception:
+            logger.exception("工作行程預熱失敗。")
+
+# 不做任何事的工作；用於促使行程池建立工作行程
+def _noop():
+    return None
+
+
+class JobExecutor:
+    # warm_up 為預熱函式 (可序列化)；行程池模式下每個工作行程啟動時各執行一次
+    def __init__(self, mode="thread", max_workers=2, max_queue=16, job_timeout=120.0, retry_after=5, warm_up=None):
+        if mode not in ("thread", "process"):
+            logger.warning("未知的執行模式 '%s'，改用 thread 模式。", mode)
+            mode = "thread"
+        self.mode = mode
+        self.max_workers = max(1, max_workers)
+        self.capacity = self.max_workers + max(0, max_queue)
+        self.job_timeout = job_timeout
+        self.retry_after = retry_after
+        self.warm_up = warm_up
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._pool = None
+
+    # 執行中與排隊中的工作數
+    @property
+    def pending(self):
+        return self._pending
+
+    def _get_pool(self):
+        if self._pool is None:
+            if self.mode == "process":
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_process_worker,
+                    initargs=(configured_level(), self.warm_up)
+                )
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pmo-worker")
+            logger.info("已建立 %s 工作執行池 (workers=%d, capacity=%d)。", self.mode, self.max_workers, self.capacity)
+        return self._pool
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._pending -= 1
+
+    # 預先建立執行池並預熱，回傳耗時秒數。行程池模式下送出 max_workers 個空工作，
+    # 促使行程池建立所有工作行程 (各自於初始化時預熱)；執行緒池模式下各執行緒共用同一行程，只需預熱一次。
+    async def start(self):
+        start = time.perf_counter()
+        pool = self._get_pool()
+        if self.warm_up is not None:
+            if self.mode == "process":
+                await asyncio.gather(*(asyncio.wrap_future(pool.submit(_noop)) for _ in range(self.max_workers)))
+            else:
+                await asyncio.wrap_future(pool.submit(self.warm_up))
+        return time.perf_counter() - start
+
+    # 在執行池中執行 fn(*args)；執行池滿載時立即拋出 ExecutorSaturated
+    async def run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.capacity:
+                raise ExecutorSaturated(self.retry_after)
+            self._pending += 1
+
+        try:
+            # 工作執行池不會繼承呼叫端的 contextvars，請求 ID 須明確傳入
+            future = self._get_pool().submit(run_with_request_id, get_request_id(), fn, *args)
+        except Exception:
+            self._release()
+            raise
+        # 名額在工作實際結束 (或取消) 時才釋放，逾時但仍在執行的工作也會計入上限
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.job_timeout)
+        except asyncio.TimeoutError:
+            raise JobTimeout(self.job_timeout)
+
+    # 以 fn 平行處理 args_list 中的每一組參數，結果依輸入順序回傳。
+    # 單一呼叫同時佔用的名額不超過 max_workers，避免一次上傳大量檔案就塞滿整個佇列。
+    # 若有提供 on_result，每組參數完成時即以 (索引, 結果) 呼叫，可用於回報進度。
+    async def map(self, fn, args_list, on_result=None):
+        limiter = asyncio.Semaphore(self.max_workers)
+
+        async def run_one(index, args):
+            async with limiter:
+                result = await self.run(fn, *args)
+            if on_result is not None:
+                on_result(index, result)
+            return result
+
+        tasks = [asyncio.ensure_future(run_one(index, args)) for index, args in enumerate(args_list)]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    # 取消排隊中的工作並等待執行中的工作結束；行程池模式下不等待會使工作行程在服務結束後仍殘留
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,180 @@
+# PMO_Report_Automation/backend/fragments.py
+
+# 報告中每個 PPT 都會重複出現的靜態區塊 (圖例、「工作總覽」/「本月概要」標題、「（尚無資料）」提示、分頁)。
+# 各區塊的 XML 在每個行程中只建立並解析一次，寫入報告時直接複製元素加入文件本文，
+# 不必每次經由 python-docx 逐一建立段落與文字區塊。
+# 範本可自訂區塊：以名稱為「PMO_FRAGMENT_<區塊名稱>」的書籤標記範本中的段落或表格，
+# 這些內容會從範本本文中移出，取代同名的內建區塊；deck_start / deck_end 兩個區塊沒有內建內容，
+# 範本定義後分別加在每個 PPT 的標題之前與圖例之後。
+
+import copy
+import logging
+import threading
+
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+from docx.shared import RGBColor
+from xml.sax.saxutils import escape as xml_escape
+
+from . import metrics
+from .styles import BODY_STYLE, HEADING_STYLES, LEGEND_STYLE
+
+logger = logging.getLogger(__name__)
+
+# 區塊名稱
+PAGE_BREAK = "page_break"
+DECK_START = "deck_start"
+WORK_OVERVIEW_HEADING = "work_overview_heading"
+MONTHLY_SUMMARY_HEADING = "monthly_summary_heading"
+NO_DATA = "no_data"
+LEGEND = "legend"
+DECK_END = "deck_end"
+FRAGMENT_NAMES = (PAGE_BREAK, DECK_START, WORK_OVERVIEW_HEADING, MONTHLY_SUMMARY_HEADING, NO_DATA, LEGEND, DECK_END)
+
+# 範本中標記自訂區塊的書籤名稱前綴 (其後為區塊名稱，不分大小寫)
+BOOKMARK_PREFIX = "PMO_FRAGMENT_"
+
+# 圖例文字與圓點顏色；字型、字級與段後距由 PMO Legend 樣式提供，文字區塊只設定顏色
+LEGEND_RUNS = [
+    ("工項主要單位：", RGBColor(0, 0, 0)),
+    (" ●", RGBColor(0xF0, 0xD4, 0xB0)),
+    (" EY", RGBColor(0, 0, 0)),
+    ("  ●", RGBColor(0xF2, 0xAA, 0x6B)),
+    (" 建置廠商", RGBColor(0, 0, 0)),
+    ("  ●", RGBColor(0xC0, 0xEA, 0xFA)),
+    (" 第一保", RGBColor(0, 0, 0)),
+    ("    狀態：", RGBColor(0, 0, 0)),
+    (" ●", RGBColor(0x00, 0xB0, 0x50)),
+    (" 正常完成", RGBColor(0, 0, 0)),
+    ("  ●", RGBColor(0xFF, 0xC0, 0x00)),
+    (" 部分延遲", RGBColor(0, 0, 0)),
+    ("  ●", RGBColor(0xFF, 0x00, 0x00)),
+    (" 嚴重延遲", RGBColor(0, 0, 0)),
+]
+
+# 產生單一文字區塊的 XML；與 python-docx 相同，前後有空白的文字保留空白
+def _run_xml(text, color=None):
+    rpr = f'<w:rPr><w:color w:val="{color}"/></w:rPr>' if color is not None else ''
+    space = ' xml:space="preserve"' if len(text.strip()) < len(text) else ''
+    return f'<w:r>{rpr}<w:t{space}>{xml_escape(text)}</w:t></w:r>'
+
+# 產生套用指定樣式的段落 XML；runs 為 [(文字, 顏色或 None)]
+def _paragraph_xml(style_id, runs):
+    return (f'<w:p {nsdecls("w")}><w:pPr><w:pStyle w:val="{style_id}"/></w:pPr>'
+            + ''.join(_run_xml(text, color) for text, color in runs) + '</w:p>')
+
+# 內建區塊的 XML，style_ids 為 ensure_report_styles 的結果
+def _builtin_xml(style_ids):
+    return {
+        PAGE_BREAK: f'<w:p {nsdecls("w")}><w:r><w:br w:type="page"/></w:r></w:p>',
+        WORK_OVERVIEW_HEADING: _paragraph_xml(style_ids[HEADING_STYLES[3]], [("工作總覽", None)]),
+        MONTHLY_SUMMARY_HEADING: _paragraph_xml(style_ids[HEADING_STYLES[3]], [("本月概要", None)]),
+        NO_DATA: _paragraph_xml(style_ids[BODY_STYLE], [("（尚無資料）", None)]),
+        LEGEND: _paragraph_xml(style_ids[LEGEND_STYLE], LEGEND_RUNS),
+    }
+
+
+# 一組已解析的區塊；append 時複製元素加入文件本文
+class FragmentLibrary:
+    def __init__(self, style_ids, fragments):
+        self.style_ids = style_ids
+        # {區塊名稱: (元素, 含文字的文字區塊數)}
+        self._fragments = {
+            name: (tuple(elements), sum(1 for element in elements for run in element.iter(qn('w:r'))
+                                        if run.find(qn('w:t')) is not None))
+            for name, elements in fragments.items()
+        }
+
+    def __contains__(self, name):
+        return name in self._fragments
+
+    # 將區塊加入文件本文最後 (分節設定之前)；區塊未定義時回傳 False
+    def append(self, doc, name):
+        entry = self._fragments.get(name)
+        if entry is None:
+            return False
+        elements, runs = entry
+        body = doc.element.body
+        sect_pr = body.sectPr
+        for element in elements:
+            if sect_pr is not None:
+                sect_pr.addprevious(copy.deepcopy(element))
+            else:
+                body.append(copy.deepcopy(element))
+        if runs:
+            metrics.count("runs", runs)
+        return True
+
+    # 以範本自訂的區塊取代同名區塊，回傳新的 FragmentLibrary
+    def with_overrides(self, fragments):
+        if not fragments:
+            return self
+        merged = {name: list(elements) for name, (elements, _) in self._fragments.items()}
+        merged.update(fragments)
+        return FragmentLibrary(self.style_ids, merged)
+
+
+# 每個行程中以樣式 ID 為鍵保留的內建區塊
+_builtin_libraries = {}
+_builtin_libraries_lock = threading.Lock()
+
+# 取得內建區塊；同一組樣式 ID 在每個行程中只解析一次
+def builtin_fragments(style_ids):
+    key = tuple(sorted(style_ids.items()))
+    with _builtin_libraries_lock:
+        library = _builtin_libraries.get(key)
+        if library is None:
+            library = FragmentLibrary(dict(style_ids), {
+                name: [parse_xml(xml)] for name, xml in _builtin_xml(style_ids).items()
+            })
+            _builtin_libraries[key] = library
+    return library
+
+# 取得範本本文中元素所屬的最上層區塊 (段落、表格等)；元素已不在本文中時回傳 None
+def _body_block(body, element):
+    while element is not None and element.getparent() is not body:
+        element = element.getparent()
+    return element
+
+# 由範本本文取出以書籤標記的自訂區塊 (並自範本中移除)，回傳 {區塊名稱: [元素]}
+def extract_template_fragments(doc):
+    body = doc.element.body
+    bookmark_ends = {end.get(qn('w:id')): end for end in body.iter(qn('w:bookmarkEnd'))}
+    fragments = {}
+    for start in list(body.iter(qn('w:bookmarkStart'))):
+        bookmark_name = start.get(qn('w:name'), "")
+        # 已隨先前取出的區塊移除的書籤
+        if start.getparent() is None or not bookmark_name.upper().startswith(BOOKMARK_PREFIX):
+            continue
+        name = bookmark_name[len(BOOKMARK_PREFIX):].lower()
+        if name not in FRAGMENT_NAMES:
+            logger.warning("⚠️ 範本中的書籤 %s 不是可自訂的區塊名稱，略過。", bookmark_name)
+            continue
+        end = bookmark_ends.get(start.get(qn('w:id')))
+        first = _body_block(body, start)
+        last = _body_block(body, end) if end is not None else None
+        if first is None or last is None:
+            logger.warning("⚠️ 範本中的書籤 %s 沒有結束位置，略過。", bookmark_name)
+            continue
+
+        blocks = [first]
+        while blocks[-1] is not last and blocks[-1].getnext() is not None:
+            blocks.append(blocks[-1].getnext())
+        if blocks[-1] is not last or any(block.tag == qn('w:sectPr') or block.find('.//' + qn('w:sectPr')) is not None
+                                         for block in blocks):
+            logger.warning("⚠️ 範本中的書籤 %s 範圍無法作為區塊使用，略過。", bookmark_name)
+            continue
+
+        for block in blocks:
+            body.remove(block)
+        # 區塊會重複加入報告，移除其中的書籤以免書籤 ID 重複
+        elements = []
+        for block in blocks:
+            if block.tag in (qn('w:bookmarkStart'), qn('w:bookmarkEnd')):
+                continue
+            for bookmark in list(block.iter(qn('w:bookmarkStart'), qn('w:bookmarkEnd'))):
+                bookmark.getparent().remove(bookmark)
+            elements.append(block)
+        fragments[name] = elements
+        logger.info("範本自訂區塊：%s (%d 個元素)", name, len(elements))
+    return fragments
@@ -0,0 +1,226 @@
+# PMO_Report_Automation/backend/jobs.py
+
+# 非同步報告工作：上傳後立即回傳工作 ID，報告在背景產生，用戶端以輪詢取得各 PPT 的進度
+# (已解析、已寫入、已儲存) 並於完成後下載。工作狀態保存在服務行程的記憶體中，
+# 報告直接寫入暫存目錄中的檔案，超過保留期限後連同檔案一併刪除。
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+
+from .uploads import remove_file
+
+logger = logging.getLogger(__name__)
+
+# 單一 PPT 的處理階段 (依序)
+DECK_STAGES = ("parsed", "rendered", "saved")
+
+# 工作狀態
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+# 排隊中的工作數已達上限
+class JobQueueFull(Exception):
+    def __init__(self, retry_after):
+        super().__init__("報告工作佇列已滿，請稍後再試。")
+        self.retry_after = retry_after
+
+
+class Job:
+    def __init__(self, job_id, filenames, ttl):
+        self.job_id = job_id
+        self.status = JOB_QUEUED
+        self.error = None
+        self.template_id = None
+        self.output_filename = None
+        self.result_path = None
+        # 報告的中間模型 ID，可用於 /reports/{report_id}/regenerate
+        self.report_id = None
+        # 報告的 ETag (存入報告快取時計算；停用快取時為 None)
+        self.etag = None
+        # 完成後的各階段耗時與產出數量 (metrics.StageRecorder.to_dict 的輸出)
+        self.stats = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.ttl = ttl
+        self.decks = [{"filename": filename, **{stage: False for stage in DECK_STAGES}} for filename in filenames]
+        self._lock = threading.Lock()
+
+    # 標記第 deck_index 個 PPT 已完成 stage 階段；可由工作執行緒呼叫
+    def mark(self, deck_index, stage):
+        with self._lock:
+            self.decks[deck_index][stage] = True
+            self.updated_at = time.time()
+
+    # 標記所有 PPT 已完成 stage 階段
+    def mark_all(self, stage):
+        with self._lock:
+            for deck in self.decks:
+                deck[stage] = True
+            self.updated_at = time.time()
+
+    def set_status(self, status, error=None):
+        with self._lock:
+            self.status = status
+            self.error = error
+            self.updated_at = time.time()
+
+    # 工作結束 (完成或失敗) 後開始計算保留期限；未結束的工作不會過期
+    @property
+    def expires_at(self):
+        if self.status in (JOB_DONE, JOB_FAILED):
+            return self.updated_at + self.ttl
+        return None
+
+    def is_expired(self, now=None):
+        expires_at = self.expires_at
+        return expires_at is not None and (now or time.time()) >= expires_at
+
+    def to_dict(self):
+        with self._lock:
+            decks = [dict(deck) for deck in self.decks]
+            completed = sum(deck[stage] for deck in decks for stage in DECK_STAGES)
+            total = len(decks) * len(DECK_STAGES)
+            return {
+                "job_id": self.job_id,
+                "status": self.status,
+                "error": self.error,
+                "template_id": self.template_id,
+                "report_id": self.report_id,
+                "progress": completed / total if total else 0.0,
+                "decks": decks,
+                "created_at": self.created_at,
+                "updated_at": self.updated_at,
+                "expires_at": self.expires_at,
+                "stats": self.stats,
+                "download_url": f"/jobs/{self.job_id}/download" if self.status == JOB_DONE else None,
+            }
+
+
+# 工作登錄與排程：同時執行的工作數由 max_concurrent 限制，其餘排隊等待；
+# 排隊與執行中的工作總數超過 max_pending 時拒絕新工作。
+class JobStore:
+    def __init__(self, directory, max_concurrent, max_pending, ttl, retry_after=5):
+        self.directory = directory
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_pending = max(1, max_pending)
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self._jobs = {}
+        self._tasks = {}
+        self._limiter = None
+        os.makedirs(directory, exist_ok=True)
+
+    # Semaphore 須在事件迴圈中建立
+    def _get_limiter(self):
+        if self._limiter is None:
+            self._limiter = asyncio.Semaphore(self.max_concurrent)
+        return self._limiter
+
+    # 尚未結束的工作數
+    @property
+    def active(self):
+        return sum(1 for job in self._jobs.values() if job.status in (JOB_QUEUED, JOB_RUNNING))
+
+    def result_path(self, job_id):
+        return os.path.join(self.directory, f"{job_id}.docx")
+
+    # 建立工作並在背景執行 run(job, output_path)；run 為 async 函式，將報告的 .docx 寫入 output_path。
+    # on_finish 在工作結束 (不論成功與否) 後呼叫，用於清除暫存的上傳檔案。
+    def submit(self, filenames, run, on_finish=None):
+        if self.active >= self.max_pending:
+            raise JobQueueFull(self.retry_after)
+        job = Job(uuid.uuid4().hex, filenames, self.ttl)
+        self._jobs[job.job_id] = job
+        self._tasks[job.job_id] = asyncio.create_task(self._run(job, run, on_finish))
+        return job
+
+    # 建立已完成的工作 (報告已存在，例如取自報告快取)：source_path 的檔案移至工作的報告路徑，須位於同一檔案系統
+    def add_finished(self, filenames, source_path):
+        job = Job(uuid.uuid4().hex, filenames, self.ttl)
+        path = self.result_path(job.job_id)
+        os.replace(source_path, path)
+        job.result_path = path
+        for stage in DECK_STAGES:
+            job.mark_all(stage)
+        job.set_status(JOB_DONE)
+        self._jobs[job.job_id] = job
+        return job
+
+    async def _run(self, job, run, on_finish):
+        try:
+            async with self._get_limiter():
+                job.set_status(JOB_RUNNING)
+                path = self.result_path(job.job_id)
+                # 寫入完成後才改名，下載端不會讀到寫到一半的檔案
+                await run(job, f"{path}.tmp")
+                os.replace(f"{path}.tmp", path)
+                job.result_path = path
+                job.mark_all("saved")
+                job.set_status(JOB_DONE)
+        except asyncio.CancelledError:
+            job.set_status(JOB_FAILED, "報告工作已取消。")
+            raise
+        except Exception as e:
+            detail = getattr(e, "detail", None)
+            if detail is None:
+                logger.exception("報告工作 %s 失敗：%s", job.job_id, e)
+            else:
+                logger.warning("報告工作 %s 失敗：%s", job.job_id, detail)
+            job.set_status(JOB_FAILED, detail or str(e))
+        finally:
+            self._tasks.pop(job.job_id, None)
+            if job.result_path is None:
+                remove_file(f"{self.result_path(job.job_id)}.tmp")
+            if on_finish is not None:
+                on_finish()
+
+    # 取得工作；不存在或已過期時回傳 None
+    def get(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is None or job.is_expired():
+            return None
+        return job
+
+    # 刪除已過期的工作與報告檔案，回傳刪除的工作數
+    def purge_expired(self):
+        now = time.time()
+        expired = [job for job in self._jobs.values() if job.is_expired(now)]
+        for job in expired:
+            self._remove(job)
+        return len(expired)
+
+    def _remove(self, job):
+        self._jobs.pop(job.job_id, None)
+        if job.result_path:
+            remove_file(job.result_path)
+
+    # 定期清除過期的工作
+    async def cleanup_loop(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            removed = await asyncio.to_thread(self.purge_expired)
+            if removed:
+                logger.info("🧹 已清除 %d 個過期的報告工作。", removed)
+
+    # 服務關閉時取消執行中的工作並刪除所有報告檔案
+    async def shutdown(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in list(self._jobs.values()):
+            self._remove(job)
+
+    def stats(self):
+        counts = {status: 0 for status in (JOB_QUEUED, JOB_RUNNING, JOB_DONE, JOB_FAILED)}
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return {"max_concurrent": self.max_concurrent, "max_pending": self.max_pending, "ttl": self.ttl, **counts}
+
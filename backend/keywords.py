@@ -0,0 +1,75 @@
+# PMO_Report_Automation/backend/keywords.py
+
+# PPT 擷取時的關鍵字比對規則。比對規則 (正規表示式、標準化後的關鍵字) 在模組載入時建立一次，
+# 擷取每張投影片時只需執行比對，不再重複清理與標準化關鍵字。
+# 「標準化」等同 clean_text(text).replace(" ", "")：移除控制字元、零寬度字元與全形、半形空格。
+
+import re
+from functools import lru_cache
+
+# clean_text 移除的字元，加上全形與半形空格
+_KEY_IGNORED_CHARS_RE = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\u200b\ufeff\u200c\u200d\u00ad\u3000 ]+')
+
+# 表格分類規則：「工作總覽」表格的第一格包含其中任一字詞
+WORK_SUMMARY_MARKERS = ("工作總覽", "時間")
+# 「專案階段」表格的第一格以此開頭
+PROJECT_STAGE_PREFIX = "專案階段"
+# 投影片文字包含其中任一關鍵字時，頁面上的其他表格視為「程式修改」表格
+PROGRAM_MODIFICATION_KEYWORDS = (
+    "修改因重跑過程發現的問題所產生的程式修改",
+    "修改項目"
+)
+
+
+# 標準化文字，供關鍵字比對使用
+def normalize(text):
+    return _KEY_IGNORED_CHARS_RE.sub("", text)
+
+# 標準化表格儲存格等短文字；相同的表頭在各表格、各 PPT 間重複出現，因此保留結果
+@lru_cache(maxsize=8192)
+def normalize_key(text):
+    return normalize(text)
+
+
+# 以單一正規表示式比對多個關鍵字 (是否包含任一關鍵字)
+class KeywordMatcher:
+    def __init__(self, keywords, normalized=False):
+        self.keywords = tuple(normalize(kw) if normalized else kw for kw in keywords)
+        # 較長的關鍵字優先，相同位置時回傳最完整的關鍵字
+        alternatives = sorted(set(self.keywords), key=len, reverse=True)
+        self._pattern = re.compile("|".join(re.escape(kw) for kw in alternatives)) if alternatives else None
+
+    # 回傳 text 中第一個出現的關鍵字；未包含任何關鍵字時回傳 None
+    def search(self, text):
+        if self._pattern is None:
+            return None
+        match = self._pattern.search(text)
+        return match.group() if match else None
+
+
+# 取得 (共用的) 關鍵字比對器；相同的關鍵字組合只建立一次
+@lru_cache(maxsize=64)
+def keyword_matcher(keywords, normalized=False):
+    return KeywordMatcher(keywords, normalized=normalized)
+
+
+# 表格分類規則；判斷對象為標準化後的表格第一格文字與投影片文字
+class TableRules:
+    def __init__(self, work_summary_markers=WORK_SUMMARY_MARKERS, project_stage_prefix=PROJECT_STAGE_PREFIX,
+                 program_modification_keywords=PROGRAM_MODIFICATION_KEYWORDS):
+        self.work_summary = KeywordMatcher(work_summary_markers, normalized=True)
+        self.project_stage_prefix = normalize(project_stage_prefix)
+        self.program_modification = KeywordMatcher(program_modification_keywords, normalized=True)
+
+    def is_work_summary(self, first_cell_key):
+        return self.work_summary.search(first_cell_key) is not None
+
+    def is_project_stage(self, first_cell_key):
+        return first_cell_key.startswith(self.project_stage_prefix)
+
+    # 回傳投影片文字中的程式修改關鍵字；沒有時回傳 None
+    def program_modification_keyword(self, slide_key):
+        return self.program_modification.search(slide_key)
+
+
+DEFAULT_TABLE_RULES = TableRules()
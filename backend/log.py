@@ -0,0 +1,119 @@
+# PMO_Report_Automation/backend/log.py
+
+# 服務的日誌設定：每筆紀錄帶有請求 ID，方便區分同時處理的多個請求；
+# 紀錄先放入佇列，由背景執行緒寫出，呼叫端不會被 stdout 的 I/O 阻塞。
+# 逐張投影片、逐個表格的訊息使用 DEBUG 等級，未啟用時只需一次等級判斷。
+
+import atexit
+import contextvars
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import uuid
+
+from . import config
+
+# backend 套件的根日誌器；各模組以 logging.getLogger(__name__) 取得子日誌器
+ROOT_LOGGER_NAME = __package__ or "backend"
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+
+# 目前請求的 ID；不在請求中時為 "-"
+_request_id = contextvars.ContextVar("pmo_request_id", default="-")
+
+_setup_lock = threading.Lock()
+_configured_pid = None
+_listener = None
+
+
+# 將目前請求 ID 寫入每筆紀錄
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = _request_id.get()
+        return True
+
+
+# 產生新的請求 ID
+def new_request_id():
+    return uuid.uuid4().hex[:12]
+
+
+def get_request_id():
+    return _request_id.get()
+
+
+# 設定目前內容的請求 ID，回傳可交給 reset_request_id 的 token
+def set_request_id(request_id):
+    return _request_id.set(request_id or "-")
+
+
+def reset_request_id(token):
+    _request_id.reset(token)
+
+
+# 初始化日誌：backend 日誌器 → QueueHandler → 背景 QueueListener → stream。
+# 可重複呼叫；在行程池的子行程中會重新建立該行程自己的佇列與背景執行緒。
+def setup_logging(level=None, stream=None):
+    global _configured_pid, _listener
+    with _setup_lock:
+        if _configured_pid == os.getpid() and level is None and stream is None:
+            return
+        if _listener is not None and _configured_pid == os.getpid():
+            _listener.stop()
+
+        logger = logging.getLogger(ROOT_LOGGER_NAME)
+        logger.setLevel(level or config.LOG_LEVEL)
+        logger.propagate = False
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        # 請求 ID 須在呼叫端的內容中取得，因此過濾器掛在 QueueHandler 上
+        queue_handler.addFilter(RequestIdFilter())
+        logger.addHandler(queue_handler)
+
+        _listener = logging.handlers.QueueListener(log_queue, output)
+        _listener.start()
+        _configured_pid = os.getpid()
+
+
+# 停止背景寫出執行緒，並寫出佇列中剩餘的紀錄
+def shutdown_logging():
+    global _configured_pid, _listener
+    with _setup_lock:
+        if _listener is not None and _configured_pid == os.getpid():
+            _listener.stop()
+        _listener = None
+        _configured_pid = None
+
+
+atexit.register(shutdown_logging)
+
+
+# 目前行程已設定的日誌等級；尚未呼叫 setup_logging 時回傳 None
+def configured_level():
+    if _configured_pid != os.getpid():
+        return None
+    return logging.getLogger(ROOT_LOGGER_NAME).level
+
+
+# 行程池子行程的初始化函式：主行程已設定日誌時，子行程以相同等級建立自己的佇列與背景執行緒
+def init_worker_logging(level):
+    if level is not None:
+        setup_logging(level)
+
+
+# 在工作執行池中以指定的請求 ID 執行 fn(*args)
+def run_with_request_id(request_id, fn, *args):
+    token = _request_id.set(request_id)
+    try:
+        return fn(*args)
+    finally:
+        _request_id.reset(token)
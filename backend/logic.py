@@ -2,45 +2,41 @@
 
 from docx import Document
 from pptx import Presentation
-from docx.shared import Cm, Pt, RGBColor
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
+from docx.shared import Cm, Emu
+from docx.oxml.ns import nsdecls, qn
+from docx.oxml import OxmlElement, parse_xml
 from docx.enum.text import WD_BREAK
+import logging
 import re
 import os
+from xml.sax.saxutils import escape as xml_escape
+
+from . import metrics
+from .fragments import (
+    builtin_fragments,
+    DECK_END,
+    DECK_START,
+    LEGEND,
+    MONTHLY_SUMMARY_HEADING,
+    NO_DATA,
+    PAGE_BREAK,
+    WORK_OVERVIEW_HEADING
+)
+from .keywords import DEFAULT_TABLE_RULES, keyword_matcher, normalize, normalize_key
+from .scanner import scan_presentation
+from .tables import Table
+from .text import clean_text, clean_table, break_numbered_items
+from .styles import (
+    ensure_report_styles,
+    BULLET_STYLE,
+    TABLE_TEXT_STYLE,
+    HEADING_STYLES
+)
+
+logger = logging.getLogger(__name__)
 
 # --- 輔助函式 ---
 
-# 清理非法字元，並增加將全形空格轉換為半形空格的處理
-def clean_text(text):
-    if not isinstance(text, str):
-        text = str(text)
-    try:
-        # 移除控制字符和零寬度字符
-        cleaned_text = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\u200b\ufeff\u200c\u200d\u00ad]', '', text)
-        # 將全形空格轉換為半形空格
-        cleaned_text = cleaned_text.replace('\u3000', ' ')
-        return cleaned_text
-    except Exception as e:
-        print(f"清理文字時發生錯誤: {e} - 原始文字 (前100字): {text[:100]}")
-        return ""
-
-# 設定 Word 文件中文字區塊 (run) 的字型
-def set_run_fonts(run, ascii_font, east_asia_font, hansi_font):
-    try:
-        rpr = run._element.get_or_add_rPr()
-        rFonts_element = rpr.find(qn('w:rFonts'))
-        if rFonts_element is not None:
-            rpr.remove(rFonts_element)
-        r_fonts = OxmlElement('w:rFonts')
-        r_fonts.set(qn('w:ascii'), ascii_font)
-        r_fonts.set(qn('w:eastAsia'), east_asia_font)
-        r_fonts.set(qn('w:hAnsi'), hansi_font)
-        rpr.append(r_fonts)
-        run.font.name = ascii_font # 再次設置 run.font.name 確保應用
-    except Exception as e:
-        print(f"設定文字區塊字型時發生錯誤: '{run.text[:50]}...'. 錯誤: {e}")
-
 # 設定 Word 文件中 'Normal' 樣式的預設字型
 def set_doc_normal_font(doc):
     try:
@@ -56,10 +52,10 @@ def set_doc_normal_font(doc):
         rFonts_element.set(qn('w:eastAsia'), '標楷體')
         rFonts_element.set(qn('w:hAnsi'), 'Times New Roman')
         font.name = 'Times New Roman' # 再次設置 font.name 確保應用
-        print("已成功設定 'Normal' 樣式的預設字型。")
+        logger.debug("已成功設定 'Normal' 樣式的預設字型。")
     except Exception as e:
-        print(f"警告: 無法設定 'Normal' 樣式的預設字型。錯誤: {e}")
-        print("腳本將繼續執行，但預設樣式字型可能未正確應用。個別文字區塊的字型仍會設定。")
+        logger.warning("無法設定 'Normal' 樣式的預設字型。錯誤: %s", e)
+        logger.warning("腳本將繼續執行，但預設樣式字型可能未正確應用。報告樣式仍會設定字型。")
 
 # 判斷一個表格行是否為空行
 def is_row_empty(row_data):
@@ -67,140 +63,163 @@ def is_row_empty(row_data):
 
 # --- PPT 內容提取函式 ---
 
-# 從 PPT 中提取文字列表內容 (如「本月概要」)
-def extract_text_list_from_ppt(ppt, start_keyword, stop_keywords=None):
-    items = []
-    is_capturing = False
-    if stop_keywords is None:
-        stop_keywords = []
-
-    for slide in ppt.slides:
+# 將掃描結果 (ScannedSlide) 依序餵給多個擷取器；所有擷取器都完成時提前結束
+def collect(scanned_slides, collectors):
+    for scanned_slide in scanned_slides:
+        active = [collector for collector in collectors if not collector.done]
+        if not active:
+            break
+        metrics.count("slides")
+        metrics.count("ppt_tables", len(scanned_slide.tables))
+        for collector in active:
+            collector.feed(scanned_slide)
+    return [collector.result() for collector in collectors]
+
+# 以單次走訪 python-pptx Presentation 的結果餵給多個擷取器
+def collect_from_ppt(ppt, collectors):
+    return collect(scan_presentation(ppt), collectors)
+
+_LINE_SPLIT_RE = re.compile(r'[\n\r]+')
+
+# 從投影片文字框中擷取文字列表內容 (如「本月概要」)
+class TextListCollector:
+    def __init__(self, start_keyword, stop_keywords=None):
+        self.start_keyword = start_keyword
+        self.stop_keywords = stop_keywords if stop_keywords is not None else []
+        self._stop_matcher = keyword_matcher(tuple(self.stop_keywords))
+        self.items = []
+        self._seen_items = set()
+        self.is_capturing = False
+        self.done = False
+
+    def feed(self, scanned_slide):
         is_capturing_on_this_slide = False
-        for shape in slide.shapes:
-            if not shape.has_text_frame:
-                continue
-
-            text = shape.text_frame.text.strip()
-            lines = re.split(r'[\n\r]+', text)
+        for text in scanned_slide.text_frames:
+            lines = _LINE_SPLIT_RE.split(text.strip())
             for line in lines:
                 line = line.strip()
                 if not line:
                     continue
 
-                if start_keyword in line and not is_capturing_on_this_slide:
+                if self.start_keyword in line and not is_capturing_on_this_slide:
                     is_capturing_on_this_slide = True
-                    is_capturing = True
+                    self.is_capturing = True
                     continue
 
                 if is_capturing_on_this_slide:
-                    if any(kw in line for kw in stop_keywords):
+                    if self._stop_matcher.search(line) is not None:
                         is_capturing_on_this_slide = False
                         break
-                    
-                    if line and line not in items:
-                        items.append(line)
-        
-        if not is_capturing_on_this_slide and is_capturing:
-            break
-    return items
 
-# 提取特定表格並將其內容結構化，同時處理專案階段表格的合併
-def extract_relevant_tables_from_ppt(ppt):
-    extracted_tables_data = {
-        "work_summary_table_data": None,
-        "project_stage_tables_data": [],
-        "program_modifications_table_data": [],
-        "program_modifications_slide_indices": []
-    }
-
-    # 定義目標關鍵字列表
-    target_keywords = [
-        "修改因重跑過程發現的問題所產生的程式修改",
-        "修改項目" # 根據您的需求增加「修改項目」作為關鍵字
-    ]
-    # 將關鍵字標準化，用於比對
-    standardized_target_keywords = [clean_text(kw).replace(" ", "") for kw in target_keywords]
-
-    for slide_idx, slide in enumerate(ppt.slides): # slide_idx 從 0 開始
-        print(f"\n--- 正在檢查投影片 {slide_idx+1} ---")
-
-        # 提取整個投影片的文本內容進行關鍵字檢查
-        slide_full_text = ""
-        for shape in slide.shapes:
-            if shape.has_text_frame:
-                slide_full_text += clean_text(shape.text_frame.text) + "\n"
-        
-        # 標準化投影片的文本，移除空格進行更寬鬆的比對
-        standardized_slide_full_text = slide_full_text.replace(" ", "")
-
-        # 檢查關鍵字是否存在於整個投影片文本中
-        is_keyword_present_in_slide_anywhere = False
-        detected_keyword = None
-        for kw in standardized_target_keywords:
-            if kw in standardized_slide_full_text:
-                is_keyword_present_in_slide_anywhere = True
-                detected_keyword = kw # 記錄是哪個關鍵字被偵測到
-                print(f"  ✅ 投影片 {slide_idx+1} 的整體文本中偵測到關鍵字: '{kw}'")
-                break
-        
-        if not is_keyword_present_in_slide_anywhere:
-            print(f"  ❌ 投影片 {slide_idx+1} 的整體文本中未偵測到任何關鍵字。")
-
-        for shape_idx, shape in enumerate(slide.shapes):
-            if shape.has_table:
-                table = shape.table
-                current_table_data = []
-                for r in range(len(table.rows)):
-                    row_texts = []
-                    for c in range(len(table.columns)):
-                        try:
-                            cell_text = table.cell(r, c).text_frame.text.strip()
-                            row_texts.append(clean_text(cell_text))
-                        except Exception as e:
-                            print(f"    處理投影片 {slide_idx+1}、形狀 {shape_idx+1} 中的單元格 ({r},{c}) 時發生錯誤: {e}")
-                            row_texts.append("")
-                    current_table_data.append(row_texts)
-
-                if not current_table_data:
-                    print(f"    形狀 {shape_idx+1} 中的表格為空，跳過。")
-                    continue
+                    if line not in self._seen_items:
+                        self._seen_items.add(line)
+                        self.items.append(line)
+
+        if not is_capturing_on_this_slide and self.is_capturing:
+            self.done = True
+
+    # 擷取的各行已清理 (與表格內容一致)，寫入報告時不需再清理
+    def result(self):
+        return [clean_text(item) for item in self.items]
+
+# 擷取特定表格並將其內容結構化，同時處理專案階段表格的合併。
+# 表格以 Table 保存 (儲存格文字去重)，合併專案階段表格時只記錄要附加的列範圍，不複製列。
+class RelevantTablesCollector:
+    def __init__(self, rules=DEFAULT_TABLE_RULES):
+        self.rules = rules
+        self.extracted_tables_data = {
+            "work_summary_table_data": None,
+            "project_stage_tables_data": [],
+            "program_modifications_table_data": [],
+            "program_modifications_slide_indices": []
+        }
+        # 最後一個專案階段表格第二行的標準化文字，用於判斷下一個表格是否重複表頭
+        self._last_stage_subheader_keys = None
+        self.done = False
+
+    def feed(self, scanned_slide):
+        extracted_tables_data = self.extracted_tables_data
+        slide_idx = scanned_slide.slide_idx
+        logger.debug("--- 正在檢查投影片 %d ---", slide_idx + 1)
+        if not scanned_slide.tables:
+            return
+
+        # 標準化整個投影片的文本 (移除空格進行更寬鬆的比對)，檢查關鍵字是否存在
+        standardized_slide_full_text = normalize("\n".join(scanned_slide.text_frames))
+        matched_keyword = self.rules.program_modification_keyword(standardized_slide_full_text)
+        is_keyword_present_in_slide_anywhere = matched_keyword is not None
+        if is_keyword_present_in_slide_anywhere:
+            logger.debug("  ✅ 投影片 %d 的整體文本中偵測到關鍵字: '%s'", slide_idx + 1, matched_keyword)
+        else:
+            logger.debug("  ❌ 投影片 %d 的整體文本中未偵測到任何關鍵字。", slide_idx + 1)
 
-                first_cell_text = current_table_data[0][0].strip()
-                # 標準化表格第一格文本
-                standardized_first_cell_text = clean_text(first_cell_text).replace(" ", "")
-                print(f"    形狀 {shape_idx+1} 中的表格第一格內容: '{first_cell_text}'")
-
-                # 識別「工作總覽」表格
-                if (("工作總覽" in standardized_first_cell_text or "時間" in standardized_first_cell_text) and
-                        extracted_tables_data["work_summary_table_data"] is None):
-                    extracted_tables_data["work_summary_table_data"] = current_table_data
-                    print(f"    - 識別到 '工作總覽' 表格 (投影片 {slide_idx+1}, 形狀 {shape_idx+1})")
-
-                # 識別並合併「專案階段」表格
-                elif standardized_first_cell_text.startswith("專案階段"):
-                    if extracted_tables_data["project_stage_tables_data"] and \
-                       len(extracted_tables_data["project_stage_tables_data"][-1][0]) == len(current_table_data[0]):
-                        
-                        if len(current_table_data) >= 2 and \
-                           all(clean_text(current_table_data[1][c]).replace(" ", "") == clean_text(extracted_tables_data["project_stage_tables_data"][-1][1][c]).replace(" ", "") for c in range(len(current_table_data[1]))):
-                            extracted_tables_data["project_stage_tables_data"][-1].extend(current_table_data[2:])
-                            print(f"    - 合併 '專案階段' 表格 (投影片 {slide_idx+1}, 形狀 {shape_idx+1})，並移除前兩行，到上一個表格")
-                        else:
-                            extracted_tables_data["project_stage_tables_data"][-1].extend(current_table_data[1:])
-                            print(f"    - 合併 '專案階段' 表格 (投影片 {slide_idx+1}, 形狀 {shape_idx+1})，並移除第一行，到上一個表格")
-                    else:
-                        extracted_tables_data["project_stage_tables_data"].append(current_table_data)
-                        print(f"    - 識別到新的 '專案階段' 表格 (投影片 {slide_idx+1}, 形狀 {shape_idx+1})")
+        for shape_idx, rows in scanned_slide.tables:
+            current_table_data = Table(clean_table(rows))
 
-                # 識別「程式修改」表格（條件放寬：只要整頁有關鍵字，不再檢查表格第一欄，也不限第二頁）
-                elif is_keyword_present_in_slide_anywhere:
-                    extracted_tables_data["program_modifications_table_data"].append(current_table_data)
-                    extracted_tables_data["program_modifications_slide_indices"].append(slide_idx)
-                    print(f"    - 偵測到符合條件的 '程式修改' 表格 (投影片 {slide_idx+1}, 形狀 {shape_idx+1})。")
+            if not current_table_data:
+                logger.debug("    形狀 %d 中的表格為空，跳過。", shape_idx + 1)
+                continue
 
+            first_cell_text = current_table_data[0][0].strip()
+            # 標準化表格第一格文本
+            standardized_first_cell_text = normalize_key(first_cell_text)
+            logger.debug("    形狀 %d 中的表格第一格內容: '%s'", shape_idx + 1, first_cell_text)
+
+            # 識別「工作總覽」表格
+            if (extracted_tables_data["work_summary_table_data"] is None and
+                    self.rules.is_work_summary(standardized_first_cell_text)):
+                extracted_tables_data["work_summary_table_data"] = current_table_data
+                logger.debug("    - 識別到 '工作總覽' 表格 (投影片 %d, 形狀 %d)", slide_idx + 1, shape_idx + 1)
+
+            # 識別並合併「專案階段」表格
+            elif self.rules.is_project_stage(standardized_first_cell_text):
+                if extracted_tables_data["project_stage_tables_data"] and \
+                   len(extracted_tables_data["project_stage_tables_data"][-1][0]) == len(current_table_data[0]):
+
+                    if len(current_table_data) >= 2 and self._repeats_stage_subheader(current_table_data[1]):
+                        extracted_tables_data["project_stage_tables_data"][-1].extend_from(current_table_data, 2)
+                        logger.debug("    - 合併 '專案階段' 表格 (投影片 %d, 形狀 %d)，並移除前兩行，到上一個表格", slide_idx + 1, shape_idx + 1)
+                    else:
+                        extracted_tables_data["project_stage_tables_data"][-1].extend_from(current_table_data, 1)
+                        self._remember_stage_subheader(extracted_tables_data["project_stage_tables_data"][-1])
+                        logger.debug("    - 合併 '專案階段' 表格 (投影片 %d, 形狀 %d)，並移除第一行，到上一個表格", slide_idx + 1, shape_idx + 1)
                 else:
-                    print(f"    - 形狀 {shape_idx+1} 中的表格不是目標表格類型。")
-    return extracted_tables_data
+                    extracted_tables_data["project_stage_tables_data"].append(current_table_data)
+                    self._last_stage_subheader_keys = None
+                    self._remember_stage_subheader(current_table_data)
+                    logger.debug("    - 識別到新的 '專案階段' 表格 (投影片 %d, 形狀 %d)", slide_idx + 1, shape_idx + 1)
+
+            # 識別「程式修改」表格（條件放寬：只要整頁有關鍵字，不再檢查表格第一欄，也不限第二頁）
+            elif is_keyword_present_in_slide_anywhere:
+                extracted_tables_data["program_modifications_table_data"].append(current_table_data)
+                extracted_tables_data["program_modifications_slide_indices"].append(slide_idx)
+                logger.debug("    - 偵測到符合條件的 '程式修改' 表格 (投影片 %d, 形狀 %d)。", slide_idx + 1, shape_idx + 1)
+
+            else:
+                logger.debug("    - 形狀 %d 中的表格不是目標表格類型。", shape_idx + 1)
+
+    # 記下合併後專案階段表格的第二行 (子表頭)；表格只有一行時，第二行來自之後合併進來的表格
+    def _remember_stage_subheader(self, table):
+        if self._last_stage_subheader_keys is None and len(table) >= 2:
+            self._last_stage_subheader_keys = [normalize_key(cell) for cell in table[1]]
+
+    # 表格第二行是否與最後一個專案階段表格的第二行相同 (跨頁重複的表頭)
+    def _repeats_stage_subheader(self, row):
+        previous = self._last_stage_subheader_keys
+        if previous is None or len(previous) < len(row):
+            return False
+        return all(normalize_key(cell) == previous[c] for c, cell in enumerate(row))
+
+    def result(self):
+        return self.extracted_tables_data
+
+# 從 PPT 中提取文字列表內容 (如「本月概要」)
+def extract_text_list_from_ppt(ppt, start_keyword, stop_keywords=None):
+    return collect_from_ppt(ppt, [TextListCollector(start_keyword, stop_keywords)])[0]
+
+# 提取特定表格並將其內容結構化，同時處理專案階段表格的合併
+def extract_relevant_tables_from_ppt(ppt):
+    return collect_from_ppt(ppt, [RelevantTablesCollector()])[0]
 
 # 處理工作總覽表格數據，將其轉換為列表形式的關鍵字-值對
 def process_work_summary_table(table_data):
@@ -244,257 +263,251 @@ def process_work_summary_table(table_data):
     final_items = [item.strip() for item in items if item.strip()]
     return list(dict.fromkeys(final_items))
 
-# 插入處理後的表格數據進 Word 並設定字型與欄寬、合併欄位與網底與換行支援
-def add_filtered_tables(doc, tables_data_list):
-    predefined_widths_map = {
-        10: [Cm(1.24), Cm(0.81), Cm(0.81), Cm(1.38), Cm(4.69), Cm(2.56), Cm(2.25), Cm(0.75), Cm(2.25), Cm(2.29)],
-        2: [Cm(2), Cm(17.03)],
-    }
+# --- Word 表格建立 ---
+
+# 表格欄寬設定 (依欄數)
+TABLE_PREDEFINED_WIDTHS_MAP = {
+    10: [Cm(1.24), Cm(0.81), Cm(0.81), Cm(1.38), Cm(4.69), Cm(2.56), Cm(2.25), Cm(0.75), Cm(2.25), Cm(2.29)],
+    2: [Cm(2), Cm(17.03)],
+}
+# 表格總寬 (公分)
+TABLE_TOTAL_WIDTH_CM = 19.03
+# 10 欄表格中，第 2 列到最後一列需垂直合併的欄位
+TABLE_MERGED_COLUMNS = [0, 8, 9]
+
+# 過濾表格尾端的空白行；無有效內容時回傳空列表。table_data 為 Table 時回傳不複製列的 Table
+def _trim_trailing_empty_rows(table_data):
+    last_valid_row_idx = -1
+    for r_idx in range(len(table_data) - 1, -1, -1):
+        if not is_row_empty(table_data[r_idx]):
+            last_valid_row_idx = r_idx
+            break
+    return table_data[:last_valid_row_idx + 1] if last_valid_row_idx != -1 else []
+
+# 建立表格並設定樣式與總寬
+def _add_doc_table(doc, rows, cols):
+    doc_table = doc.add_table(rows=rows, cols=cols)
+    doc_table.style = "Table Grid"
+    doc_table.autofit = False
+
+    tbl = doc_table._tbl
+    tblPr = tbl.tblPr
+    if tblPr is None:
+        tblPr = OxmlElement('w:tblPr')
+        tbl.insert(0, tblPr)
+
+    tblW_existing = tblPr.find(qn('w:tblW'))
+    if tblW_existing is not None:
+        tblPr.remove(tblW_existing)
+
+    tblW = OxmlElement('w:tblW')
+    tblW.set(qn('w:type'), 'dxa')
+    tblW.set(qn('w:w'), str(int(TABLE_TOTAL_WIDTH_CM * 567)))  # 10790 dxa
+    tblPr.append(tblW)
+    return doc_table
+
+# 取得各欄寬度
+def _column_widths(cols):
+    if cols in TABLE_PREDEFINED_WIDTHS_MAP:
+        current_column_widths_cm = TABLE_PREDEFINED_WIDTHS_MAP[cols]
+        logger.debug("    - 為 %d 欄表格套用預設欄寬: %s", cols, current_column_widths_cm)
+    else:
+        col_width = Cm(TABLE_TOTAL_WIDTH_CM / cols)
+        current_column_widths_cm = [col_width] * cols
+        logger.debug("    - 為 %d 欄表格平均分配欄寬: %.2f cm/欄", cols, col_width.cm)
+    return current_column_widths_cm
+
+# 將儲存格文字清理並切分為要寫入的各行；text_cleaned 為 True 時文字已清理過 (extract_deck 的輸出)
+def _cell_lines(cell_text, c, text_cleaned=False):
+    cleaned_text = cell_text if text_cleaned else clean_text(cell_text)
+
+    # 特殊換行處理（第4欄）
+    if c == 4:
+        return break_numbered_items(cleaned_text).splitlines()
+    return cleaned_text.splitlines()
+
+# 表格文字的字型與字級由 PMO Table Text 樣式提供，文字區塊本身不帶 rPr
+_TABLE_BREAK_RUN_XML = '<w:r><w:br/></w:r>'
+_TABLE_PPR_XML = '<w:pPr><w:pStyle w:val="{style_id}"/></w:pPr>'
+_TABLE_SPACED_PPR_XML = '<w:pPr><w:pStyle w:val="{style_id}"/><w:spacing w:before="240"/></w:pPr>'
+_TABLE_HEADER_SHADING_XML = '<w:shd w:val="clear" w:color="auto" w:fill="D9D9D9"/>'
+_EMPTY_P_XML = '<w:p/>'
+
+# 產生單一文字區塊的 XML；與 python-docx 相同，定位字元轉為 w:tab，前後有空白的文字保留空白
+def _table_run_xml(text):
+    parts = []
+    for idx, segment in enumerate(text.split("\t")):
+        if idx > 0:
+            parts.append('<w:tab/>')
+        if segment:
+            escaped = xml_escape(segment)
+            if len(segment.strip()) < len(segment):
+                parts.append(f'<w:t xml:space="preserve">{escaped}</w:t>')
+            else:
+                parts.append(f'<w:t>{escaped}</w:t>')
+    return '<w:r>' + ''.join(parts) + '</w:r>'
+
+# 產生單一儲存格的段落；回傳 [(段落 XML, 是否含文字區塊)]。含文字的段落套用 style_id 樣式
+def _table_cell_paragraphs(lines_to_add, r, c, style_id):
+    first_runs = []
+    extra_paragraphs = []
+    separate_paragraphs = c in [8, 9] and r != 0
+    for idx, line in enumerate(lines_to_add):
+        if not line.strip():
+            continue
+        run_xml = _table_run_xml(line.strip())
+        if separate_paragraphs:
+            # 第 9、10 欄：第一行寫入原段落，其餘各行另起段落並設定段前距
+            if idx == 0:
+                first_runs.append(run_xml)
+            else:
+                extra_paragraphs.append((f'<w:p>{_TABLE_SPACED_PPR_XML.format(style_id=style_id)}{run_xml}</w:p>', True))
+        else:
+            if idx > 0:
+                first_runs.append(_TABLE_BREAK_RUN_XML)
+            first_runs.append(run_xml)
 
+    if first_runs:
+        first_paragraph = (f'<w:p>{_TABLE_PPR_XML.format(style_id=style_id)}{"".join(first_runs)}</w:p>', True)
+    else:
+        first_paragraph = (_EMPTY_P_XML, False)
+    return [first_paragraph] + extra_paragraphs
+
+# 模擬 python-docx 垂直合併儲存格時的內容搬移：下方非空白儲存格的段落移到最上方的儲存格，
+# 被合併的儲存格只留下一個空白段落
+def _merge_cell_paragraphs(column_cells):
+    top = column_cells[0]
+    for idx in range(1, len(column_cells)):
+        cell = column_cells[idx]
+        if len(cell) == 1 and not cell[0][1]:
+            continue
+        if not top[-1][1]:
+            top.pop()
+        top.extend(cell)
+        column_cells[idx] = [(_EMPTY_P_XML, False)]
+
+# 插入處理後的表格數據進 Word 並設定字型與欄寬、合併欄位與網底與換行支援。
+# 整個表格的列與儲存格先組成一份 XML 再一次解析，取代逐格呼叫 doc_table.cell(r, c)。
+# text_cleaned 為 True 時表示儲存格文字已清理過 (extract_deck 的輸出)，不再重複清理。
+# 各表格可為列的列表或 Table (extract_deck 的輸出)。
+def add_filtered_tables(doc, tables_data_list, text_cleaned=False):
+    table_text_style_id = ensure_report_styles(doc)[TABLE_TEXT_STYLE]
     for table_data in tables_data_list:
         if not table_data:
             continue
 
         # 過濾空白行
-        last_valid_row_idx = -1
-        for r_idx in range(len(table_data) - 1, -1, -1):
-            if not is_row_empty(table_data[r_idx]):
-                last_valid_row_idx = r_idx
-                break
-
-        table_data_to_use = table_data[:last_valid_row_idx + 1] if last_valid_row_idx != -1 else []
+        table_data_to_use = _trim_trailing_empty_rows(table_data)
         if not table_data_to_use:
-            print("    - 檢測到表格為空或僅包含空白行，已跳過。")
+            logger.debug("    - 檢測到表格為空或僅包含空白行，已跳過。")
             continue
 
         rows = len(table_data_to_use)
         cols = len(table_data_to_use[0]) if rows > 0 else 0
         if cols == 0:
-            print("    - 檢測到表格列數為零，已跳過。")
+            logger.debug("    - 檢測到表格列數為零，已跳過。")
             continue
 
-        # 建立表格
-        doc_table = doc.add_table(rows=rows, cols=cols)
-        doc_table.style = "Table Grid"
-        doc_table.autofit = False
-
+        # 建立表格 (不含任何列)
+        doc_table = _add_doc_table(doc, 0, cols)
         tbl = doc_table._tbl
-        tblPr = tbl.tblPr
-        if tblPr is None:
-            tblPr = OxmlElement('w:tblPr')
-            tbl.insert(0, tblPr)
-
-        tblW_existing = tblPr.find(qn('w:tblW'))
-        if tblW_existing is not None:
-            tblPr.remove(tblW_existing)
-
-        tblW = OxmlElement('w:tblW')
-        tblW.set(qn('w:type'), 'dxa')
-        tblW.set(qn('w:w'), str(int(19.03 * 567)))  # 11361 dxa
-        tblPr.append(tblW)
+        # python-docx 建立表格時各儲存格的預設寬度；垂直合併的延續儲存格會保留此寬度
+        default_width_twips = tbl.tblGrid.gridCol_lst[0].w.twips if cols else 0
 
         # 欄寬設定
-        if cols in predefined_widths_map:
-            current_column_widths_cm = predefined_widths_map[cols]
-            print(f"    - 為 {cols} 欄表格套用預設欄寬: {current_column_widths_cm}")
-        else:
-            col_width = Cm(19.03 / cols)
-            current_column_widths_cm = [col_width] * cols
-            print(f"    - 為 {cols} 欄表格平均分配欄寬: {col_width.cm:.2f} cm/欄")
+        current_column_widths_cm = _column_widths(cols)
+        width_twips = [Emu(width).twips for width in current_column_widths_cm]
+
+        # 各儲存格段落
+        cell_paragraphs = []
+        run_count = 0
+        for r, row_data in enumerate(table_data_to_use):
+            row_cells = []
+            for c in range(cols):
+                cell_text = row_data[c] if c < len(row_data) else ""
+                lines_to_add = _cell_lines(cell_text, c, text_cleaned)
+                run_count += sum(1 for line in lines_to_add if line.strip())
+                row_cells.append(_table_cell_paragraphs(lines_to_add, r, c, table_text_style_id))
+            cell_paragraphs.append(row_cells)
 
-        # 寫入內容
+        # 合併欄位（僅適用 10 欄的表格）
+        merged_columns = []
+        if cols == 10 and rows > 2:
+            merged_columns = [col_idx for col_idx in TABLE_MERGED_COLUMNS if col_idx < cols]
+            for col_idx in merged_columns:
+                column_cells = [cell_paragraphs[r][col_idx] for r in range(1, rows)]
+                _merge_cell_paragraphs(column_cells)
+                for r in range(1, rows):
+                    cell_paragraphs[r][col_idx] = column_cells[r - 1]
+
+        # 組合整個表格的 XML
+        parts = [f'<w:tbl {nsdecls("w")}>']
         for r in range(rows):
+            parts.append('<w:tr>')
             for c in range(cols):
-                cell_text = table_data_to_use[r][c] if c < len(table_data_to_use[r]) else ""
-                word_cell = doc_table.cell(r, c)
-                paragraph = word_cell.paragraphs[0]
-                paragraph.clear()
-                cleaned_text = clean_text(cell_text)
-
-
-                # 特殊換行處理（第4欄、第9~10欄）
-                if c == 4:
-                    first_match = re.search(r'(\d+、)', cleaned_text)
-                    if first_match:
-                        temp_placeholder = "__FIRST_MATCH_PLACEHOLDER__"
-                        temp_text = cleaned_text.replace(first_match.group(0), temp_placeholder, 1)
-                        formatted_text = re.sub(r'(\d+、)', r'\n\1', temp_text)
-                        formatted_text = formatted_text.replace(temp_placeholder, first_match.group(0))
-                    else:
-                        formatted_text = cleaned_text
-                    lines_to_add = formatted_text.splitlines()
-                else:
-                    lines_to_add = cleaned_text.splitlines()
-
-                # 第 9、10 欄特殊處理
-                if c in [8, 9]:
-                    if r == 0:
-                        for idx, line in enumerate(lines_to_add):
-                            if not line.strip():
-                                continue
-                            if idx > 0:
-                                paragraph.add_run().add_break()
-                            run = paragraph.add_run(line.strip())
-                            set_run_fonts(run, 'Times New Roman', '標楷體', 'Times New Roman')
-                            run.font.size = Pt(12)
-                    else:
-                        for idx, line in enumerate(lines_to_add):
-                            if not line.strip():
-                                continue
-                            if idx == 0:
-                                run = paragraph.add_run(line.strip())
-                                set_run_fonts(run, 'Times New Roman', '標楷體', 'Times New Roman')
-                                run.font.size = Pt(12)
-                            else:
-                                para = word_cell.add_paragraph()
-                                para.paragraph_format.space_before = Pt(12)
-                                run = para.add_run(line.strip())
-                                set_run_fonts(run, 'Times New Roman', '標楷體', 'Times New Roman')
-                                run.font.size = Pt(12)
-                else:
-                    for idx, line in enumerate(lines_to_add):
-                        if not line.strip():
-                            continue
-                        if idx > 0:
-                            paragraph.add_run().add_break()
-                        run = paragraph.add_run(line.strip())
-                        set_run_fonts(run, 'Times New Roman', '標楷體', 'Times New Roman')
-                        run.font.size = Pt(12)
-
-                # 表頭網底
+                is_continuation = c in merged_columns and r > 1
+                width = default_width_twips if is_continuation else width_twips[c]
+                parts.append(f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/>')
+                if c in merged_columns and r == 1:
+                    parts.append('<w:vMerge w:val="restart"/>')
+                elif is_continuation:
+                    parts.append('<w:vMerge/>')
                 if r == 0:
-                    tcPr = word_cell._tc.get_or_add_tcPr()
-                    shd = OxmlElement('w:shd')
-                    shd.set(qn('w:val'), 'clear')
-                    shd.set(qn('w:color'), 'auto')
-                    shd.set(qn('w:fill'), 'D9D9D9')  # 淺灰色
-                    tcPr.append(shd)
-
-        # 合併欄位（僅適用 10 欄的表格）
-        if cols == 10 and rows > 1:
-            for col_idx in [0, 8, 9]:
-                if col_idx < cols:
-                    try:
-                        doc_table.cell(1, col_idx).merge(doc_table.cell(rows - 1, col_idx))
-                    except Exception as e:
-                        print(f"無法合併表格第 {col_idx+1} 欄: {e}")
-
-        # 設定每一欄的寬度
-        for i, width_cm in enumerate(current_column_widths_cm):
-            if i < cols:
-                for cell in doc_table.columns[i].cells:
-                    cell.width = width_cm
-
-
-
-# 插入 PPT 內容進 Word 文件中的動態會議區塊
-def insert_dynamic_meeting_section(doc, ppt_name, work_items, summary_items, add_page_break=False):
+                    # 表頭網底
+                    parts.append(_TABLE_HEADER_SHADING_XML)
+                parts.append('</w:tcPr>')
+                parts.extend(paragraph_xml for paragraph_xml, _ in cell_paragraphs[r][c])
+                parts.append('</w:tc>')
+            parts.append('</w:tr>')
+        parts.append('</w:tbl>')
+
+        for tr in parse_xml(''.join(parts)).iterchildren(qn('w:tr')):
+            tbl.append(tr)
+
+        metrics.count("word_tables")
+        metrics.count("table_rows", rows)
+        metrics.count("runs", run_count)
+
+# 加入套用指定樣式的段落；直接寫入 styleId，避免 python-docx 每次以名稱查詢樣式
+def _add_styled_paragraph(doc, text, style_id):
+    paragraph = doc.add_paragraph(text)
+    paragraph._p.style = style_id
+    if text:
+        metrics.count("runs")
+    return paragraph
+
+# 插入 PPT 內容進 Word 文件中的動態會議區塊；字型與縮排由報告樣式提供。
+# 標題、無資料提示與分頁等靜態內容由 fragments 提供 (未指定時使用內建區塊)。
+def insert_dynamic_meeting_section(doc, ppt_name, work_items, summary_items, add_page_break=False, text_cleaned=False,
+                                   fragments=None):
+    if fragments is None:
+        fragments = builtin_fragments(ensure_report_styles(doc))
+    style_ids = fragments.style_ids
     if add_page_break:
-        doc.add_page_break()
+        fragments.append(doc, PAGE_BREAK)
+    fragments.append(doc, DECK_START)
 
     title = os.path.splitext(ppt_name)[0]
 
-    heading2 = doc.add_heading(level=2)
-    run_h2 = heading2.add_run(title)
-    set_run_fonts(run_h2, 'Times New Roman', '標楷體', 'Times New Roman')
-
-    heading3_work = doc.add_heading(level=3)
-    run_h3_work = heading3_work.add_run("工作總覽")
-    set_run_fonts(run_h3_work, 'Times New Roman', '標楷體', 'Times New Roman')
-
-    if work_items:
-        for item_text in work_items:
-            cleaned_item_text = clean_text(item_text).replace('\r', '').replace('\n', ' ')
-            para = doc.add_paragraph(f"● {cleaned_item_text}")
-            para.paragraph_format.left_indent = Cm(0.63)
-            for run in para.runs:
-                set_run_fonts(run, 'Times New Roman', '標楷體', 'Times New Roman')
-    else:
-        para_no_data = doc.add_paragraph("（尚無資料）")
-        for run in para_no_data.runs:
-            set_run_fonts(run, 'Times New Roman', '標楷體', 'Times New Roman')
-
-    heading3_summary = doc.add_heading(level=3)
-    run_h3_summary = heading3_summary.add_run("本月概要")
-    set_run_fonts(run_h3_summary, 'Times New Roman', '標楷體', 'Times New Roman')
-
-    if summary_items:
-        for item_text in summary_items:
-            cleaned_item_text = clean_text(item_text).replace('\r', '').replace('\n', ' ')
-            para = doc.add_paragraph(f"● {cleaned_item_text}")
-            para.paragraph_format.left_indent = Cm(0.63)
-            for run in para.runs:
-                set_run_fonts(run, 'Times New Roman', '標楷體', 'Times New Roman')
+    _add_styled_paragraph(doc, title, style_ids[HEADING_STYLES[2]])
+    fragments.append(doc, WORK_OVERVIEW_HEADING)
+    _add_bullet_items(doc, work_items, style_ids, fragments, text_cleaned)
+
+    fragments.append(doc, MONTHLY_SUMMARY_HEADING)
+    _add_bullet_items(doc, summary_items, style_ids, fragments, text_cleaned)
+
+# 逐項加入項目段落；沒有項目時加入無資料提示
+def _add_bullet_items(doc, items, style_ids, fragments, text_cleaned=False):
+    if items:
+        for item_text in items:
+            cleaned_item_text = (item_text if text_cleaned else clean_text(item_text)).replace('\r', '').replace('\n', ' ')
+            _add_styled_paragraph(doc, f"● {cleaned_item_text}", style_ids[BULLET_STYLE])
     else:
-        para_no_data = doc.add_paragraph("（尚無資料）")
-        for run in para_no_data.runs:
-            set_run_fonts(run, 'Times New Roman', '標楷體', 'Times New Roman')
-
-# 新增函數：添加圖例和狀態說明
-def add_legend_and_status(doc):
-    p_legend = doc.add_paragraph()
-    p_legend.paragraph_format.space_after = Pt(0)
-
-    run_unit_title = p_legend.add_run("工項主要單位：")
-    set_run_fonts(run_unit_title, 'Times New Roman', '標楷體', 'Times New Roman')
-    run_unit_title.font.size = Pt(12)
-    run_unit_title.font.color.rgb = RGBColor(0, 0, 0)
-
-    run_ey_circle = p_legend.add_run(" ●")
-    set_run_fonts(run_ey_circle, 'Times New Roman', '標楷體', 'Times New Roman')
-    run_ey_circle.font.size = Pt(12)
-    run_ey_circle.font.color.rgb = RGBColor(0xF0, 0xD4, 0xB0)
-    run_ey_text = p_legend.add_run(" EY")
-    set_run_fonts(run_ey_text, 'Times New Roman', '標楷體', 'Times New Roman')
-    run_ey_text.font.size = Pt(12)
-    run_ey_text.font.color.rgb = RGBColor(0, 0, 0)
-
-    run_vendor_circle = p_legend.add_run("  ●")
-    set_run_fonts(run_vendor_circle, 'Times New Roman', '標楷體', 'Times New Roman')
-    run_vendor_circle.font.size = Pt(12)
-    run_vendor_circle.font.color.rgb = RGBColor(0xF2, 0xAA, 0x6B)
-    run_vendor_text = p_legend.add_run(" 建置廠商")
-    set_run_fonts(run_vendor_text, 'Times New Roman', '標楷體', 'Times New Roman')
-    run_vendor_text.font.size = Pt(12)
-    run_vendor_text.font.color.rgb = RGBColor(0, 0, 0)
-
-    run_first_ins_circle = p_legend.add_run("  ●")
-    set_run_fonts(run_first_ins_circle, 'Times New Roman', '標楷體', 'Times New Roman')
-    run_first_ins_circle.font.size = Pt(12)
-    run_first_ins_circle.font.color.rgb = RGBColor(0xC0, 0xEA, 0xFA)
-    run_first_ins_text = p_legend.add_run(" 第一保")
-    set_run_fonts(run_first_ins_text, 'Times New Roman', '標楷體', 'Times New Roman')
-    run_first_ins_text.font.size = Pt(12)
-    run_first_ins_text.font.color.rgb = RGBColor(0, 0, 0)
-
-    run_status_title = p_legend.add_run("    狀態：")
-    set_run_fonts(run_status_title, 'Times New Roman', '標楷體', 'Times New Roman')
-    run_status_title.font.size = Pt(12)
-    run_status_title.font.color.rgb = RGBColor(0, 0, 0)
-
-    run_green_circle = p_legend.add_run(" ●")
-    set_run_fonts(run_green_circle, 'Times New Roman', '標楷體', 'Times New Roman')
-    run_green_circle.font.size = Pt(12)
-    run_green_circle.font.color.rgb = RGBColor(0x00, 0xB0, 0x50)
-    run_green_text = p_legend.add_run(" 正常完成")
-    set_run_fonts(run_green_text, 'Times New Roman', '標楷體', 'Times New Roman')
-    run_green_text.font.size = Pt(12)
-    run_green_text.font.color.rgb = RGBColor(0, 0, 0)
-
-    run_yellow_circle = p_legend.add_run("  ●")
-    set_run_fonts(run_yellow_circle, 'Times New Roman', '標楷體', 'Times New Roman')
-    run_yellow_circle.font.size = Pt(12)
-    run_yellow_circle.font.color.rgb = RGBColor(0xFF, 0xC0, 0x00)
-    run_yellow_text = p_legend.add_run(" 部分延遲")
-    set_run_fonts(run_yellow_text, 'Times New Roman', '標楷體', 'Times New Roman')
-    run_yellow_text.font.size = Pt(12)
-    run_yellow_text.font.color.rgb = RGBColor(0, 0, 0)
-
-    run_red_circle = p_legend.add_run("  ●")
-    set_run_fonts(run_red_circle, 'Times New Roman', '標楷體', 'Times New Roman')
-    run_red_circle.font.size = Pt(12)
-    run_red_circle.font.color.rgb = RGBColor(0xFF, 0x00, 0x00)
-    run_red_text = p_legend.add_run(" 嚴重延遲")
-    set_run_fonts(run_red_text, 'Times New Roman', '標楷體', 'Times New Roman')
-    run_red_text.font.size = Pt(12)
-    run_red_text.font.color.rgb = RGBColor(0, 0, 0)
+        fragments.append(doc, NO_DATA)
+
+# 新增函數：添加圖例和狀態說明 (以及範本自訂的 PPT 結尾區塊)
+def add_legend_and_status(doc, fragments=None):
+    if fragments is None:
+        fragments = builtin_fragments(ensure_report_styles(doc))
+    fragments.append(doc, LEGEND)
+    fragments.append(doc, DECK_END)
@@ -1,147 +1,997 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import HTMLResponse, StreamingResponse, FileResponse
-from fastapi.staticfiles import StaticFiles
-import io
+from contextlib import asynccontextmanager, contextmanager
+from fastapi import FastAPI, Body, File, Form, UploadFile, HTTPException, Header, Request
+from fastapi.responses import HTMLResponse, FileResponse, PlainTextResponse, Response
+from starlette.background import BackgroundTask
+import asyncio
+import logging
 import os
-from typing import List
+import re
+import time
+from typing import List, Optional
 from urllib.parse import quote
 
-# 導入所有核心邏輯和輔助函式
-from .logic import (
-    set_doc_normal_font,
-    extract_text_list_from_ppt,
-    extract_relevant_tables_from_ppt,
-    process_work_summary_table,
-    add_filtered_tables,
-    insert_dynamic_meeting_section,
-    add_legend_and_status
+from . import config
+from .assets import AssetStore
+from .admission import (
+    AdmissionController,
+    AdmissionRejected,
+    RequestSizeLimitMiddleware,
+    SHED_EXECUTOR_SATURATED,
+    SHED_JOBS_QUEUE_FULL,
+    SHED_REASONS,
+    SHED_REQUEST_TOO_LARGE,
+    SHED_TOO_MANY_DECKS,
+    SHED_UPLOAD_TOO_LARGE
 )
-from docx import Document
-from pptx import Presentation
+from .blobs import BlobStore, BlobsMissing, is_valid_blob_id
+from .cache import DeckCache, ReportCache, etag_matches, sha256_hex
+from .executor import JobExecutor, ExecutorSaturated, JobTimeout
+from .jobs import JobStore, JobQueueFull, JOB_DONE
+# 導入可於工作執行池中執行的報告產生步驟
+# (python-docx 與 python-pptx 於第一次使用時才載入，服務啟動後由預熱預先載入)
+from .pipeline import (
+    EXTRACTOR_VERSION, RENDERER_VERSION, InvalidDocument, extract_deck, render_report, validate_template, template_base_count
+)
+from .warmup import WARMUP_MODES, warm_up
+from .templates import TemplateRegistry
+from .reports import ReportModelStore, entry_deck
+from .memory import PeakMemorySampler
+from .uploads import SpooledUpload, UploadTooLarge, spool_upload, remove_spooled, new_output_path, remove_file
+from .log import setup_logging, new_request_id, set_request_id, reset_request_id
+from .metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+    StageRecorder,
+    counts_header,
+    run_recorded,
+    server_timing_header
+)
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+warmup_mode = config.WARMUP_MODE
+if warmup_mode not in WARMUP_MODES:
+    logger.warning("未知的預熱模式 '%s'，改用 background。", warmup_mode)
+    warmup_mode = "background"
+
+# PPT 解析與 Word 組裝的工作執行池 (避免阻塞事件迴圈)
+executor = JobExecutor(
+    mode=config.EXECUTOR_MODE,
+    max_workers=config.EXECUTOR_MAX_WORKERS,
+    max_queue=config.EXECUTOR_MAX_QUEUE,
+    job_timeout=config.EXECUTOR_JOB_TIMEOUT,
+    retry_after=config.EXECUTOR_RETRY_AFTER,
+    warm_up=None if warmup_mode == "off" else warm_up
+)
+
+# PPT 擷取結果快取 (以檔案內容雜湊為鍵)
+deck_cache = DeckCache(
+    directory=config.DECK_CACHE_DIR,
+    max_bytes=config.DECK_CACHE_MAX_BYTES,
+    memory_items=config.DECK_CACHE_MEMORY_ITEMS,
+    extractor_version=EXTRACTOR_VERSION,
+    enabled=config.DECK_CACHE_ENABLED
+)
+
+# 整份報告的快取 (以範本 ID 與依序排列的 PPT 內容雜湊及檔名為鍵)
+report_cache = ReportCache(
+    directory=config.REPORT_CACHE_DIR,
+    max_bytes=config.REPORT_CACHE_MAX_BYTES,
+    extractor_version=EXTRACTOR_VERSION,
+    renderer_version=RENDERER_VERSION,
+    enabled=config.REPORT_CACHE_ENABLED
+)
+
+# 伺服器端的 Word 範本登錄 (以範本內容雜湊作為範本 ID)
+template_registry = TemplateRegistry(
+    directory=config.TEMPLATE_DIR,
+    max_bytes=config.TEMPLATE_MAX_BYTES
+)
+
+# 報告的中間模型 (以報告 ID 為鍵)，供只更換部分 PPT 時重新產生報告
+report_models = ReportModelStore(
+    directory=config.REPORT_MODEL_DIR,
+    max_bytes=config.REPORT_MODEL_MAX_BYTES,
+    extractor_version=EXTRACTOR_VERSION
+)
+
+# 以內容雜湊定址的 PPT 檔案儲存區，用戶端可只上傳伺服器沒有的檔案
+blob_store = BlobStore(
+    directory=config.BLOB_DIR,
+    max_bytes=config.BLOB_MAX_BYTES,
+    ttl=config.BLOB_TTL
+)
+
+# 前端頁面與靜態檔案：啟動時讀入記憶體並預先壓縮，依 Accept-Encoding 回應並支援 ETag / 304
+asset_store = AssetStore(
+    immutable_max_age=config.ASSET_IMMUTABLE_MAX_AGE,
+    brotli_quality=config.ASSET_BROTLI_QUALITY
+)
+_PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "..")
+asset_store.add_page(
+    "/",
+    os.path.join(_PROJECT_ROOT, "frontend", "index.html"),
+    rewrites=asset_store.add_directory(os.path.join(_PROJECT_ROOT, "static"), "/static")
+)
+
+# 同步產生報告的請求 (/process-files/ 與 /reports/{report_id}/regenerate) 的流量控制
+admission = AdmissionController(
+    max_concurrent=config.ADMISSION_MAX_CONCURRENT,
+    max_queue=config.ADMISSION_MAX_QUEUE,
+    queue_timeout=config.ADMISSION_QUEUE_TIMEOUT,
+    retry_after=config.ADMISSION_RETRY_AFTER
+)
+
+# 非同步報告工作 (上傳後以工作 ID 輪詢進度並下載結果)
+job_store = JobStore(
+    directory=config.JOBS_DIR,
+    max_concurrent=config.JOBS_MAX_CONCURRENT,
+    max_pending=config.JOBS_MAX_PENDING,
+    ttl=config.JOBS_TTL,
+    retry_after=config.EXECUTOR_RETRY_AFTER
+)
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# 請求標頭帶有此欄位 (值為 1) 時，回應會附上 Server-Timing 與 X-PMO-Counts 標頭
+TIMING_REQUEST_HEADER = "X-PMO-Timing"
+
+# --- Prometheus 指標 ---
+
+_in_flight_requests = 0
+
+metrics_registry = Registry()
+STAGE_SECONDS = metrics_registry.register(Histogram(
+    "pmo_stage_duration_seconds", "各處理階段的耗時 (工作執行池中的階段每個 PPT 或每份報告記錄一次)", ["stage"]
+))
+REQUEST_SECONDS = metrics_registry.register(Histogram(
+    "pmo_request_duration_seconds", "HTTP 請求的處理時間", ["route", "status"]
+))
+ITEMS_TOTAL = metrics_registry.register(Counter(
+    "pmo_items_total", "處理的投影片、形狀、表格、表格列與文字區塊數量", ["kind"]
+))
+metrics_registry.register(Gauge(
+    "pmo_requests_in_flight", "處理中的 HTTP 請求數", lambda: [((), _in_flight_requests)]
+))
+metrics_registry.register(Gauge(
+    "pmo_executor_pending_jobs", "工作執行池中執行中與排隊中的工作數", lambda: [((), executor.pending)]
+))
+metrics_registry.register(Gauge(
+    "pmo_admission_requests", "同步產生報告的請求數 (執行中 / 排隊等待中)",
+    lambda: [(("active",), admission.active), (("waiting",), admission.waiting)],
+    ["state"]
+))
+metrics_registry.register(Gauge(
+    "pmo_admission_rejected_total", "因流量控制或大小限制而拒絕的請求數 (依原因)",
+    lambda: [((reason,), admission.shed[reason]) for reason in SHED_REASONS],
+    ["reason"],
+    metric_type="counter"
+))
+metrics_registry.register(Gauge(
+    "pmo_report_jobs", "非同步報告工作數 (依狀態)",
+    lambda: [((status,), job_store.stats()[status]) for status in ("queued", "running", "done", "failed")],
+    ["status"]
+))
+metrics_registry.register(Gauge(
+    "pmo_cache_entries", "各快取的項目數",
+    lambda: [
+        (("deck_memory",), deck_cache.stats()["memory_entries"]),
+        (("deck_disk",), deck_cache.stats()["disk_entries"]),
+        (("templates",), len(template_registry)),
+        (("template_bases",), template_base_count()),
+        (("report_models",), len(report_models)),
+        (("reports",), report_cache.stats()["entries"]),
+        (("blobs",), len(blob_store)),
+    ],
+    ["cache"]
+))
+metrics_registry.register(Gauge(
+    "pmo_cache_bytes", "各磁碟快取的總大小 (位元組)",
+    lambda: [
+        (("deck_disk",), deck_cache.stats()["disk_bytes"]),
+        (("templates",), template_registry.total_bytes),
+        (("report_models",), report_models.total_bytes),
+        (("reports",), report_cache.stats()["disk_bytes"]),
+        (("blobs",), blob_store.total_bytes),
+    ],
+    ["cache"]
+))
+metrics_registry.register(Gauge(
+    "pmo_deck_cache_lookups_total", "PPT 擷取結果快取的查詢次數 (依結果)",
+    lambda: [
+        (("memory_hit",), deck_cache.stats()["memory_hits"]),
+        (("disk_hit",), deck_cache.stats()["disk_hits"]),
+        (("miss",), deck_cache.stats()["misses"]),
+    ],
+    ["result"],
+    metric_type="counter"
+))
+metrics_registry.register(Gauge(
+    "pmo_blob_lookups_total", "以內容雜湊詢問 PPT 檔案的次數 (依伺服器是否已有該檔案)",
+    lambda: [(("present",), blob_store.present), (("missing",), blob_store.missing)],
+    ["result"],
+    metric_type="counter"
+))
+metrics_registry.register(Gauge(
+    "pmo_report_cache_lookups_total", "整份報告快取的查詢次數 (依結果)",
+    lambda: [(("hit",), report_cache.stats()["hits"]), (("miss",), report_cache.stats()["misses"])],
+    ["result"],
+    metric_type="counter"
+))
+
+
+# 將工作執行池回傳的量測資料併入請求的紀錄，並累計到 Prometheus 指標
+def _record_stats(recorder, stats):
+    recorder.merge(stats)
+    for stage_name, seconds in stats["timings"].items():
+        STAGE_SECONDS.observe(seconds, stage_name)
+    for kind, value in stats["counts"].items():
+        ITEMS_TOTAL.inc(value, kind)
+
+
+# 記錄請求層級 (事件迴圈中) 的階段耗時
+@contextmanager
+def _timed(recorder, stage_name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        recorder.add_time(stage_name, seconds)
+        STAGE_SECONDS.observe(seconds, stage_name)
+
+# 服務預熱狀態："off"、"pending"、"running"、"done" 或 "failed"
+warmup_state = {"status": "off" if warmup_mode == "off" else "pending", "seconds": None}
+
+# 建立工作執行池並預熱 (載入 python-docx / python-pptx 並以極小的 PPT 走過一次報告產生流程)
+async def _warm_up_service():
+    warmup_state["status"] = "running"
+    try:
+        warmup_state["seconds"] = round(await executor.start(), 3)
+    except Exception:
+        warmup_state["status"] = "failed"
+        logger.exception("服務預熱失敗。")
+        return
+    warmup_state["status"] = "done"
+    logger.info("🔥 服務預熱完成 (%.2f 秒)。", warmup_state["seconds"])
+
+# 以 brotli 預先壓縮前端頁面與靜態檔案 (壓縮等級高時較耗時，於背景執行；完成前以 gzip 回應)
+async def _precompress_assets():
+    try:
+        count = await asyncio.to_thread(asset_store.precompress_brotli)
+    except Exception:
+        logger.exception("前端檔案 brotli 壓縮失敗。")
+        return
+    if count:
+        logger.info("前端檔案 brotli 壓縮完成 (%d 個檔案)。", count)
+
+@asynccontextmanager
+async def lifespan(app):
+    cleanup_task = asyncio.create_task(job_store.cleanup_loop(config.JOBS_CLEANUP_INTERVAL))
+    precompress_task = asyncio.create_task(_precompress_assets())
+    warmup_task = None
+    if warmup_mode == "startup":
+        await _warm_up_service()
+    elif warmup_mode == "background":
+        # 預熱在工作執行池中進行，事件迴圈可立即開始接受連線
+        warmup_task = asyncio.create_task(_warm_up_service())
+    yield
+    if warmup_task is not None:
+        warmup_task.cancel()
+    precompress_task.cancel()
+    cleanup_task.cancel()
+    await job_store.shutdown()
+    executor.shutdown()
 
 # 初始化 FastAPI 應用程式
 app = FastAPI(
     title="PMO 報告自動化 API",
-    description="用於從 Word 範本和 PowerPoint 檔案自動生成 PMO 報告的 API。"
+    description="用於從 Word 範本和 PowerPoint 檔案自動生成 PMO 報告的 API。",
+    lifespan=lifespan
 )
 
-# ✅ 掛載 static 靜態檔案（提供 /static/favicon.png）
-app.mount(
-    "/static",
-    StaticFiles(directory=os.path.join(os.path.dirname(__file__), "..", "static")),
-    name="static"
+# 上傳檔案的端點在解析表單之前即檢查請求總大小
+app.add_middleware(
+    RequestSizeLimitMiddleware,
+    max_bytes=config.MAX_REQUEST_BYTES,
+    path_pattern=r"^/(process-files|jobs|templates|blobs)/$|^/reports/[^/]+/regenerate$",
+    on_reject=lambda: admission.record_shed(SHED_REQUEST_TOO_LARGE)
 )
 
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+# 為每個請求指定請求 ID (沿用用戶端帶入的 X-Request-ID)，並寫入日誌與回應標頭；同時統計處理中的請求數與耗時
+@app.middleware("http")
+async def assign_request_id(request, call_next):
+    global _in_flight_requests
+    request_id = request.headers.get("X-Request-ID", "")
+    if not _REQUEST_ID_PATTERN.match(request_id):
+        request_id = new_request_id()
+    token = set_request_id(request_id)
+    _in_flight_requests += 1
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        _in_flight_requests -= 1
+        reset_request_id(token)
+        route = request.scope.get("route")
+        REQUEST_SECONDS.observe(time.perf_counter() - start, getattr(route, "path", "unmatched"), str(status))
+    response.headers["X-Request-ID"] = request_id
+    return response
+
 # HTML 表單頁面路由
-@app.get("/", response_class=HTMLResponse, summary="提供報告生成表單")
-async def read_root():
+@app.api_route("/", methods=["GET", "HEAD"], response_class=HTMLResponse, summary="提供報告生成表單")
+async def read_root(request: Request):
     """
     提供用於上傳檔案和生成報告的主 HTML 頁面。
     """
-    return FileResponse("frontend/index.html")
+    return asset_store.response(request, asset_store.get("/"))
 
 
-# 處理檔案上傳和報告生成
-@app.post("/process-files/", summary="從上傳檔案生成 PMO 報告")
-async def process_files(
-    word_template: UploadFile = File(..., description="一個 Word (.docx) 範本檔案。"),
-    ppt_files: List[UploadFile] = File(..., description="一個或多個 PowerPoint (.pptx) 檔案。")
-):
-    if not word_template.filename.lower().endswith(".docx"):
+# 靜態檔案 (如 /static/favicon.png)；含內容雜湊的網址 (如 /static/favicon.<雜湊>.png) 可長期快取
+@app.api_route("/static/{asset_path:path}", methods=["GET", "HEAD"], summary="提供靜態檔案")
+async def read_static(asset_path: str, request: Request):
+    asset = asset_store.get(f"/static/{asset_path}")
+    if asset is None:
+        raise HTTPException(status_code=404, detail="找不到檔案。")
+    return asset_store.response(request, asset)
+
+
+# 健康檢查：不需載入報告產生模組即可回應，附上預熱狀態
+@app.get("/healthz", summary="健康檢查與預熱狀態")
+async def healthz():
+    return {"status": "ok", "warmup": warmup_state}
+
+
+# 擷取所有 PPT 的內容；內容未變更的檔案直接使用快取，其餘交由工作執行池平行處理。
+# spooled_uploads 為已寫入暫存檔的上傳檔案，工作執行池只會收到檔案路徑。
+# 若有提供 on_extracted，每個 PPT 擷取完成 (或命中快取) 時即以其索引呼叫。
+async def _extract_decks(spooled_uploads, recorder, on_extracted=None):
+    cache_keys = [deck_cache.key(spooled.sha256) for spooled in spooled_uploads]
+    with _timed(recorder, "cache_lookup"):
+        decks = [await asyncio.to_thread(deck_cache.get, key) for key in cache_keys]
+
+    missing = [i for i, deck in enumerate(decks) if deck is None]
+    if len(missing) < len(decks):
+        logger.info("♻️ %d 個 PPT 文件內容未變更，使用快取的擷取結果。", len(decks) - len(missing))
+    if on_extracted is not None:
+        for i, deck in enumerate(decks):
+            if deck is not None:
+                on_extracted(i)
+
+    extracted = await executor.map(
+        run_recorded,
+        [(extract_deck, spooled_uploads[i].filename, spooled_uploads[i].path) for i in missing],
+        on_result=None if on_extracted is None else lambda j, _result: on_extracted(missing[j])
+    )
+    for i, (deck, stats) in zip(missing, extracted):
+        _record_stats(recorder, stats)
+        cached = {key: value for key, value in deck.items() if key != "filename"}
+        await asyncio.to_thread(deck_cache.put, cache_keys[i], cached)
+        decks[i] = deck
+
+    # 快取內容不含檔名，依本次上傳的檔名補上
+    return [dict(deck, filename=spooled.filename) for deck, spooled in zip(decks, spooled_uploads)]
+
+
+# 讀取上傳的範本檔案，超過大小上限時拋出 UploadTooLarge
+async def _read_template_upload(word_template):
+    template_bytes = await word_template.read(config.MAX_UPLOAD_BYTES + 1)
+    if len(template_bytes) > config.MAX_UPLOAD_BYTES:
+        raise UploadTooLarge(word_template.filename, config.MAX_UPLOAD_BYTES)
+    return template_bytes
+
+
+# 取得本次請求使用的範本：上傳的範本在工作執行池中驗證可被解析後自動登錄 (無法解析時拋出 InvalidDocument，不會登錄)，
+# 否則依範本 ID 取用已登錄的範本
+async def _resolve_template(word_template, template_id):
+    if word_template is not None:
+        template_bytes = await _read_template_upload(word_template)
+        template_id = await asyncio.to_thread(sha256_hex, template_bytes)
+        await executor.run(validate_template, template_id, template_bytes)
+        await asyncio.to_thread(template_registry.register, template_bytes)
+        return template_id, template_bytes
+
+    if template_id:
+        template_bytes = await asyncio.to_thread(template_registry.get, template_id)
+        if template_bytes is None:
+            raise HTTPException(status_code=404, detail="找不到指定的範本 ID，請重新上傳 Word 範本。")
+        return template_id, template_bytes
+
+    raise HTTPException(status_code=400, detail="請上傳 Word 範本檔案或指定範本 ID。")
+
+
+# 檢查上傳檔案的副檔名
+def _check_upload_names(word_template, ppt_files):
+    if word_template is not None and not word_template.filename.lower().endswith(".docx"):
         raise HTTPException(status_code=400, detail="Word 範本檔案必須是 .docx 格式。")
 
     for ppt_file in ppt_files:
         if not ppt_file.filename.lower().endswith(".pptx"):
             raise HTTPException(status_code=400, detail="PPT 檔案必須是 .pptx 格式。")
 
+
+# 檢查 PPT 的指定方式：上傳檔案 (ppt_files) 或以內容雜湊指定 (ppt_hashes 與 ppt_names 依序對應) 擇一
+def _check_ppt_inputs(word_template, ppt_files, ppt_hashes, ppt_names):
+    _check_upload_names(word_template, ppt_files)
+    if ppt_files and ppt_hashes:
+        raise HTTPException(status_code=400, detail="請上傳 PPT 檔案或以內容雜湊指定 PPT，不可同時使用。")
+    if len(ppt_hashes) != len(ppt_names):
+        raise HTTPException(status_code=400, detail="ppt_hashes 與 ppt_names 的數量必須相同。")
+    for blob_id, filename in zip(ppt_hashes, ppt_names):
+        if not is_valid_blob_id(blob_id):
+            raise HTTPException(status_code=400, detail=f"PPT 內容雜湊格式錯誤：{blob_id}")
+        if not filename.lower().endswith(".pptx"):
+            raise HTTPException(status_code=400, detail="PPT 檔案必須是 .pptx 格式。")
+
+    if not ppt_files and not ppt_hashes:
+        raise HTTPException(status_code=400, detail="請上傳至少一個 PPT 檔案。")
+    _check_deck_count(len(ppt_files) + len(ppt_hashes))
+
+
+# 檢查單一報告的 PPT 數量上限
+def _check_deck_count(count):
+    if config.MAX_DECKS_PER_REQUEST and count > config.MAX_DECKS_PER_REQUEST:
+        admission.record_shed(SHED_TOO_MANY_DECKS)
+        raise HTTPException(status_code=413, detail=f"單一報告最多 {config.MAX_DECKS_PER_REQUEST} 個 PPT 檔案。")
+
+
+# 上傳的 PPT 逐一寫入暫存檔，不同時保留在記憶體中；已寫入的檔案會加入 spooled_uploads 以便出錯時清除。
+# 上傳的檔案同時加入 PPT 檔案儲存區，之後的請求可改以內容雜湊指定。
+async def _spool_ppt_files(ppt_files, spooled_uploads):
+    for ppt_file in ppt_files:
+        spooled = await spool_upload(ppt_file, config.MAX_UPLOAD_BYTES, config.UPLOAD_SPOOL_DIR)
+        spooled_uploads.append(spooled)
+        await asyncio.to_thread(blob_store.add_file, spooled.sha256, spooled.path)
+
+
+# 自 PPT 檔案儲存區取出以內容雜湊指定的 PPT 作為暫存檔，加入 spooled_uploads；有檔案不在儲存區時拋出 BlobsMissing
+async def _checkout_ppt_blobs(ppt_hashes, ppt_names, spooled_uploads):
+    missing = await asyncio.to_thread(blob_store.find_missing, ppt_hashes)
+    if missing:
+        raise BlobsMissing(missing)
+    for blob_id, filename in zip(ppt_hashes, ppt_names):
+        checked_out = await asyncio.to_thread(blob_store.checkout, blob_id, config.UPLOAD_SPOOL_DIR)
+        if checked_out is None:
+            raise BlobsMissing([blob_id])
+        path, size = checked_out
+        spooled_uploads.append(SpooledUpload(filename, path, size, blob_id))
+
+
+# 取得本次請求的 PPT：寫入上傳的檔案，或自儲存區取出以內容雜湊指定的檔案
+async def _collect_ppt_inputs(ppt_files, ppt_hashes, ppt_names, spooled_uploads):
+    if ppt_hashes:
+        await _checkout_ppt_blobs(ppt_hashes, ppt_names, spooled_uploads)
+    else:
+        await _spool_ppt_files(ppt_files, spooled_uploads)
+
+
+# 處理請求時可能發生、需轉為特定 HTTP 狀態碼的例外
+_SERVICE_ERRORS = (AdmissionRejected, BlobsMissing, UploadTooLarge, ExecutorSaturated, JobQueueFull, JobTimeout, InvalidDocument)
+
+
+# 將 _SERVICE_ERRORS 中的例外轉為 HTTP 錯誤回應；所有端點共用，狀態碼與 Retry-After 標頭一致，並記錄被拒絕的請求
+def _service_error(e):
+    if isinstance(e, AdmissionRejected):
+        # 未獲准進入的請求回應 429 / 503
+        return HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    if isinstance(e, BlobsMissing):
+        # 以雜湊指定的 PPT 不在儲存區時回應 409，回應內容列出缺少的雜湊，用戶端上傳後可重新送出
+        return HTTPException(status_code=409, detail={"message": str(e), "missing": e.missing})
+    if isinstance(e, UploadTooLarge):
+        admission.record_shed(SHED_UPLOAD_TOO_LARGE)
+        return HTTPException(status_code=413, detail=str(e))
+    if isinstance(e, (ExecutorSaturated, JobQueueFull)):
+        admission.record_shed(SHED_EXECUTOR_SATURATED if isinstance(e, ExecutorSaturated) else SHED_JOBS_QUEUE_FULL)
+        return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    if isinstance(e, JobTimeout):
+        return HTTPException(status_code=504, detail=str(e))
+    # InvalidDocument：上傳的檔案無法解析
+    return HTTPException(status_code=400, detail=str(e))
+
+
+# 擷取所有 PPT 並寫入 Word 範本，報告由工作執行池直接寫入 output_path 檔案 (不經由記憶體傳回)。
+# 各階段耗時與產出數量記錄在 recorder；on_extracted(PPT 索引) 與 on_rendered(PPT 索引, "rendered") 用於回報進度。
+# 回傳報告 ID (保存的中間模型)，之後可只上傳變更的 PPT 重新產生報告。
+async def _generate_report(template_id, template_bytes, spooled_uploads, recorder, output_path, on_extracted=None, on_rendered=None):
+    # 第一階段：各 PPT 平行擷取為純資料；結果依上傳順序排列
+    logger.info("--- 正在平行處理 %d 個 PPT 文件 ---", len(spooled_uploads))
+    with _timed(recorder, "extract"):
+        decks = await _extract_decks(spooled_uploads, recorder, on_extracted)
+
+    await _render_decks(template_id, template_bytes, decks, recorder, output_path, on_rendered)
+    return await asyncio.to_thread(report_models.save, template_id, decks, [spooled.sha256 for spooled in spooled_uploads])
+
+
+# 將擷取結果依序寫入 Word 範本，報告寫入 output_path 檔案
+async def _render_decks(template_id, template_bytes, decks, recorder, output_path, on_rendered=None):
+    overall_has_work_items = any(deck["work_items"] for deck in decks)
+    overall_has_summary_items = any(deck["summary_items"] for deck in decks)
+    if not overall_has_work_items and not overall_has_summary_items:
+        raise HTTPException(status_code=400, detail="未找到工作總覽與本月概要的資料，無法產生報告")
+
+    # 第二階段：依上傳順序逐一寫入 Word 文件；行程池無法回呼主行程，改為完成後一次回報
+    progress = on_rendered if executor.mode == "thread" else None
+    with _timed(recorder, "render"):
+        _, stats = await executor.run(run_recorded, render_report, template_id, template_bytes, decks, progress, output_path)
+    _record_stats(recorder, stats)
+    if on_rendered is not None and progress is None:
+        for i in range(len(decks)):
+            on_rendered(i, "rendered")
+
+
+# 依第一個 PPT 的檔名決定報告檔名
+def _report_filename(ppt_filenames):
+    if ppt_filenames:
+        return f"{os.path.splitext(ppt_filenames[0])[0]}_PMO_報告.docx"
+    return "PMO_Consolidated_Report.docx"
+
+
+# 登錄 Word 範本，回傳可重複使用的範本 ID
+@app.post("/templates/", summary="登錄 Word 範本")
+async def register_template(
+    word_template: UploadFile = File(..., description="一個 Word (.docx) 範本檔案。")
+):
+    if not word_template.filename.lower().endswith(".docx"):
+        raise HTTPException(status_code=400, detail="Word 範本檔案必須是 .docx 格式。")
+
     try:
-        word_template_stream = io.BytesIO(await word_template.read())
-        doc = Document(word_template_stream)
-        set_doc_normal_font(doc)
-
-        overall_has_work_items = False
-        overall_has_summary_items = False
-
-        for i, ppt_file in enumerate(ppt_files):
-            print(f"\n--- 正在處理第 {i+1}/{len(ppt_files)} 個 PPT 文件：{ppt_file.filename} ---")
-            add_page_break = (i > 0)
-
-            ppt_stream = io.BytesIO(await ppt_file.read())
-            ppt = Presentation(ppt_stream)
-
-            print("💡 正在從 PPT 提取本月概要 (文字框內容)...")
-            monthly_summary_items = extract_text_list_from_ppt(
-                ppt,
-                "本月概要",
-                stop_keywords=["本期主要成果", "下期主要計畫", "專案階段", "執行狀況", "優化工作階段"]
-            )
-
-            print("💡 正在從 PPT 提取所有相關表格 (包含工作總覽, 專案階段, 程式修改)...")
-            all_relevant_tables_data = extract_relevant_tables_from_ppt(ppt)
-
-            work_summary_from_table = []
-            if all_relevant_tables_data["work_summary_table_data"]:
-                work_summary_from_table = process_work_summary_table(all_relevant_tables_data["work_summary_table_data"])
-                if work_summary_from_table:
-                    overall_has_work_items = True
-            else:
-                print("ℹ️ 未找到工作總覽表格。")
-
-            if monthly_summary_items:
-                overall_has_summary_items = True
-
-            insert_dynamic_meeting_section(doc, ppt_file.filename, work_summary_from_table, monthly_summary_items, add_page_break)
-            print("✅ 工作總覽與本月概要插入完成。")
-
-            if all_relevant_tables_data["project_stage_tables_data"]:
-                print("💡 正在插入專案階段表格...")
-                add_filtered_tables(doc, all_relevant_tables_data["project_stage_tables_data"])
-                doc.add_paragraph("")
-                print("✅ 專案階段表格已插入 Word 文件。")
-            else:
-                print("ℹ️ 未找到專案階段表格。")
-
-            if all_relevant_tables_data["program_modifications_table_data"]:
-                print("💡 正在插入程式修改表格...")
-                doc.add_heading("修改因重跑過程發現的問題所產生的程式修改", level=3)
-                for table_data in all_relevant_tables_data["program_modifications_table_data"]:
-                    add_filtered_tables(doc, [table_data])
-                    doc.add_paragraph("")
-                print("✅ 程式修改表格已插入 Word 文件。")
-            else:
-                print("ℹ️ 未找到符合條件的程式修改表格 (或該表格不在第二張投影片或缺少關鍵字)。")
-
-            print("💡 正在添加圖例和狀態說明...")
-            add_legend_and_status(doc)
-            print("✅ 圖例和狀態說明已添加。")
-
-        if not overall_has_work_items and not overall_has_summary_items:
-            raise HTTPException(status_code=400, detail="未找到工作總覽與本月概要的資料，無法產生報告")
-
-        output_stream = io.BytesIO()
-        doc.save(output_stream)
-        output_stream.seek(0)
-
-        output_filename = "PMO_Consolidated_Report.docx"
-        if ppt_files:
-            first_ppt_name_base = os.path.splitext(ppt_files[0].filename)[0]
-            output_filename = f"{first_ppt_name_base}_PMO_報告.docx"
-
-        encoded_filename = quote(output_filename)
-
-        return StreamingResponse(
-            output_stream,
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            headers={
-                "Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}",
-                "Content-Length": str(output_stream.getbuffer().nbytes)
-            }
+        template_bytes = await _read_template_upload(word_template)
+        template_id = await asyncio.to_thread(sha256_hex, template_bytes)
+        await executor.run(validate_template, template_id, template_bytes)
+    except _SERVICE_ERRORS as e:
+        raise _service_error(e)
+
+    await asyncio.to_thread(template_registry.register, template_bytes)
+    return {"template_id": template_id, "filename": word_template.filename}
+
+
+# 列出已登錄的範本 ID
+@app.get("/templates/", summary="列出已登錄的 Word 範本")
+async def list_templates():
+    return {"template_ids": await asyncio.to_thread(template_registry.list_ids)}
+
+
+# 報告下載的 Content-Disposition 標頭
+def _attachment_header(ppt_filenames):
+    return f"attachment; filename*=UTF-8''{quote(_report_filename(ppt_filenames))}"
+
+
+# 以暫存的報告檔建立下載回應；暫存檔於回應送出後刪除
+def _report_response(request, report_path, ppt_filenames, recorder, memory_sampler, extra_headers):
+    peak_memory_mb = memory_sampler.peak_delta / (1024 * 1024)
+    logger.info("📊 本次請求記憶體峰值增量：%.1f MB (RSS 峰值 %.1f MB)", peak_memory_mb, memory_sampler.peak_rss / (1024 * 1024))
+
+    headers = {
+        "Content-Disposition": _attachment_header(ppt_filenames),
+        **{name: value for name, value in extra_headers.items() if value is not None},
+        "X-Report-Cache": "miss",
+        "X-Peak-Memory-MB": f"{peak_memory_mb:.1f}"
+    }
+    if request.headers.get(TIMING_REQUEST_HEADER) == "1":
+        headers["Server-Timing"] = server_timing_header(recorder.timings)
+        headers["X-PMO-Counts"] = counts_header(recorder.counts)
+
+    return FileResponse(report_path, media_type=DOCX_MEDIA_TYPE, headers=headers,
+                        background=BackgroundTask(remove_file, report_path))
+
+
+# 以快取的報告 (暫存副本) 建立下載回應，與未命中時同樣分塊送出，暫存副本於回應送出後刪除；
+# GET 請求的 If-None-Match 符合 ETag 時回應 304
+def _cached_report_response(request, cached, ppt_filenames, extra_headers):
+    headers = {"ETag": cached.etag, "X-Report-Id": cached.report_id, **extra_headers, "X-Report-Cache": "hit"}
+    if request.method == "GET" and etag_matches(request.headers.get("If-None-Match"), cached.etag):
+        remove_file(cached.path)
+        return Response(status_code=304, headers=headers)
+    headers["Content-Disposition"] = _attachment_header(ppt_filenames)
+    return FileResponse(cached.path, media_type=DOCX_MEDIA_TYPE, headers=headers,
+                        background=BackgroundTask(remove_file, cached.path))
+
+
+# 以內容雜湊詢問伺服器缺少哪些 PPT 檔案；伺服器已有的檔案保存期限自此重新起算
+@app.post("/blobs/check", summary="查詢伺服器缺少的 PPT 檔案")
+async def check_blobs(hashes: List[str] = Body(..., embed=True, description="各 PPT 的內容雜湊 (SHA-256)。")):
+    invalid = [blob_id for blob_id in hashes if not is_valid_blob_id(blob_id)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"PPT 內容雜湊格式錯誤：{', '.join(invalid)}")
+    if config.MAX_DECKS_PER_REQUEST and len(hashes) > config.MAX_DECKS_PER_REQUEST:
+        raise HTTPException(status_code=413, detail=f"單次最多查詢 {config.MAX_DECKS_PER_REQUEST} 個 PPT 檔案。")
+    return {"missing": await asyncio.to_thread(blob_store.find_missing, hashes)}
+
+
+# 上傳伺服器缺少的 PPT 檔案，回傳各檔案的內容雜湊；之後的報告請求以雜湊指定這些檔案
+@app.post("/blobs/", summary="上傳 PPT 檔案至儲存區")
+async def upload_blobs(
+    ppt_files: List[UploadFile] = File(..., description="一個或多個 PowerPoint (.pptx) 檔案。")
+):
+    _check_upload_names(None, ppt_files)
+    _check_deck_count(len(ppt_files))
+
+    spooled_uploads = []
+    try:
+        await _spool_ppt_files(ppt_files, spooled_uploads)
+    except _SERVICE_ERRORS as e:
+        raise _service_error(e)
+    finally:
+        remove_spooled(spooled_uploads)
+    return {"blobs": [{"filename": spooled.filename, "sha256": spooled.sha256, "size": spooled.size}
+                      for spooled in spooled_uploads]}
+
+
+# 處理檔案上傳和報告生成
+@app.post("/process-files/", summary="從上傳檔案生成 PMO 報告")
+async def process_files(
+    request: Request,
+    word_template: Optional[UploadFile] = File(None, description="一個 Word (.docx) 範本檔案；已登錄範本時可改用 template_id。"),
+    template_id: Optional[str] = Form(None, description="由 /templates/ 取得的範本 ID。"),
+    ppt_files: List[UploadFile] = File(None, description="一個或多個 PowerPoint (.pptx) 檔案。"),
+    ppt_hashes: List[str] = Form(None, description="改以內容雜湊 (SHA-256) 指定已上傳至 /blobs/ 的 PPT，依報告中的順序排列。"),
+    ppt_names: List[str] = Form(None, description="以內容雜湊指定的各 PPT 的檔名，與 ppt_hashes 依序對應。")
+):
+    ppt_files, ppt_hashes, ppt_names = ppt_files or [], ppt_hashes or [], ppt_names or []
+    _check_ppt_inputs(word_template, ppt_files, ppt_hashes, ppt_names)
+
+    spooled_uploads = []
+    report_path = None
+    recorder = StageRecorder()
+    try:
+        async with admission.slot():
+            with PeakMemorySampler() as memory_sampler, _timed(recorder, "total"):
+                with _timed(recorder, "upload"):
+                    template_id, template_bytes = await _resolve_template(word_template, template_id)
+                    await _collect_ppt_inputs(ppt_files, ppt_hashes, ppt_names, spooled_uploads)
+                filenames = [spooled.filename for spooled in spooled_uploads]
+
+                # 範本與所有 PPT 都相同的報告直接回傳快取
+                cache_key = report_cache.key(template_id, [(spooled.sha256, spooled.filename) for spooled in spooled_uploads])
+                cached = await asyncio.to_thread(report_cache.get, cache_key, config.UPLOAD_SPOOL_DIR)
+                if cached is not None:
+                    logger.info("♻️ 範本與所有 PPT 皆與先前的報告相同，回傳快取的報告。")
+                    return _cached_report_response(request, cached, filenames, {"X-Template-Id": template_id})
+
+                # 報告寫入暫存檔後分塊送出，不在記憶體中保留整份 .docx
+                report_path = new_output_path(config.UPLOAD_SPOOL_DIR)
+                report_id = await _generate_report(template_id, template_bytes, spooled_uploads, recorder, report_path)
+                etag = await asyncio.to_thread(report_cache.put, cache_key, report_id, report_path)
+
+        response = _report_response(
+            request, report_path, filenames, recorder, memory_sampler,
+            {"X-Template-Id": template_id, "X-Report-Id": report_id, "ETag": etag}
         )
+        report_path = None
+        return response
 
     except HTTPException:
         raise
+    except _SERVICE_ERRORS as e:
+        raise _service_error(e)
     except Exception as e:
-        print(f"處理檔案時發生錯誤：{e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("處理檔案時發生錯誤：%s", e)
         raise HTTPException(status_code=500, detail=f"處理檔案時發生內部錯誤: {e}")
+    finally:
+        remove_spooled(spooled_uploads)
+        if report_path is not None:
+            remove_file(report_path)
+
+
+# 取得報告的中間模型；不存在或已淘汰時回應 404
+async def _get_report_model_or_404(report_id):
+    model = await asyncio.to_thread(report_models.get, report_id)
+    if model is None:
+        raise HTTPException(status_code=404, detail="找不到指定的報告，可能已過期，請重新上傳所有檔案產生報告。")
+    return model
+
+
+# 查詢報告的中間模型：範本 ID 與依序排列的 PPT (檔名與內容雜湊)
+@app.get("/reports/{report_id}", summary="查詢報告包含的 PPT")
+async def get_report(report_id: str):
+    model = await _get_report_model_or_404(report_id)
+    return {
+        "report_id": report_id,
+        "template_id": model["template_id"],
+        "decks": [{"filename": entry["filename"], "sha256": entry["sha256"]} for entry in model["decks"]]
+    }
+
+
+# 下載報告：自報告快取回傳，快取已淘汰時依中間模型重新寫入報告 (不重新擷取 PPT)；
+# If-None-Match 與報告的 ETag 相符時回應 304
+@app.get("/reports/{report_id}/download", summary="下載報告")
+async def download_report(request: Request, report_id: str):
+    model = await _get_report_model_or_404(report_id)
+    filenames = [entry["filename"] for entry in model["decks"]]
+    cache_key = report_cache.key(model["template_id"], [(entry["sha256"], entry["filename"]) for entry in model["decks"]])
+    cached = await asyncio.to_thread(report_cache.get, cache_key, config.UPLOAD_SPOOL_DIR)
+    if cached is not None:
+        return _cached_report_response(request, cached, filenames, {"X-Template-Id": model["template_id"]})
+
+    report_path = None
+    recorder = StageRecorder()
+    try:
+        async with admission.slot():
+            with PeakMemorySampler() as memory_sampler, _timed(recorder, "total"):
+                template_id, template_bytes = await _resolve_template(None, model["template_id"])
+                report_path = new_output_path(config.UPLOAD_SPOOL_DIR)
+                await _render_decks(template_id, template_bytes, [entry_deck(entry) for entry in model["decks"]],
+                                    recorder, report_path)
+                etag = await asyncio.to_thread(report_cache.put, cache_key, report_id, report_path)
+
+        if etag is not None and etag_matches(request.headers.get("If-None-Match"), etag):
+            return Response(status_code=304, headers={"ETag": etag, "X-Report-Id": report_id, "X-Report-Cache": "miss"})
+        response = _report_response(request, report_path, filenames, recorder, memory_sampler,
+                                    {"X-Template-Id": template_id, "X-Report-Id": report_id, "ETag": etag})
+        report_path = None
+        return response
+
+    except HTTPException:
+        raise
+    except _SERVICE_ERRORS as e:
+        raise _service_error(e)
+    except Exception as e:
+        logger.exception("下載報告時發生錯誤：%s", e)
+        raise HTTPException(status_code=500, detail=f"下載報告時發生內部錯誤: {e}")
+    finally:
+        if report_path is not None:
+            remove_file(report_path)
+
+
+# 依上傳的 PPT 更新報告中的 PPT 列表：與既有 PPT 同檔名者就地取代，其餘附加在最後；remove 中的檔名自列表移除。
+# 回傳的列表中，沿用的 PPT 為模型中的項目 (dict)，上傳的 PPT 為 SpooledUpload。
+def _merge_report_decks(entries, spooled_uploads, remove):
+    slots = [entry for entry in entries if entry["filename"] not in remove]
+    for spooled in spooled_uploads:
+        for i, slot in enumerate(slots):
+            if isinstance(slot, dict) and slot["filename"] == spooled.filename:
+                slots[i] = spooled
+                break
+        else:
+            slots.append(spooled)
+    return slots
+
+
+# 重新產生報告：只需上傳變更或新增的 PPT，其餘 PPT 沿用報告模型中的擷取結果；
+# 上傳的 PPT 內容與模型中任一 PPT 相同時同樣不重新擷取。產生的報告與上傳所有檔案完整重建的結果相同。
+@app.post("/reports/{report_id}/regenerate", summary="更換部分 PPT 重新產生報告")
+async def regenerate_report(
+    request: Request,
+    report_id: str,
+    ppt_files: List[UploadFile] = File(None, description="變更或新增的 PowerPoint (.pptx) 檔案；與報告中既有 PPT 同檔名者取代之。"),
+    remove: List[str] = Form(None, description="要從報告中移除的 PPT 檔名。"),
+    word_template: Optional[UploadFile] = File(None, description="改用的 Word (.docx) 範本檔案；未提供時沿用原報告的範本。"),
+    template_id: Optional[str] = Form(None, description="改用的範本 ID。")
+):
+    ppt_files = ppt_files or []
+    remove = remove or []
+    _check_upload_names(word_template, ppt_files)
+
+    model = await _get_report_model_or_404(report_id)
+    unknown = [filename for filename in remove if filename not in {entry["filename"] for entry in model["decks"]}]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"報告中沒有要移除的 PPT：{', '.join(unknown)}")
+
+    spooled_uploads = []
+    report_path = None
+    recorder = StageRecorder()
+    try:
+        async with admission.slot():
+            with PeakMemorySampler() as memory_sampler, _timed(recorder, "total"):
+                with _timed(recorder, "upload"):
+                    if word_template is None and not template_id:
+                        template_id = model["template_id"]
+                    template_id, template_bytes = await _resolve_template(word_template, template_id)
+                    await _spool_ppt_files(ppt_files, spooled_uploads)
+
+                slots = _merge_report_decks(model["decks"], spooled_uploads, remove)
+                if not slots:
+                    raise HTTPException(status_code=400, detail="報告中沒有任何 PPT 文件。")
+                _check_deck_count(len(slots))
+
+                cache_key = report_cache.key(template_id, [
+                    (slot.sha256, slot.filename) if isinstance(slot, SpooledUpload) else (slot["sha256"], slot["filename"])
+                    for slot in slots
+                ])
+                cached = await asyncio.to_thread(report_cache.get, cache_key, config.UPLOAD_SPOOL_DIR)
+                if cached is not None:
+                    logger.info("♻️ 更新後的 PPT 列表與先前的報告相同，回傳快取的報告。")
+                    return _cached_report_response(
+                        request, cached, [slot.filename if isinstance(slot, SpooledUpload) else slot["filename"] for slot in slots],
+                        {"X-Template-Id": template_id, "X-Reused-Decks": str(len(slots)), "X-Extracted-Decks": "0"}
+                    )
+
+                # 只擷取內容雜湊不在模型中的 PPT
+                stored_by_hash = {entry["sha256"]: entry for entry in model["decks"]}
+                changed = [slot for slot in slots if isinstance(slot, SpooledUpload) and slot.sha256 not in stored_by_hash]
+                logger.info("--- 重新產生報告：%d 個 PPT 沿用既有擷取結果，%d 個 PPT 重新擷取 ---", len(slots) - len(changed), len(changed))
+                with _timed(recorder, "extract"):
+                    extracted = iter(await _extract_decks(changed, recorder))
+
+                decks = []
+                content_hashes = []
+                for slot in slots:
+                    if not isinstance(slot, SpooledUpload):
+                        decks.append(entry_deck(slot))
+                        content_hashes.append(slot["sha256"])
+                    elif slot.sha256 in stored_by_hash:
+                        decks.append(dict(entry_deck(stored_by_hash[slot.sha256]), filename=slot.filename))
+                        content_hashes.append(slot.sha256)
+                    else:
+                        decks.append(next(extracted))
+                        content_hashes.append(slot.sha256)
+
+                report_path = new_output_path(config.UPLOAD_SPOOL_DIR)
+                await _render_decks(template_id, template_bytes, decks, recorder, report_path)
+                new_report_id = await asyncio.to_thread(report_models.save, template_id, decks, content_hashes)
+                etag = await asyncio.to_thread(report_cache.put, cache_key, new_report_id, report_path)
+
+        response = _report_response(
+            request, report_path, [deck["filename"] for deck in decks], recorder, memory_sampler,
+            {
+                "X-Template-Id": template_id,
+                "X-Report-Id": new_report_id,
+                "ETag": etag,
+                "X-Reused-Decks": str(len(slots) - len(changed)),
+                "X-Extracted-Decks": str(len(changed))
+            }
+        )
+        report_path = None
+        return response
+
+    except HTTPException:
+        raise
+    except _SERVICE_ERRORS as e:
+        raise _service_error(e)
+    except Exception as e:
+        logger.exception("重新產生報告時發生錯誤：%s", e)
+        raise HTTPException(status_code=500, detail=f"重新產生報告時發生內部錯誤: {e}")
+    finally:
+        remove_spooled(spooled_uploads)
+        if report_path is not None:
+            remove_file(report_path)
+
+
+# 建立非同步報告工作：上傳完成後立即回傳工作 ID，報告在背景產生
+@app.post("/jobs/", status_code=202, summary="建立非同步報告工作")
+async def create_job(
+    word_template: Optional[UploadFile] = File(None, description="一個 Word (.docx) 範本檔案；已登錄範本時可改用 template_id。"),
+    template_id: Optional[str] = Form(None, description="由 /templates/ 取得的範本 ID。"),
+    ppt_files: List[UploadFile] = File(None, description="一個或多個 PowerPoint (.pptx) 檔案。"),
+    ppt_hashes: List[str] = Form(None, description="改以內容雜湊 (SHA-256) 指定已上傳至 /blobs/ 的 PPT，依報告中的順序排列。"),
+    ppt_names: List[str] = Form(None, description="以內容雜湊指定的各 PPT 的檔名，與 ppt_hashes 依序對應。")
+):
+    ppt_files, ppt_hashes, ppt_names = ppt_files or [], ppt_hashes or [], ppt_names or []
+    _check_ppt_inputs(word_template, ppt_files, ppt_hashes, ppt_names)
+
+    spooled_uploads = []
+    submitted = False
+    try:
+        template_id, template_bytes = await _resolve_template(word_template, template_id)
+        await _collect_ppt_inputs(ppt_files, ppt_hashes, ppt_names, spooled_uploads)
+        filenames = [spooled.filename for spooled in spooled_uploads]
+
+        # 範本與所有 PPT 都相同的報告直接以快取的報告完成工作
+        cache_key = report_cache.key(template_id, [(spooled.sha256, spooled.filename) for spooled in spooled_uploads])
+        cached = await asyncio.to_thread(report_cache.get, cache_key, job_store.directory)
+        if cached is not None:
+            logger.info("♻️ 範本與所有 PPT 皆與先前的報告相同，以快取的報告完成工作。")
+            job = job_store.add_finished(filenames, cached.path)
+            job.report_id = cached.report_id
+            job.etag = cached.etag
+        else:
+            async def run(job, output_path):
+                recorder = StageRecorder()
+                with _timed(recorder, "total"):
+                    job.report_id = await _generate_report(
+                        template_id, template_bytes, spooled_uploads, recorder, output_path,
+                        on_extracted=lambda i: job.mark(i, "parsed"),
+                        on_rendered=job.mark
+                    )
+                    job.etag = await asyncio.to_thread(report_cache.put, cache_key, job.report_id, output_path)
+                job.stats = recorder.to_dict()
+
+            # 暫存的上傳檔案改由工作結束時清除
+            job = job_store.submit(filenames, run, on_finish=lambda: remove_spooled(spooled_uploads))
+            submitted = True
+        job.template_id = template_id
+        job.output_filename = _report_filename(filenames)
+        return job.to_dict()
+
+    except _SERVICE_ERRORS as e:
+        raise _service_error(e)
+    finally:
+        if not submitted:
+            remove_spooled(spooled_uploads)
+
+
+# 取得工作的狀態與各 PPT 的進度
+def _get_job_or_404(job_id):
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="找不到指定的報告工作，可能已過期。")
+    return job
+
+
+# 查詢報告工作的狀態與各 PPT 的進度 (parsed / rendered / saved)
+@app.get("/jobs/{job_id}", summary="查詢報告工作進度")
+async def get_job(job_id: str):
+    return _get_job_or_404(job_id).to_dict()
+
+
+# 下載已完成的報告；If-None-Match 與報告的 ETag 相符時回應 304
+@app.get("/jobs/{job_id}/download", summary="下載報告工作產生的報告")
+async def download_job(request: Request, job_id: str):
+    job = _get_job_or_404(job_id)
+    if job.status != JOB_DONE:
+        detail = job.error or "報告尚未產生完成。"
+        raise HTTPException(status_code=409, detail=detail)
+    headers = {"X-Template-Id": job.template_id}
+    if job.etag is not None:
+        headers["ETag"] = job.etag
+        if etag_matches(request.headers.get("If-None-Match"), job.etag):
+            return Response(status_code=304, headers=headers)
+    return FileResponse(
+        job.result_path,
+        media_type=DOCX_MEDIA_TYPE,
+        filename=job.output_filename,
+        headers=headers
+    )
+
+
+# 管理端點的權限檢查
+def _check_admin_token(token):
+    if config.ADMIN_TOKEN and token != config.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="管理權杖錯誤。")
+
+
+# 查詢 PPT 擷取結果快取的狀態
+@app.get("/admin/cache", summary="查詢 PPT 擷取結果快取狀態")
+async def get_cache_stats(x_admin_token: Optional[str] = Header(None)):
+    _check_admin_token(x_admin_token)
+    return deck_cache.stats()
+
+
+# 清除 PPT 擷取結果快取
+@app.delete("/admin/cache", summary="清除 PPT 擷取結果快取")
+async def clear_cache(x_admin_token: Optional[str] = Header(None)):
+    _check_admin_token(x_admin_token)
+    await asyncio.to_thread(deck_cache.clear)
+    return {"cleared": True, **deck_cache.stats()}
+
+
+# 查詢整份報告快取的狀態
+@app.get("/admin/report-cache", summary="查詢報告快取狀態")
+async def get_report_cache_stats(x_admin_token: Optional[str] = Header(None)):
+    _check_admin_token(x_admin_token)
+    return report_cache.stats()
+
+
+# 清除整份報告快取
+@app.delete("/admin/report-cache", summary="清除報告快取")
+async def clear_report_cache(x_admin_token: Optional[str] = Header(None)):
+    _check_admin_token(x_admin_token)
+    await asyncio.to_thread(report_cache.clear)
+    return {"cleared": True, **report_cache.stats()}
+
+
+# 查詢非同步報告工作的狀態統計
+@app.get("/admin/jobs", summary="查詢非同步報告工作狀態")
+async def get_job_stats(x_admin_token: Optional[str] = Header(None)):
+    _check_admin_token(x_admin_token)
+    return job_store.stats()
+
+
+# 查詢流量控制的狀態：執行中與排隊中的請求數，以及依原因統計的拒絕次數
+@app.get("/admin/admission", summary="查詢流量控制狀態")
+async def get_admission_stats(x_admin_token: Optional[str] = Header(None)):
+    _check_admin_token(x_admin_token)
+    return admission.stats()
+
+
+# Prometheus 格式的服務指標
+@app.get("/metrics", summary="Prometheus 格式的服務指標", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,65 @@
+# PMO_Report_Automation/backend/memory.py
+
+# 量測行程的常駐記憶體 (RSS)。lxml 的配置不經過 Python 的配置器，tracemalloc 看不到，
+# 因此改以背景執行緒定期取樣 RSS 來估計單一請求期間的記憶體峰值。
+
+import os
+import threading
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+# 目前行程的 RSS (位元組)；無法取得時回傳 0
+def current_rss():
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is not None:
+        # 非 Linux 平台只能取得行程啟動以來的最大值 (macOS 單位為位元組，其餘為 KB)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+    return 0
+
+
+# 在 with 區塊執行期間定期取樣 RSS，記錄起始值與峰值。
+# 注意：取樣的是整個服務行程，同時處理的其他請求與行程池中的子行程不會被區分。
+class PeakMemorySampler:
+    def __init__(self, interval=0.02):
+        self.interval = interval
+        self.start_rss = 0
+        self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        rss = current_rss()
+        if rss > self.peak_rss:
+            self.peak_rss = rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self.start_rss = self.peak_rss = current_rss()
+        self._thread = threading.Thread(target=self._run, name="pmo-rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return False
+
+    # 請求期間相對於起始值的記憶體增量 (位元組)
+    @property
+    def peak_delta(self):
+        return max(0, self.peak_rss - self.start_rss)
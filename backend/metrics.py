@@ -0,0 +1,191 @@
+# PMO_Report_Automation/backend/metrics.py
+
+# 報告產生流程的量測：
+#   1. 各階段耗時與產出數量 (投影片、形狀、表格、表格列、文字區塊) 先記錄在 StageRecorder，
+#      工作執行池中的函式以 run_recorded 包裝後，連同結果一併回傳 (行程池也適用)。
+#   2. 全服務累計的直方圖、計數器與量表，由 /metrics 以 Prometheus 文字格式輸出。
+# 沒有啟用 StageRecorder 時，stage() 與 count() 不做任何事。
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# 階段耗時直方圖的區間上限 (秒)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_recorder = contextvars.ContextVar("pmo_stage_recorder", default=None)
+
+
+# 單次呼叫 (單一 PPT 或單一請求) 的階段耗時 (秒) 與產出數量
+class StageRecorder:
+    def __init__(self):
+        self.timings = {}
+        self.counts = {}
+
+    def add_time(self, stage_name, seconds):
+        self.timings[stage_name] = self.timings.get(stage_name, 0.0) + seconds
+
+    def add_count(self, name, value):
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    # 合併另一次呼叫的結果 (StageRecorder.to_dict 的輸出)
+    def merge(self, stats):
+        for stage_name, seconds in stats.get("timings", {}).items():
+            self.add_time(stage_name, seconds)
+        for name, value in stats.get("counts", {}).items():
+            self.add_count(name, value)
+
+    def to_dict(self):
+        return {"timings": dict(self.timings), "counts": dict(self.counts)}
+
+
+# 記錄 with 區塊的耗時到目前的 StageRecorder
+@contextmanager
+def stage(stage_name):
+    recorder = _recorder.get()
+    if recorder is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add_time(stage_name, time.perf_counter() - start)
+
+
+# 累加產出數量到目前的 StageRecorder
+def count(name, value=1):
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.add_count(name, value)
+
+
+# 以新的 StageRecorder 執行 fn(*args)，回傳 (結果, 量測資料)；可交由工作執行池執行
+def run_recorded(fn, *args):
+    recorder = StageRecorder()
+    token = _recorder.set(recorder)
+    try:
+        result = fn(*args)
+    finally:
+        _recorder.reset(token)
+    return result, recorder.to_dict()
+
+
+# --- Prometheus 指標 ---
+
+def _format_labels(label_names, label_values, extra=None):
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            bucket_counts = series[0]
+            for idx, upper in enumerate(self.buckets):
+                if value <= upper:
+                    bucket_counts[idx] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series_items = sorted((labels, [list(s[0]), s[1], s[2]]) for labels, s in self._series.items())
+        for label_values, (bucket_counts, total, observations) in series_items:
+            cumulative = 0
+            for upper, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, label_values, ("le", _format_value(float(upper))))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {observations}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value=1, *label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}")
+        return lines
+
+
+# 量表；數值於輸出時由 collect() 取得，回傳 [(標籤值 tuple, 數值)]
+class Gauge:
+    def __init__(self, name, documentation, collect, label_names=(), metric_type="gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.collect = collect
+        self.label_names = tuple(label_names)
+        self.metric_type = metric_type
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        for label_values, value in self.collect():
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    # Prometheus 文字格式 (text/plain; version=0.0.4)
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 將量測資料轉為 Server-Timing 標頭的內容 (毫秒)
+def server_timing_header(timings):
+    return ", ".join(f"{stage_name};dur={seconds * 1000:.1f}" for stage_name, seconds in timings.items())
+
+# 將產出數量轉為 "名稱=數量" 的標頭內容
+def counts_header(counts):
+    return ", ".join(f"{name}={value}" for name, value in sorted(counts.items()))
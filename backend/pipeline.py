@@ -0,0 +1,206 @@
+# PMO_Report_Automation/backend/pipeline.py
+
+# 報告產生流程中可交由工作執行池執行的同步步驟。
+# 這些函式只接收與回傳可序列化 (picklable) 的純資料 (bytes、str、list、dict，以及表格的 Table；見 tables.py)，
+# 因此同時適用於執行緒池與行程池。
+# python-docx、python-pptx 與 lxml 的載入成本高，改在函式內第一次使用時才載入，
+# 匯入本模組 (例如服務啟動時) 不需付出這些成本；服務啟動後由 warmup.py 於背景預先載入。
+
+import copy
+import io
+import logging
+import threading
+import zipfile
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from . import config
+from .metrics import stage
+
+logger = logging.getLogger(__name__)
+
+# 擷取器版本；extract_deck 的輸出格式或擷取規則變更時須遞增，使既有的快取失效
+# (2：本月概要各行於擷取時清理，寫入報告時不再清理)
+EXTRACTOR_VERSION = 2
+
+# 報告寫入器版本；render_report 產生的報告內容變更時須遞增，使快取的報告失效
+RENDERER_VERSION = 1
+
+# 「本月概要」擷取的結束關鍵字
+SUMMARY_STOP_KEYWORDS = ["本期主要成果", "下期主要計畫", "專案階段", "執行狀況", "優化工作階段"]
+
+
+# 上傳的 .pptx / .docx 無法解析 (檔案損毀或不是 Office 文件)；訊息只含用戶端的檔名，不含伺服器上的暫存路徑
+class InvalidDocument(Exception):
+    # 與 HTTPException 相同提供 detail；報告工作失敗時以此訊息回報，不記錄堆疊
+    @property
+    def detail(self):
+        return str(self)
+
+
+# 是否為檔案損毀或格式錯誤時 zipfile、python-docx、python-pptx 與 lxml 拋出的例外
+# (依模組判斷，不需為此載入 python-docx / python-pptx)
+def is_invalid_document_error(e):
+    if isinstance(e, (zipfile.BadZipFile, KeyError)):
+        return True
+    return type(e).__module__.split(".")[0] in ("docx", "pptx", "lxml")
+
+# 將解析檔案時因檔案損毀或格式錯誤而拋出的例外轉為 InvalidDocument(message)
+@contextmanager
+def _parsing(message):
+    try:
+        yield
+    except Exception as e:
+        if not is_invalid_document_error(e):
+            raise
+        logger.warning("%s (%s: %s)", message, type(e).__name__, e)
+        raise InvalidDocument(message) from None
+
+# 可選用的擷取引擎
+EXTRACT_ENGINES = ("python-pptx", "lazy")
+
+# 解析單一 PPT 並將所需內容擷取為純資料 (文字皆已清理)；ppt_source 可為檔案路徑或 .pptx 位元組。
+# Presentation 物件只存在於此函式內，回傳後即可釋放。
+def extract_deck(filename, ppt_source, engine=None):
+    from .logic import collect, collect_from_ppt, TextListCollector, RelevantTablesCollector, process_work_summary_table
+
+    engine = engine or config.EXTRACT_ENGINE
+    if engine not in EXTRACT_ENGINES:
+        logger.warning("未知的擷取引擎 '%s'，改用 python-pptx。", engine)
+        engine = "python-pptx"
+    logger.info("--- 正在擷取 PPT 文件：%s (引擎：%s) ---", filename, engine)
+
+    # 單次走訪所有投影片，同時擷取本月概要 (文字框內容) 與相關表格 (工作總覽, 專案階段, 程式修改)
+    logger.debug("💡 正在從 PPT 提取本月概要與所有相關表格...")
+    collectors = [
+        TextListCollector("本月概要", stop_keywords=SUMMARY_STOP_KEYWORDS),
+        RelevantTablesCollector()
+    ]
+    invalid_message = f"無法解析 PPT 檔案 {filename}，檔案可能已損毀或不是有效的 .pptx 檔案。"
+    if engine == "lazy":
+        from .pptx_reader import scan_pptx
+        # 輕量引擎邊讀取邊擷取，解析時間計入 ppt_extract
+        with stage("ppt_extract"), _parsing(invalid_message):
+            monthly_summary_items, all_relevant_tables_data = collect(scan_pptx(ppt_source), collectors)
+    else:
+        from pptx import Presentation
+        with stage("ppt_parse"), _parsing(invalid_message):
+            ppt = Presentation(ppt_source if isinstance(ppt_source, str) else io.BytesIO(ppt_source))
+        with stage("ppt_extract"):
+            monthly_summary_items, all_relevant_tables_data = collect_from_ppt(ppt, collectors)
+
+    work_summary_from_table = []
+    if all_relevant_tables_data["work_summary_table_data"]:
+        with stage("work_summary"):
+            work_summary_from_table = process_work_summary_table(all_relevant_tables_data["work_summary_table_data"])
+    else:
+        logger.info("ℹ️ 未找到工作總覽表格。(%s)", filename)
+
+    return {
+        "filename": filename,
+        "work_items": work_summary_from_table,
+        "summary_items": monthly_summary_items,
+        "project_stage_tables": all_relevant_tables_data["project_stage_tables_data"],
+        "program_modification_tables": all_relevant_tables_data["program_modifications_table_data"],
+    }
+
+# 每個工作行程各自保留的已解析範本 (已套用預設字型與報告樣式) 與其靜態區塊，以範本 ID 為鍵
+_template_bases = OrderedDict()
+_template_bases_lock = threading.Lock()
+
+# 解析範本、套用預設字型、註冊報告樣式並取出範本自訂的靜態區塊，結果保留為可重複使用的基底。
+# 回傳 (範本基底, FragmentLibrary)
+def prepare_template(template_id, template_bytes):
+    with _template_bases_lock:
+        prepared = _template_bases.get(template_id)
+        if prepared is not None:
+            _template_bases.move_to_end(template_id)
+            return prepared
+
+    from docx import Document
+    from .fragments import builtin_fragments, extract_template_fragments
+    from .logic import set_doc_normal_font
+    from .styles import ensure_report_styles
+
+    base = Document(io.BytesIO(template_bytes))
+    set_doc_normal_font(base)
+    style_ids = ensure_report_styles(base)
+    fragments = builtin_fragments(style_ids).with_overrides(extract_template_fragments(base))
+    prepared = (base, fragments)
+
+    with _template_bases_lock:
+        _template_bases[template_id] = prepared
+        while len(_template_bases) > config.TEMPLATE_BASE_CACHE_SIZE:
+            _template_bases.popitem(last=False)
+    return prepared
+
+# 此行程中保留的已解析範本數量
+def template_base_count():
+    return len(_template_bases)
+
+# 自此行程的範本基底快取中移除指定範本
+def discard_template_base(template_id):
+    with _template_bases_lock:
+        _template_bases.pop(template_id, None)
+
+# 驗證範本可被解析，並預先建立此行程中的範本基底；無法解析時拋出 InvalidDocument
+def validate_template(template_id, template_bytes):
+    with _parsing("無法解析 Word 範本，檔案可能已損毀或不是有效的 .docx 檔案。"):
+        prepare_template(template_id, template_bytes)
+    return template_id
+
+# 依 extract_deck 的結果將所有 PPT 內容寫入 Word 範本，回傳 .docx 位元組。
+# 若有提供 output_path，報告直接寫入該檔案並回傳路徑，不在記憶體中保留整份 .docx (亦不需經由行程池傳回)。
+# 若有提供 progress，每寫完一個 PPT 即以 (PPT 索引, "rendered") 呼叫；行程池模式下無法傳遞回呼，應傳入 None。
+def render_report(template_id, template_bytes, decks, progress=None, output_path=None):
+    from .logic import add_filtered_tables, insert_dynamic_meeting_section, add_legend_and_status
+
+    # 複製範本基底，避免每次請求重新解析範本
+    with stage("template_copy"):
+        base, fragments = prepare_template(template_id, template_bytes)
+        doc = copy.deepcopy(base)
+
+    for i, deck in enumerate(decks):
+        logger.info("--- 正在寫入第 %d/%d 個 PPT 文件：%s ---", i + 1, len(decks), deck["filename"])
+        add_page_break = (i > 0)
+
+        with stage("render_sections"):
+            insert_dynamic_meeting_section(doc, deck["filename"], deck["work_items"], deck["summary_items"], add_page_break,
+                                           text_cleaned=True, fragments=fragments)
+        logger.debug("✅ 工作總覽與本月概要插入完成。")
+
+        if deck["project_stage_tables"]:
+            logger.debug("💡 正在插入專案階段表格...")
+            with stage("render_tables"):
+                add_filtered_tables(doc, deck["project_stage_tables"], text_cleaned=True)
+                doc.add_paragraph("")
+            logger.debug("✅ 專案階段表格已插入 Word 文件。")
+        else:
+            logger.debug("ℹ️ 未找到專案階段表格。")
+
+        if deck["program_modification_tables"]:
+            logger.debug("💡 正在插入程式修改表格...")
+            with stage("render_tables"):
+                doc.add_heading("修改因重跑過程發現的問題所產生的程式修改", level=3)
+                for table_data in deck["program_modification_tables"]:
+                    add_filtered_tables(doc, [table_data], text_cleaned=True)
+                    doc.add_paragraph("")
+            logger.debug("✅ 程式修改表格已插入 Word 文件。")
+        else:
+            logger.debug("ℹ️ 未找到符合條件的程式修改表格 (或該表格不在第二張投影片或缺少關鍵字)。")
+
+        logger.debug("💡 正在添加圖例和狀態說明...")
+        with stage("render_legend"):
+            add_legend_and_status(doc, fragments)
+        logger.debug("✅ 圖例和狀態說明已添加。")
+
+        if progress is not None:
+            progress(i, "rendered")
+
+    with stage("docx_save"):
+        if output_path is not None:
+            doc.save(output_path)
+            return output_path
+        output_stream = io.BytesIO()
+        doc.save(output_stream)
+        return output_stream.getvalue()
@@ -0,0 +1,87 @@
+# PMO_Report_Automation/backend/pptx_reader.py
+
+# 僅供擷取使用的輕量 PPTX 讀取器：直接開啟 .pptx 壓縮檔，只讀取決定投影片順序所需的
+# presentation.xml 與關聯檔，以及各張 ppt/slides/slideN.xml；圖片、影音、圖表與備忘稿都不會載入。
+# 投影片以 iterparse 逐一處理形狀，產出與 scanner.scan_presentation 相同的 ScannedSlide。
+
+import io
+import posixpath
+import zipfile
+
+from lxml import etree
+
+from .scanner import SHAPE_TAGS, build_scanned_slide
+
+_R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+
+_RT_OFFICE_DOCUMENT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+_TAG_RELATIONSHIP = f"{{{_PKG_REL_NS}}}Relationship"
+_TAG_SLD_ID = f"{{{_P_NS}}}sldId"
+_TAG_SP_TREE = f"{{{_P_NS}}}spTree"
+_ATTR_R_ID = f"{{{_R_NS}}}id"
+
+# 不解析 DTD 與外部實體
+_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+
+
+# 讀取 .rels 檔，回傳 {rId: (Type, 絕對路徑)}
+def _read_rels(zf, source_part):
+    directory, name = posixpath.split(source_part)
+    rels_path = posixpath.join(directory, "_rels", name + ".rels")
+    try:
+        root = etree.fromstring(zf.read(rels_path), _PARSER)
+    except KeyError:
+        return {}
+    rels = {}
+    for rel in root.iter(_TAG_RELATIONSHIP):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target", "")
+        if target.startswith("/"):
+            path = target.lstrip("/")
+        else:
+            path = posixpath.normpath(posixpath.join(directory, target))
+        rels[rel.get("Id")] = (rel.get("Type"), path)
+    return rels
+
+
+# 依 presentation.xml 的 sldIdLst 順序回傳投影片檔案路徑
+def slide_part_names(zf):
+    main_part = next(
+        (path for rel_type, path in _read_rels(zf, "").values() if rel_type == _RT_OFFICE_DOCUMENT),
+        "ppt/presentation.xml"
+    )
+    presentation_rels = _read_rels(zf, main_part)
+    presentation = etree.fromstring(zf.read(main_part), _PARSER)
+    part_names = []
+    for sld_id in presentation.iter(_TAG_SLD_ID):
+        rel = presentation_rels.get(sld_id.get(_ATTR_R_ID))
+        if rel is not None:
+            part_names.append(rel[1])
+    return part_names
+
+
+# 以 iterparse 逐一取出 p:spTree 底下的形狀元素；處理完的元素隨即釋放
+def _iter_top_level_shapes(slide_stream):
+    events = etree.iterparse(slide_stream, events=("end",), tag=SHAPE_TAGS, resolve_entities=False, no_network=True)
+    for _, element in events:
+        parent = element.getparent()
+        # 群組內的形狀也會觸發事件，只處理 p:spTree 的直接子元素
+        if parent is None or parent.tag != _TAG_SP_TREE:
+            continue
+        yield element
+        element.clear()
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+# 依序掃描 .pptx 中的每一張投影片；ppt_source 可為檔案路徑或 .pptx 位元組
+def scan_pptx(ppt_source):
+    if isinstance(ppt_source, (bytes, bytearray)):
+        ppt_source = io.BytesIO(ppt_source)
+    with zipfile.ZipFile(ppt_source) as zf:
+        for slide_idx, part_name in enumerate(slide_part_names(zf)):
+            with zf.open(part_name) as slide_stream:
+                yield build_scanned_slide(slide_idx, _iter_top_level_shapes(slide_stream))
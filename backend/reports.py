@@ -0,0 +1,63 @@
+# PMO_Report_Automation/backend/reports.py
+
+# 報告的中間模型：範本 ID 加上依序排列的各 PPT 擷取結果 (extract_deck 的輸出) 與 PPT 內容雜湊。
+# 模型以精簡的 JSON 保存，模型內容的 SHA-256 即為報告 ID。重新產生報告時只需上傳變更的 PPT，
+# 內容雜湊未變的 PPT 直接沿用模型中的擷取結果，以同樣的寫入步驟產生與完整重建相同的報告。
+
+import json
+import re
+
+from .cache import DiskLRU, sha256_hex
+from .tables import json_default
+
+_REPORT_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+# 單一 PPT 在模型中的內容：檔名、內容雜湊與擷取結果
+def deck_entry(deck, content_hash):
+    return {"sha256": content_hash, **deck}
+
+# 由模型中的 PPT 內容還原 extract_deck 的輸出
+def entry_deck(entry):
+    return {key: value for key, value in entry.items() if key != "sha256"}
+
+
+class ReportModelStore:
+    def __init__(self, directory, max_bytes, extractor_version):
+        self.extractor_version = extractor_version
+        self._disk = DiskLRU(directory, max_bytes, suffix=".json")
+
+    # 保存報告模型，回傳報告 ID；decks 與 content_hashes 依報告中的順序排列
+    def save(self, template_id, decks, content_hashes):
+        model = {
+            "extractor_version": self.extractor_version,
+            "template_id": template_id,
+            "decks": [deck_entry(deck, content_hash) for deck, content_hash in zip(decks, content_hashes)],
+        }
+        data = json.dumps(model, ensure_ascii=False, separators=(",", ":"), default=json_default).encode("utf-8")
+        report_id = sha256_hex(data)
+        if report_id not in self._disk:
+            self._disk.put(report_id, data)
+        return report_id
+
+    # 取得報告模型；不存在、格式錯誤或擷取器版本不同時回傳 None
+    def get(self, report_id):
+        if not report_id or not _REPORT_ID_PATTERN.match(report_id):
+            return None
+        data = self._disk.get(report_id)
+        if data is None:
+            return None
+        try:
+            model = json.loads(data)
+        except ValueError:
+            return None
+        if model.get("extractor_version") != self.extractor_version:
+            return None
+        return model
+
+    def __len__(self):
+        return len(self._disk)
+
+    @property
+    def total_bytes(self):
+        return self._disk.total_bytes
@@ -0,0 +1,116 @@
+# PMO_Report_Automation/backend/scanner.py
+
+# 單次走訪投影片的掃描器：每個形狀只讀取一次，直接從 XML 取出文字框內容與表格格線，
+# 再交給各個擷取器 (本月概要、工作總覽、專案階段、程式修改) 使用。
+
+from collections import namedtuple
+
+from . import metrics
+
+_A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+_P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+
+def _a(tag):
+    return f"{{{_A_NS}}}{tag}"
+
+def _p(tag):
+    return f"{{{_P_NS}}}{tag}"
+
+_TAG_SP = _p("sp")
+_TAG_GRAPHIC_FRAME = _p("graphicFrame")
+_TAG_TX_BODY = _p("txBody")
+_TAG_A_TX_BODY = _a("txBody")
+_TAG_A_P = _a("p")
+_TAG_A_R = _a("r")
+_TAG_A_BR = _a("br")
+_TAG_A_FLD = _a("fld")
+_TAG_A_T = _a("t")
+_TAG_TBL = _a("tbl")
+_TAG_TBL_GRID = _a("tblGrid")
+_TAG_GRID_COL = _a("gridCol")
+_TAG_TR = _a("tr")
+_TAG_TC = _a("tc")
+_TAG_GRAPHIC_DATA = f"{{{_A_NS}}}graphic/{{{_A_NS}}}graphicData/{{{_A_NS}}}tbl"
+
+# 與 python-pptx 的 p:spTree 子元素判斷一致的形狀標籤
+SHAPE_TAGS = frozenset(_p(tag) for tag in ("sp", "grpSp", "graphicFrame", "cxnSp", "pic", "contentPart"))
+
+# 單張投影片的掃描結果
+#   slide_idx: 投影片索引 (從 0 開始)
+#   text_frames: 依形狀順序排列的文字框內容 (等同 shape.text_frame.text)
+#   tables: [(shape_idx, rows)]，rows 為儲存格文字 (等同 cell.text_frame.text) 的二維列表
+ScannedSlide = namedtuple("ScannedSlide", ["slide_idx", "text_frames", "tables"])
+
+# 取得段落文字；與 python-pptx 相同，以 "\v" 表示段落內的換行 (a:br)
+def _paragraph_text(p):
+    parts = []
+    for child in p:
+        tag = child.tag
+        if tag == _TAG_A_R or tag == _TAG_A_FLD:
+            t = child.find(_TAG_A_T)
+            if t is not None and t.text:
+                parts.append(t.text)
+        elif tag == _TAG_A_BR:
+            parts.append("\v")
+    return "".join(parts)
+
+# 取得 txBody 文字；段落之間以 "\n" 分隔
+def text_body_text(tx_body):
+    if tx_body is None:
+        return ""
+    return "\n".join(_paragraph_text(p) for p in tx_body.iterchildren(_TAG_A_P))
+
+# 直接從 a:tbl 的 a:tr / a:tc 讀取表格內容
+def table_rows(tbl):
+    grid = tbl.find(_TAG_TBL_GRID)
+    col_count = len(grid.findall(_TAG_GRID_COL)) if grid is not None else 0
+    rows = []
+    for tr in tbl.iterchildren(_TAG_TR):
+        row_texts = [text_body_text(tc.find(_TAG_A_TX_BODY)) for tc in tr.iterchildren(_TAG_TC)]
+        # 與逐格讀取 table.cell(r, c) 的行為一致：缺少的儲存格視為空字串，多出的儲存格忽略
+        if len(row_texts) < col_count:
+            row_texts.extend([""] * (col_count - len(row_texts)))
+        rows.append(row_texts[:col_count])
+    return rows
+
+# 判斷 p:spTree 的子元素類型：文字框回傳 ("text", 文字)，表格回傳 ("table", rows)，其餘回傳 None
+def scan_shape(element):
+    tag = element.tag
+    if tag == _TAG_SP:
+        return "text", text_body_text(element.find(_TAG_TX_BODY))
+    if tag == _TAG_GRAPHIC_FRAME:
+        tbl = element.find(_TAG_GRAPHIC_DATA)
+        if tbl is not None:
+            return "table", table_rows(tbl)
+    return None
+
+# 是否為 p:spTree 中的形狀元素
+def is_shape_element(element):
+    return element.tag in SHAPE_TAGS
+
+# 依形狀順序將 scan_shape 的結果整理為 ScannedSlide
+def build_scanned_slide(slide_idx, shape_elements):
+    text_frames = []
+    tables = []
+    shape_count = 0
+    for shape_idx, element in enumerate(shape_elements):
+        shape_count += 1
+        scanned = scan_shape(element)
+        if scanned is None:
+            continue
+        kind, payload = scanned
+        if kind == "text":
+            text_frames.append(payload)
+        else:
+            tables.append((shape_idx, payload))
+    metrics.count("shapes", shape_count)
+    return ScannedSlide(slide_idx, text_frames, tables)
+
+# 掃描一棵 p:spTree，回傳 ScannedSlide
+def scan_sp_tree(slide_idx, sp_tree):
+    return build_scanned_slide(slide_idx, (element for element in sp_tree.iterchildren() if is_shape_element(element)))
+
+# 依序掃描 python-pptx Presentation 中的每一張投影片
+def scan_presentation(ppt):
+    for slide_idx, slide in enumerate(ppt.slides):
+        yield scan_sp_tree(slide_idx, slide.element.cSld.spTree)
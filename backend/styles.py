@@ -0,0 +1,78 @@
+# PMO_Report_Automation/backend/styles.py
+
+# 報告共用的段落樣式。字型、字級與縮排只在樣式中設定一次，
+# 段落套用樣式後其中的文字區塊 (run) 直接繼承，不必逐一寫入 rFonts 與字級。
+# 範本若已定義同名樣式則沿用範本的設定。
+
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml.ns import qn
+from docx.shared import Cm, Pt
+
+REPORT_FONT_ASCII = "Times New Roman"
+REPORT_FONT_EAST_ASIA = "標楷體"
+
+# 內文 (無資料提示等)
+BODY_STYLE = "PMO Body"
+# 工作總覽與本月概要的項目
+BULLET_STYLE = "PMO Bullet"
+# 表格儲存格文字
+TABLE_TEXT_STYLE = "PMO Table Text"
+# 圖例與狀態說明
+LEGEND_STYLE = "PMO Legend"
+# 會議標題與小節標題
+HEADING_STYLES = {2: "PMO Heading 2", 3: "PMO Heading 3"}
+
+# 設定樣式的字型；東亞字型須另外寫入 w:eastAsia
+def _set_style_fonts(style):
+    r_fonts = style.element.get_or_add_rPr().get_or_add_rFonts()
+    r_fonts.set(qn('w:ascii'), REPORT_FONT_ASCII)
+    r_fonts.set(qn('w:eastAsia'), REPORT_FONT_EAST_ASIA)
+    r_fonts.set(qn('w:hAnsi'), REPORT_FONT_ASCII)
+
+def _add_paragraph_style(doc, name, base_name):
+    style = doc.styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+    style.base_style = doc.styles[base_name]
+    style.quick_style = False
+    _set_style_fonts(style)
+    return style
+
+REPORT_STYLES = (BODY_STYLE, BULLET_STYLE, TABLE_TEXT_STYLE, LEGEND_STYLE, *HEADING_STYLES.values())
+
+# 以單次 XPath 查詢文件中已存在的報告樣式，回傳 {樣式名稱: styleId}。
+# python-docx 以名稱查詢樣式時會逐一比對所有樣式，逐段落呼叫的成本很高。
+def _report_style_ids(doc):
+    condition = " or ".join(f'w:name/@w:val="{name}"' for name in REPORT_STYLES)
+    return {
+        style.name_val: style.styleId
+        for style in doc.styles.element.xpath(f'w:style[@w:type="paragraph" and ({condition})]')
+    }
+
+# 在文件中註冊報告所需的段落樣式 (已存在者略過)，回傳 {樣式名稱: styleId}
+def ensure_report_styles(doc):
+    style_ids = _report_style_ids(doc)
+    if len(style_ids) == len(REPORT_STYLES):
+        return style_ids
+
+    styles = doc.styles
+    if BODY_STYLE not in style_ids:
+        _add_paragraph_style(doc, BODY_STYLE, "Normal")
+
+    if BULLET_STYLE not in style_ids:
+        style = _add_paragraph_style(doc, BULLET_STYLE, BODY_STYLE)
+        style.paragraph_format.left_indent = Cm(0.63)
+
+    if TABLE_TEXT_STYLE not in style_ids:
+        style = _add_paragraph_style(doc, TABLE_TEXT_STYLE, BODY_STYLE)
+        style.font.size = Pt(12)
+
+    if LEGEND_STYLE not in style_ids:
+        style = _add_paragraph_style(doc, LEGEND_STYLE, BODY_STYLE)
+        style.font.size = Pt(12)
+        style.paragraph_format.space_after = Pt(0)
+
+    for level, name in HEADING_STYLES.items():
+        if name not in style_ids:
+            style = _add_paragraph_style(doc, name, f"Heading {level}")
+            style.next_paragraph_style = styles["Normal"]
+
+    return _report_style_ids(doc)
@@ -0,0 +1,108 @@
+# PMO_Report_Automation/backend/tables.py
+
+# 擷取出的表格 (工作總覽、專案階段、程式修改) 的精簡表示：
+#   - 每列為儲存格文字的 tuple，儲存格文字以 sys.intern 去重；大型 PPT 中反覆出現的狀態、日期與負責單位
+#     在整個行程中只保留一份字串
+#   - 跨頁的專案階段表格合併時只記錄來源表格與列範圍 (略過重複的表頭列)，不複製列
+# Table 可如列的列表般以索引、切片、len 與 for 迴圈讀取，寫入報告的函式可直接使用；
+# 寫入 JSON (擷取結果快取、報告中間模型) 時以 json_default 轉回列的列表，輸出與原本完全相同。
+
+import sys
+from bisect import bisect_right
+from itertools import islice
+
+
+# 將表格 (列的列表) 轉為列的 tuple，儲存格文字以 sys.intern 去重
+def intern_rows(rows):
+    intern = sys.intern
+    return tuple([tuple(map(intern, row)) for row in rows])
+
+# 取出 segments (來源列, 起始, 結束) 中位於 [start, stop) 的列範圍，不複製列
+def _slice_segments(segments, start, stop):
+    sliced = []
+    position = 0
+    for rows, first, last in segments:
+        count = last - first
+        lo = max(start - position, 0)
+        hi = min(stop - position, count)
+        if lo < hi:
+            sliced.append((rows, first + lo, first + hi))
+        position += count
+        if position >= stop:
+            break
+    return sliced
+
+
+class Table:
+    __slots__ = ("_segments", "_offsets", "_length")
+
+    # rows 為列的列表；儲存格文字會以 sys.intern 去重
+    def __init__(self, rows=()):
+        self._segments = []
+        self._offsets = []
+        self._length = 0
+        rows = intern_rows(rows)
+        if rows:
+            self._append_segment(rows, 0, len(rows))
+
+    @classmethod
+    def _from_segments(cls, segments):
+        table = cls()
+        for rows, first, last in segments:
+            table._append_segment(rows, first, last)
+        return table
+
+    def _append_segment(self, rows, first, last):
+        self._offsets.append(self._length)
+        self._segments.append((rows, first, last))
+        self._length += last - first
+
+    # 附加 other 自第 start 列起的所有列；只記錄來源與範圍，不複製列
+    def extend_from(self, other, start=0):
+        for rows, first, last in _slice_segments(other._segments, start, len(other)):
+            self._append_segment(rows, first, last)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return Table._from_segments(_slice_segments(self._segments, start, max(start, stop)))
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("table row index out of range")
+        k = bisect_right(self._offsets, index) - 1
+        rows, first, _ = self._segments[k]
+        return rows[first + index - self._offsets[k]]
+
+    def __iter__(self):
+        for rows, first, last in self._segments:
+            yield from islice(rows, first, last)
+
+    def __reversed__(self):
+        for rows, first, last in reversed(self._segments):
+            for i in range(last - 1, first - 1, -1):
+                yield rows[i]
+
+    def __eq__(self, other):
+        if isinstance(other, Table):
+            other = other.to_lists()
+        return self.to_lists() == other
+
+    def __repr__(self):
+        return f"Table({self.to_lists()!r})"
+
+    # 轉為列的列表 (每列為 list)
+    def to_lists(self):
+        return [list(row) for row in self]
+
+
+# json.dumps 的 default：Table 寫為列的列表
+def json_default(value):
+    if isinstance(value, Table):
+        return value.to_lists()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
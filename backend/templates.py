@@ -0,0 +1,44 @@
+# PMO_Report_Automation/backend/templates.py
+
+# Word 範本登錄：範本以內容雜湊 (SHA-256) 作為範本 ID 保存在伺服器端，
+# 之後的請求只需帶入範本 ID，不必每次重新上傳 .docx。
+
+import re
+
+from .cache import DiskLRU, sha256_hex
+
+_TEMPLATE_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+# 範本 ID 是否為合法格式 (64 位元十六進位 SHA-256)
+def is_valid_template_id(template_id):
+    return bool(template_id) and bool(_TEMPLATE_ID_PATTERN.match(template_id))
+
+
+class TemplateRegistry:
+    def __init__(self, directory, max_bytes):
+        self._disk = DiskLRU(directory, max_bytes, suffix=".docx")
+
+    # 登錄範本並回傳範本 ID；相同內容重複登錄會得到相同 ID
+    def register(self, template_bytes):
+        template_id = sha256_hex(template_bytes)
+        if template_id not in self._disk:
+            self._disk.put(template_id, template_bytes)
+        return template_id
+
+    # 取得範本內容；找不到時回傳 None
+    def get(self, template_id):
+        if not is_valid_template_id(template_id):
+            return None
+        return self._disk.get(template_id)
+
+    def __len__(self):
+        return len(self._disk)
+
+    # 已登錄範本的總大小 (位元組)
+    @property
+    def total_bytes(self):
+        return self._disk.total_bytes
+
+    def list_ids(self):
+        return self._disk.keys()
@@ -0,0 +1,45 @@
+# PMO_Report_Automation/backend/text.py
+
+# PPT 文字的清理：移除控制字元與零寬度字元，並將全形空格轉換為半形空格。
+# 表格以整個表格為單位清理：所有儲存格以分隔字元串接後只執行一次正規表示式替換，再切回原本的列與儲存格。
+# extract_deck 輸出的文字都已清理過，寫入報告時不再重複清理。
+# (str.translate 對中文文字須逐字查表，比預先編譯的正規表示式慢，因此不採用。)
+
+import re
+
+# 清理時移除的字元
+_REMOVED_CHARS_RE = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\u200b\ufeff\u200c\u200d\u00ad]')
+
+# 串接整個表格時使用的分隔字元 (Unicode 非字元，不會出現在正常文字中，也不會被清理移除)
+_CELL_SEP = "\ufffe"
+_ROW_SEP = "\uffff"
+
+# 第 5 欄 (工作說明) 中的編號項目，例如「1、」
+_NUMBERED_ITEM_RE = re.compile(r'(\d+、)')
+
+
+# 清理非法字元，並增加將全形空格轉換為半形空格的處理
+def clean_text(text):
+    if not isinstance(text, str):
+        text = str(text)
+    return _REMOVED_CHARS_RE.sub('', text).replace('\u3000', ' ')
+
+# 清理整個表格 (列的列表)：每個儲存格先去除前後空白再清理，回傳新的表格
+def clean_table(rows):
+    rows = [[cell.strip() for cell in row] for row in rows]
+    if not rows or not all(rows):
+        return [[clean_text(cell) for cell in row] for row in rows]
+
+    joined = _ROW_SEP.join(_CELL_SEP.join(row) for row in rows)
+    # 儲存格內容本身含有分隔字元時無法正確切回，改為逐格清理
+    if joined.count(_ROW_SEP) != len(rows) - 1 or joined.count(_CELL_SEP) != sum(len(row) - 1 for row in rows):
+        return [[clean_text(cell) for cell in row] for row in rows]
+    return [row.split(_CELL_SEP) for row in clean_text(joined).split(_ROW_SEP)]
+
+# 第一個編號項目之後的每個編號項目前加上換行，例如「1、準備 2、執行」→「1、準備 \n2、執行」
+def break_numbered_items(text):
+    first_match = _NUMBERED_ITEM_RE.search(text)
+    if not first_match:
+        return text
+    end = first_match.end()
+    return text[:end] + _NUMBERED_ITEM_RE.sub(r'\n\1', text[end:])
@@ -0,0 +1,88 @@
+# PMO_Report_Automation/backend/uploads.py
+
+# 上傳檔案分塊寫入暫存檔，不將整個檔案讀入記憶體；寫入的同時計算 SHA-256 並檢查大小上限。
+# 產生的報告同樣先寫入暫存檔，再由回應分塊送出。
+
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+from collections import namedtuple
+
+# 已寫入暫存檔的上傳檔案
+SpooledUpload = namedtuple("SpooledUpload", ["filename", "path", "size", "sha256"])
+
+
+# 上傳檔案超過大小上限
+class UploadTooLarge(Exception):
+    def __init__(self, filename, max_bytes):
+        super().__init__(f"檔案 {filename} 超過 {max_bytes / (1024 * 1024):.0f} MB 的大小上限。")
+        self.filename = filename
+        self.max_bytes = max_bytes
+
+
+def _write_chunk(f, hasher, chunk):
+    f.write(chunk)
+    hasher.update(chunk)
+
+
+# 將 UploadFile 分塊寫入暫存檔，回傳 SpooledUpload；超過 max_bytes 時刪除暫存檔並拋出 UploadTooLarge
+async def spool_upload(upload, max_bytes, directory=None, chunk_size=1024 * 1024):
+    suffix = os.path.splitext(upload.filename or "")[1]
+    fd, path = tempfile.mkstemp(prefix="pmo_upload_", suffix=suffix, dir=directory)
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(upload.filename, max_bytes)
+                await asyncio.to_thread(_write_chunk, f, hasher, chunk)
+    except BaseException:
+        remove_spooled([SpooledUpload(upload.filename, path, size, None)])
+        raise
+    finally:
+        await upload.close()
+    return SpooledUpload(upload.filename, path, size, hasher.hexdigest())
+
+
+# 刪除暫存檔
+def remove_spooled(spooled_uploads):
+    for spooled in spooled_uploads:
+        remove_file(spooled.path)
+
+
+# 建立報告輸出用的空白暫存檔，回傳路徑；由呼叫端負責以 remove_file 刪除
+def new_output_path(directory=None, suffix=".docx"):
+    fd, path = tempfile.mkstemp(prefix="pmo_report_", suffix=suffix, dir=directory)
+    os.close(fd)
+    return path
+
+
+def remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# 分塊計算檔案的 SHA-256 十六進位字串，不將整個檔案讀入記憶體
+def file_sha256(path, chunk_size=1024 * 1024):
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+# 建立硬連結；不同檔案系統或不支援硬連結時改為複製
+def link_or_copy(source, target):
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
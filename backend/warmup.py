@@ -0,0 +1,65 @@
+# PMO_Report_Automation/backend/warmup.py
+
+# 服務冷啟動後的預熱。服務行程啟動時不載入 python-docx、python-pptx 與 lxml (見 pipeline.py)，
+# 預熱在工作執行池中 (行程池模式下為每個工作行程) 執行一次：
+#   - 載入 python-docx / python-pptx 及報告寫入模組，並讀取兩者內建的預設 .docx / .pptx 範本
+#   - 以一份極小的合成 PPT 走過擷取流程 (建立關鍵字比對規則與正規表示式) 與報告寫入流程
+# 預熱使用的範本基底寫入後即自快取中移除，不佔用範本基底快取的名額。
+
+import io
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# 預熱模式："off" (不預熱)、"background" (開始接受連線後於背景預熱)、"startup" (預熱完成後才開始接受連線)
+WARMUP_MODES = ("off", "background", "startup")
+
+_WARMUP_TEMPLATE_ID = "warmup"
+
+
+# 產生預熱用的極小 PPT：本月概要、工作總覽表格與專案階段表格各一
+def _tiny_deck():
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    ppt = Presentation()
+    slide = ppt.slides.add_slide(ppt.slide_layouts[6])
+    text_frame = slide.shapes.add_textbox(Inches(0.5), Inches(0.5), Inches(9), Inches(2)).text_frame
+    text_frame.text = "本月概要"
+    text_frame.add_paragraph().text = "完成系統測試"
+    text_frame.add_paragraph().text = "本期主要成果"
+
+    tables = [
+        [["工作總覽", ""], ["時間:", "2024/05"], ["階段:", "系統測試"], ["總體狀態:", "正常"], ["問題:", "無"], ["說明:", "預熱"]],
+        [["專案階段", "項次", "類別", "工作項目", "工作說明", "負責單位", "開始日期", "狀態", "預計完成", "備註"],
+         ["階段1", "1", "開發", "工作項目", "1、需求確認 2、測試", "EY", "2024/01/01", "●正常完成", "2024/06/30", "備註"]],
+    ]
+    for rows in tables:
+        slide = ppt.slides.add_slide(ppt.slide_layouts[6])
+        table = slide.shapes.add_table(len(rows), len(rows[0]), Inches(0.2), Inches(1), Inches(9.5), Inches(3)).table
+        for r, row in enumerate(rows):
+            for c, value in enumerate(row):
+                table.cell(r, c).text = value
+
+    output = io.BytesIO()
+    ppt.save(output)
+    return output.getvalue()
+
+# 執行預熱，回傳耗時秒數；可交由工作執行池 (執行緒或行程) 執行
+def warm_up():
+    start = time.perf_counter()
+    from docx import Document
+    from . import pipeline
+
+    template = io.BytesIO()
+    Document().save(template)
+    deck = pipeline.extract_deck("warmup.pptx", _tiny_deck())
+    try:
+        pipeline.render_report(_WARMUP_TEMPLATE_ID, template.getvalue(), [deck])
+    finally:
+        pipeline.discard_template_base(_WARMUP_TEMPLATE_ID)
+
+    seconds = time.perf_counter() - start
+    logger.debug("預熱完成 (%.2f 秒)。", seconds)
+    return seconds
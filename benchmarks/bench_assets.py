@@ -0,0 +1,122 @@
+# PMO_Report_Automation/benchmarks/bench_assets.py
+
+# 比較前端頁面與靜態檔案的服務方式：
+#   before：原本的實作 (GET / 每次以 FileResponse 讀取 frontend/index.html；/static 以 StaticFiles 提供，不壓縮)
+#   after ：目前的實作 (啟動時讀入記憶體並預先壓縮，依 Accept-Encoding 回應，ETag / 304，含內容雜湊的網址可長期快取)
+# 量測首次載入 (頁面 + favicon) 與再次載入 (瀏覽器帶 If-None-Match 重新確認；immutable 的檔案不再請求) 傳輸的位元組數
+# 與每個請求的延遲，並確認兩者解壓縮後的頁面內容相同 (除了引用靜態檔案的網址改為含雜湊的網址)。
+# 用法：python -m benchmarks.bench_assets [--requests 200] [--accept-encoding "gzip, deflate, br"]
+
+import argparse
+import os
+import re
+import statistics
+import time
+
+from fastapi import FastAPI
+from fastapi.responses import FileResponse
+from fastapi.staticfiles import StaticFiles
+
+_PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+# 原本的實作
+def _legacy_app():
+    app = FastAPI()
+    app.mount("/static", StaticFiles(directory=os.path.join(_PROJECT_ROOT, "static")), name="static")
+
+    @app.get("/")
+    async def read_root():
+        return FileResponse(os.path.join(_PROJECT_ROOT, "frontend", "index.html"))
+
+    return app
+
+# 送出 GET，回傳 (回應, 線路上的位元組數, 秒數)
+def _get(client, url, headers):
+    start = time.perf_counter()
+    response = client.get(url, headers=headers)
+    elapsed = time.perf_counter() - start
+    if response.status_code not in (200, 304):
+        raise RuntimeError(f"{url} 回傳 {response.status_code}")
+    return response, response.num_bytes_downloaded, elapsed
+
+# 模擬瀏覽器載入頁面：取得頁面與其引用的 favicon；cache 為 {網址: 回應}，
+# 快取中 immutable 的檔案不再請求，其餘帶 If-None-Match 重新確認。回傳 (頁面內容, 位元組數, 請求數)
+def _load_page(client, accept_encoding, cache):
+    total_bytes = 0
+    requests = 0
+    page = None
+    urls = ["/"]
+    while urls:
+        url = urls.pop(0)
+        headers = {"Accept-Encoding": accept_encoding}
+        cached = cache.get(url)
+        if cached is not None:
+            if "immutable" in cached.headers.get("cache-control", ""):
+                continue
+            if "etag" in cached.headers:
+                headers["If-None-Match"] = cached.headers["etag"]
+        response, size, _ = _get(client, url, headers)
+        total_bytes += size
+        requests += 1
+        if response.status_code == 200:
+            cache[url] = response
+        if url == "/":
+            page = cache[url].text
+            match = re.search(r'href="(/static/favicon[^"]*)"', page)
+            urls.append(match.group(1) if match else "/static/favicon.png")
+    return page, total_bytes, requests
+
+# 回傳每個請求的延遲中位數 (毫秒)
+def _latency(client, url, headers, count):
+    samples = [_get(client, url, headers)[2] for _ in range(count)]
+    return statistics.median(samples) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="前端頁面與靜態檔案的傳輸量與延遲比較")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--accept-encoding", default="gzip, deflate, br")
+    args = parser.parse_args()
+
+    os.environ.setdefault("PMO_LOG_LEVEL", "WARNING")
+    os.environ["PMO_WARMUP_MODE"] = "off"
+
+    from fastapi.testclient import TestClient
+    from backend.main import app, asset_store
+
+    # 預先壓縮 brotli (服務啟動後於背景進行)，並量測耗時
+    start = time.perf_counter()
+    brotli_count = asset_store.precompress_brotli()
+    brotli_ms = (time.perf_counter() - start) * 1000
+
+    results = {}
+    pages = {}
+    for name, target in (("before", _legacy_app()), ("after", app)):
+        with TestClient(target) as client:
+            cache = {}
+            pages[name], first_bytes, first_requests = _load_page(client, args.accept_encoding, cache)
+            _, repeat_bytes, repeat_requests = _load_page(client, args.accept_encoding, cache)
+            headers = {"Accept-Encoding": args.accept_encoding}
+            results[name] = {
+                "first": (first_bytes, first_requests),
+                "repeat": (repeat_bytes, repeat_requests),
+                "page_ms": _latency(client, "/", headers, args.requests),
+                "revalidate_ms": _latency(client, "/", dict(headers, **{"If-None-Match": cache["/"].headers["etag"]}),
+                                          args.requests),
+            }
+
+    favicon_url = re.search(r'href="(/static/favicon[^"]*)"', pages["after"]).group(1)
+    assert pages["before"].replace('href="/static/favicon.png"', f'href="{favicon_url}"') == pages["after"], \
+        "頁面內容與原本不同"
+
+    print(f"Accept-Encoding: {args.accept_encoding}  (brotli 預先壓縮 {brotli_count} 個檔案，{brotli_ms:.0f} ms)")
+    print(f"{'':>7} {'first load (KB/req)':>20} {'repeat load (KB/req)':>21} {'GET / (ms)':>11} {'GET / 304 (ms)':>15}")
+    for name, result in results.items():
+        first_bytes, first_requests = result["first"]
+        repeat_bytes, repeat_requests = result["repeat"]
+        print(f"{name:>7} {first_bytes / 1024:>13.1f} / {first_requests:<4} {repeat_bytes / 1024:>14.1f} / {repeat_requests:<4} "
+              f"{result['page_ms']:>11.3f} {result['revalidate_ms']:>15.3f}")
+    print(f"first load: {results['before']['first'][0] / results['after']['first'][0]:.2f}x smaller; 頁面內容一致。")
+
+if __name__ == "__main__":
+    main()
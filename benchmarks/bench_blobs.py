@@ -0,0 +1,92 @@
+# PMO_Report_Automation/benchmarks/bench_blobs.py
+
+# 比較「每次上傳所有 PPT」(POST /process-files/) 與「以內容雜湊協商」(POST /blobs/check → 只上傳缺少的 PPT 至 /blobs/
+# → POST /process-files/ 以 ppt_hashes 指定) 在只變更一個 PPT 時送出的位元組數與耗時，並確認兩者產生的報告內容相同。
+# 上傳時間以 --uplink-mbps 指定的上行頻寬估算 (TestClient 不經過網路)。
+# 預設停用 PPT 擷取快取與報告快取，兩種方式都完整產生報告。
+# 用法：python -m benchmarks.bench_blobs [--decks 15] [--images-per-slide 2] [--uplink-mbps 10] [--repeat 3]
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import statistics
+import tempfile
+import time
+import zipfile
+
+def _document_xml(docx_bytes):
+    with zipfile.ZipFile(io.BytesIO(docx_bytes)) as zf:
+        return zf.read("word/document.xml")
+
+# 送出請求，回傳 (回應, 請求本文位元組數, 秒數)
+def _send(client, method, url, **kwargs):
+    request = client.build_request(method, url, **kwargs)
+    body = request.read()
+    start = time.perf_counter()
+    response = client.send(request)
+    elapsed = time.perf_counter() - start
+    if response.status_code != 200:
+        raise RuntimeError(f"{url} 回傳 {response.status_code}：{response.text[:200]}")
+    return response, len(body), elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="以內容雜湊協商上傳 PPT 的傳輸量比較")
+    parser.add_argument("--decks", type=int, default=15)
+    parser.add_argument("--images-per-slide", type=int, default=2)
+    parser.add_argument("--uplink-mbps", type=float, default=10.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ.setdefault("PMO_LOG_LEVEL", "WARNING")
+    os.environ["PMO_DECK_CACHE_ENABLED"] = "0"
+    os.environ["PMO_REPORT_CACHE_ENABLED"] = "0"
+    os.environ["PMO_BLOB_DIR"] = tempfile.mkdtemp(prefix="pmo_bench_blobs_")
+
+    from fastapi.testclient import TestClient
+    from backend.main import app
+    from benchmarks.synthetic import make_deck, make_template
+
+    template_bytes = make_template()
+    decks = [(f"deck{i}.pptx", make_deck(seed=i, images_per_slide=args.images_per_slide)) for i in range(args.decks)]
+    template_file = ("word_template", ("template.docx", template_bytes))
+
+    full_samples, negotiated_samples = [], []
+    with TestClient(app) as client:
+        # 伺服器先取得一次所有 PPT，之後每輪變更最後一個 PPT
+        _send(client, "POST", "/blobs/", files=[("ppt_files", deck) for deck in decks])
+        for round_index in range(args.repeat):
+            decks[-1] = (decks[-1][0], make_deck(seed=1000 + round_index, images_per_slide=args.images_per_slide))
+            hashes = [hashlib.sha256(data).hexdigest() for _, data in decks]
+
+            check, sent, seconds = _send(client, "POST", "/blobs/check", content=json.dumps({"hashes": hashes}),
+                                         headers={"Content-Type": "application/json"})
+            missing = set(check.json()["missing"])
+            assert len(missing) == 1, "應只缺少變更的 PPT"
+            for (filename, data), content_hash in zip(decks, hashes):
+                if content_hash in missing:
+                    _, size, elapsed = _send(client, "POST", "/blobs/", files=[("ppt_files", (filename, data))])
+                    sent, seconds = sent + size, seconds + elapsed
+            negotiated, size, elapsed = _send(client, "POST", "/process-files/", files=[template_file],
+                                              data={"ppt_hashes": hashes, "ppt_names": [filename for filename, _ in decks]})
+            sent, seconds = sent + size, seconds + elapsed
+
+            full, full_bytes, full_seconds = _send(client, "POST", "/process-files/",
+                                                   files=[template_file] + [("ppt_files", deck) for deck in decks])
+            assert _document_xml(negotiated.content) == _document_xml(full.content), "以雜湊指定 PPT 產生的報告內容不同"
+
+            full_samples.append((full_bytes, full_seconds))
+            negotiated_samples.append((sent, seconds))
+
+    bytes_per_second = args.uplink_mbps * 1e6 / 8
+    print(f"decks={args.decks} images_per_slide={args.images_per_slide} uplink={args.uplink_mbps:g} Mbps (只變更 1 個 PPT)")
+    print(f"{'':>11} {'sent (MB)':>10} {'server (ms)':>12} {'est. upload (s)':>16}")
+    for name, samples in (("full", full_samples), ("negotiated", negotiated_samples)):
+        sent = statistics.median(sample[0] for sample in samples)
+        server_ms = statistics.median(sample[1] for sample in samples) * 1000
+        print(f"{name:>11} {sent / 1e6:>10.2f} {server_ms:>12.0f} {sent / bytes_per_second:>16.2f}")
+    print("報告內容一致。")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# PMO_Report_Automation/benchmarks/bench_clean_text.py
+
+# 量測表格文字清理：逐格呼叫的原始實作 (每次經由 re 模組快取取得正規表示式，並以 try/except 包裝)
+# 與整個表格一次清理的 clean_table；以及第 5 欄編號項目換行的原始實作 (佔位字串加三次正規表示式) 與 break_numbered_items。
+# 兩者的輸出須完全相同。
+# 用法：python -m benchmarks.bench_clean_text [--rows 2000] [--cols 10] [--repeat 7]
+
+import argparse
+import random
+import re
+import statistics
+import time
+
+from backend.text import break_numbered_items, clean_table
+
+def _legacy_clean_text(text):
+    if not isinstance(text, str):
+        text = str(text)
+    try:
+        cleaned_text = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\u200b\ufeff\u200c\u200d\u00ad]', '', text)
+        return cleaned_text.replace('\u3000', ' ')
+    except Exception:
+        return ""
+
+def _legacy_break_numbered_items(text):
+    first_match = re.search(r'(\d+、)', text)
+    if not first_match:
+        return text
+    temp_placeholder = "__FIRST_MATCH_PLACEHOLDER__"
+    temp_text = text.replace(first_match.group(0), temp_placeholder, 1)
+    formatted_text = re.sub(r'(\d+、)', r'\n\1', temp_text)
+    return formatted_text.replace(temp_placeholder, first_match.group(0))
+
+def _make_grid(rows, cols, seed=0):
+    rnd = random.Random(seed)
+    samples = ["EY", "建置廠商", "2024/01/01", "●正常完成", "", "開發", "備註\n追蹤事項",
+               "需求確認\u200b", "系統\u3000測試", " 前後空白 "]
+    grid = []
+    for r in range(rows):
+        row = [rnd.choice(samples) + str(rnd.randrange(100)) for _ in range(cols)]
+        if cols > 4:
+            row[4] = f"1、需求確認 2、程式修改{rnd.randrange(10)} 3、測試驗證\u3000{r}"
+        grid.append(row)
+    return grid
+
+def _median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, result
+
+def main():
+    parser = argparse.ArgumentParser(description="表格文字清理效能量測")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    grid = _make_grid(args.rows, args.cols)
+
+    legacy_ms, legacy = _median_ms(lambda: [[_legacy_clean_text(cell.strip()) for cell in row] for row in grid], args.repeat)
+    batch_ms, batch = _median_ms(lambda: clean_table(grid), args.repeat)
+    assert batch == legacy, "clean_table 的結果與原始實作不同"
+
+    column = [row[4] for row in batch] if args.cols > 4 else []
+    legacy_fmt_ms, legacy_fmt = _median_ms(lambda: [_legacy_break_numbered_items(text) for text in column], args.repeat)
+    fmt_ms, fmt = _median_ms(lambda: [break_numbered_items(text) for text in column], args.repeat)
+    assert fmt == legacy_fmt, "break_numbered_items 的結果與原始實作不同"
+
+    cells = args.rows * args.cols
+    print(f"grid={args.rows}x{args.cols} ({cells} cells)")
+    print(f"{'':>24} {'legacy (ms)':>12} {'new (ms)':>10} {'speedup':>8}")
+    print(f"{'clean cells':>24} {legacy_ms:>12.2f} {batch_ms:>10.2f} {legacy_ms / batch_ms:>7.2f}x")
+    if column:
+        print(f"{'column 5 line breaks':>24} {legacy_fmt_ms:>12.2f} {fmt_ms:>10.2f} {legacy_fmt_ms / fmt_ms:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
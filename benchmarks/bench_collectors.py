@@ -0,0 +1,46 @@
+# PMO_Report_Automation/benchmarks/bench_collectors.py
+
+# 量測擷取器 (本月概要與表格分類) 的耗時；PPT 只掃描一次，量測範圍不含 .pptx 解析。
+# 用法：python -m benchmarks.bench_collectors [--summary-lines 3000] [--stage-tables 40] [--filler-slides 200] [--repeat 7]
+
+import argparse
+import io
+import statistics
+import time
+
+from pptx import Presentation
+
+from backend.logic import collect, TextListCollector, RelevantTablesCollector
+from backend.pipeline import SUMMARY_STOP_KEYWORDS
+from backend.scanner import scan_presentation
+from benchmarks.synthetic import make_deck
+
+def main():
+    parser = argparse.ArgumentParser(description="擷取器效能量測")
+    parser.add_argument("--summary-lines", type=int, default=3000)
+    parser.add_argument("--stage-tables", type=int, default=40)
+    parser.add_argument("--stage-rows", type=int, default=30)
+    parser.add_argument("--filler-slides", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    deck_bytes = make_deck(seed=1, stage_tables=args.stage_tables, stage_rows=args.stage_rows,
+                           filler_slides=args.filler_slides, summary_lines=args.summary_lines)
+    scanned_slides = list(scan_presentation(Presentation(io.BytesIO(deck_bytes))))
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        summary_items, tables = collect(scanned_slides, [
+            TextListCollector("本月概要", stop_keywords=SUMMARY_STOP_KEYWORDS),
+            RelevantTablesCollector()
+        ])
+        timings.append(time.perf_counter() - start)
+
+    print(f"slides={len(scanned_slides)} summary_items={len(summary_items)} "
+          f"project_stage_rows={sum(len(table) for table in tables['project_stage_tables_data'])} "
+          f"program_modification_tables={len(tables['program_modifications_table_data'])}")
+    print(f"collect: median {statistics.median(timings) * 1000:.1f} ms, min {min(timings) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
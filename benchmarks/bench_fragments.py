@@ -0,0 +1,94 @@
+# PMO_Report_Automation/benchmarks/bench_fragments.py
+
+# 量測多個 PPT 的報告中靜態區塊 (分頁、「工作總覽」/「本月概要」標題、「（尚無資料）」提示、圖例) 的寫入：
+# 原始實作每個 PPT 都經由 python-docx 逐一建立段落與文字區塊並設定顏色，
+# 新的實作複製每個行程只解析一次的區塊 XML。兩者產生的 document.xml 須完全相同。
+# 用法：python -m benchmarks.bench_fragments [--decks 300] [--items 3] [--repeat 5]
+
+import argparse
+import io
+import statistics
+import time
+
+from docx import Document
+from docx.oxml.ns import qn
+from lxml import etree
+
+from backend.fragments import LEGEND_RUNS, builtin_fragments
+from backend.logic import _add_styled_paragraph, add_legend_and_status, insert_dynamic_meeting_section
+from backend.styles import BODY_STYLE, BULLET_STYLE, HEADING_STYLES, LEGEND_STYLE, ensure_report_styles
+from benchmarks.synthetic import make_template
+
+def _legacy_section(doc, ppt_name, work_items, summary_items, add_page_break):
+    style_ids = ensure_report_styles(doc)
+    if add_page_break:
+        doc.add_page_break()
+    _add_styled_paragraph(doc, ppt_name, style_ids[HEADING_STYLES[2]])
+    for heading, items in (("工作總覽", work_items), ("本月概要", summary_items)):
+        _add_styled_paragraph(doc, heading, style_ids[HEADING_STYLES[3]])
+        if items:
+            for item in items:
+                _add_styled_paragraph(doc, f"● {item}", style_ids[BULLET_STYLE])
+        else:
+            _add_styled_paragraph(doc, "（尚無資料）", style_ids[BODY_STYLE])
+
+def _legacy_legend(doc):
+    p_legend = _add_styled_paragraph(doc, "", ensure_report_styles(doc)[LEGEND_STYLE])
+    for text, color in LEGEND_RUNS:
+        run = p_legend.add_run(text)
+        run.font.color.rgb = color
+
+def _legacy_deck(doc, ppt_name, work_items, summary_items, add_page_break):
+    _legacy_section(doc, ppt_name, work_items, summary_items, add_page_break)
+    _legacy_legend(doc)
+
+def _new_deck(doc, ppt_name, work_items, summary_items, add_page_break):
+    fragments = builtin_fragments(ensure_report_styles(doc))
+    insert_dynamic_meeting_section(doc, ppt_name, work_items, summary_items, add_page_break,
+                                   text_cleaned=True, fragments=fragments)
+    add_legend_and_status(doc, fragments)
+
+def _make_decks(count, items):
+    # 每 4 個 PPT 中有 1 個沒有本月概要，寫入無資料提示
+    return [(f"deck{i}", [f"工作項目 {i}-{j}" for j in range(items)],
+             [] if i % 4 == 3 else [f"概要 {i}-{j}" for j in range(items)]) for i in range(count)]
+
+def _render(template_bytes, decks, write_deck):
+    doc = Document(io.BytesIO(template_bytes))
+    ensure_report_styles(doc)
+    start = time.perf_counter()
+    for i, (name, work_items, summary_items) in enumerate(decks):
+        write_deck(doc, name, work_items, summary_items, i > 0)
+    return time.perf_counter() - start, doc
+
+def _body_xml(doc):
+    return b"".join(etree.tostring(child) for child in doc.element.body if child.tag != qn("w:sectPr"))
+
+def main():
+    parser = argparse.ArgumentParser(description="報告靜態區塊寫入效能量測")
+    parser.add_argument("--decks", type=int, default=300)
+    parser.add_argument("--items", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    template_bytes = make_template()
+    decks = _make_decks(args.decks, args.items)
+
+    legacy_times, new_times = [], []
+    for _ in range(args.repeat):
+        elapsed, legacy_doc = _render(template_bytes, decks, _legacy_deck)
+        legacy_times.append(elapsed)
+        elapsed, new_doc = _render(template_bytes, decks, _new_deck)
+        new_times.append(elapsed)
+    assert _body_xml(new_doc) == _body_xml(legacy_doc), "靜態區塊的輸出與原始實作不同"
+
+    legacy_ms = statistics.median(legacy_times) * 1000
+    new_ms = statistics.median(new_times) * 1000
+    print(f"decks={args.decks} items={args.items}")
+    print(f"{'':>10} {'total (ms)':>11} {'per deck (ms)':>14}")
+    print(f"{'legacy':>10} {legacy_ms:>11.2f} {legacy_ms / args.decks:>14.3f}")
+    print(f"{'fragments':>10} {new_ms:>11.2f} {new_ms / args.decks:>14.3f}  ({legacy_ms / new_ms:.2f}x)")
+    print("輸出一致。")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# PMO_Report_Automation/benchmarks/bench_logging.py
+
+# 量測日誌設定對擷取與寫入階段的額外耗時：
+#   sync-debug    DEBUG 等級直接寫入 StreamHandler (逐行同步輸出，等同原本的 print)
+#   queue-debug   DEBUG 等級經由 QueueHandler 交給背景執行緒寫出
+#   queue-info    INFO 等級 (預設)，逐張投影片的訊息不輸出
+#   queue-warning WARNING 等級
+# --write-latency-us 可模擬寫入緩慢的 stdout (例如終端機或壅塞的管線)。
+# 用法：python -m benchmarks.bench_logging [--stage-tables 60] [--repeat 7] [--output 檔案路徑] [--write-latency-us 100]
+
+import argparse
+import io
+import logging
+import os
+import statistics
+import time
+
+from docx import Document
+
+from backend.cache import sha256_hex
+from backend.log import LOG_FORMAT, ROOT_LOGGER_NAME, RequestIdFilter, setup_logging, shutdown_logging
+from backend.pipeline import extract_deck, render_report
+from benchmarks.synthetic import make_deck
+
+MODES = ("sync-debug", "queue-debug", "queue-info", "queue-warning")
+
+# 每次寫入都延遲固定時間的輸出串流
+class SlowStream:
+    def __init__(self, stream, latency):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, text):
+        time.sleep(self.latency)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+def _configure(mode, stream):
+    shutdown_logging()
+    if mode == "sync-debug":
+        logger = logging.getLogger(ROOT_LOGGER_NAME)
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handler.addFilter(RequestIdFilter())
+        logger.addHandler(handler)
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+    else:
+        setup_logging(mode.split("-")[1].upper(), stream=stream)
+
+def main():
+    parser = argparse.ArgumentParser(description="日誌設定的額外耗時量測")
+    parser.add_argument("--stage-tables", type=int, default=60)
+    parser.add_argument("--stage-rows", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--output", default=os.devnull, help="日誌寫入的檔案")
+    parser.add_argument("--write-latency-us", type=float, default=0, help="每次寫入的模擬延遲 (微秒)")
+    args = parser.parse_args()
+
+    deck_bytes = make_deck(seed=1, stage_tables=args.stage_tables, stage_rows=args.stage_rows)
+    template = io.BytesIO()
+    Document().save(template)
+    template_bytes = template.getvalue()
+    template_id = sha256_hex(template_bytes)
+
+    print(f"{'mode':>14} {'extract (ms)':>13} {'render (ms)':>12}")
+    with open(args.output, "w", encoding="utf-8") as output:
+        stream = SlowStream(output, args.write_latency_us / 1e6) if args.write_latency_us else output
+        for mode in MODES:
+            _configure(mode, stream)
+            deck = extract_deck("deck.pptx", deck_bytes, engine="lazy")
+            render_report(template_id, template_bytes, [deck])
+
+            extract_times = []
+            render_times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                deck = extract_deck("deck.pptx", deck_bytes, engine="lazy")
+                extract_times.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                render_report(template_id, template_bytes, [deck] * 3)
+                render_times.append(time.perf_counter() - start)
+            shutdown_logging()
+            print(f"{mode:>14} {statistics.median(extract_times) * 1000:>13.1f} {statistics.median(render_times) * 1000:>12.1f}")
+
+if __name__ == "__main__":
+    main()
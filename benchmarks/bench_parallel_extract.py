@@ -0,0 +1,60 @@
+# PMO_Report_Automation/benchmarks/bench_parallel_extract.py
+
+# 量測 PPT 擷取階段在不同檔案數量下，逐一處理與平行處理的耗時。
+# 用法：python -m benchmarks.bench_parallel_extract [--workers 4] [--counts 1,5,10,20] [--mode process]
+
+import argparse
+import asyncio
+import logging
+import time
+
+from backend.executor import JobExecutor
+from backend.log import ROOT_LOGGER_NAME
+from backend.pipeline import extract_deck
+from benchmarks.synthetic import make_deck
+
+def _serial(payloads):
+    return [extract_deck(name, data) for name, data in payloads]
+
+async def _parallel(executor, payloads):
+    return await executor.map(extract_deck, payloads)
+
+def main():
+    parser = argparse.ArgumentParser(description="PPT 擷取階段平行化效能量測")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--counts", default="1,2,5,10,20")
+    parser.add_argument("--mode", choices=["thread", "process"], default="process")
+    parser.add_argument("--stage-tables", type=int, default=6)
+    parser.add_argument("--stage-rows", type=int, default=20)
+    args = parser.parse_args()
+    # 只輸出警告以上的日誌，避免擷取過程的日誌影響量測結果
+    logging.getLogger(ROOT_LOGGER_NAME).setLevel(logging.WARNING)
+
+    counts = [int(c) for c in args.counts.split(",")]
+    decks = [(f"deck{i}.pptx", make_deck(seed=i, stage_tables=args.stage_tables, stage_rows=args.stage_rows))
+             for i in range(max(counts))]
+
+    executor = JobExecutor(mode=args.mode, max_workers=args.workers, max_queue=max(counts), job_timeout=600)
+    # 先預熱執行池，排除行程啟動成本
+    asyncio.run(_parallel(executor, decks[:args.workers]))
+
+    print(f"{'decks':>6} {'serial (s)':>12} {'parallel (s)':>14} {'speedup':>8}")
+    for count in counts:
+        payloads = decks[:count]
+
+        start = time.perf_counter()
+        serial_result = _serial(payloads)
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel_result = asyncio.run(_parallel(executor, payloads))
+        parallel_time = time.perf_counter() - start
+
+        # 平行處理的結果必須與逐一處理完全相同且順序一致
+        assert parallel_result == serial_result, "平行擷取結果與逐一擷取不一致"
+        print(f"{count:>6} {serial_time:>12.3f} {parallel_time:>14.3f} {serial_time / parallel_time:>7.2f}x")
+
+    executor.shutdown()
+
+if __name__ == "__main__":
+    main()
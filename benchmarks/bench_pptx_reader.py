@@ -0,0 +1,71 @@
+# PMO_Report_Automation/benchmarks/bench_pptx_reader.py
+
+# 比對 python-pptx 與 lazy 兩種擷取引擎：先確認兩者的擷取結果完全相同 (golden output)，
+# 再量測在含大量圖片的簡報上各自的耗時。另確認第一個專案階段表格只有表頭一行時，
+# 之後各頁重複的表頭與子表頭都只保留一次 (與原始實作以合併後表格的第二行判斷重複子表頭相同)。
+# 用法：python -m benchmarks.bench_pptx_reader [--images 0,4,16] [--repeat 5]
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from backend.log import ROOT_LOGGER_NAME
+from backend.pipeline import extract_deck
+from benchmarks.synthetic import make_deck, PROJECT_STAGE_HEADER, PROJECT_STAGE_SUBHEADER
+
+def _extract(path, engine):
+    return extract_deck(os.path.basename(path), path, engine=engine)
+
+# 第一個專案階段表格只有表頭一行：合併後的表格應為表頭、子表頭各一行，接著各頁的資料列
+def _check_header_only_stage_table(directory, stage_tables, stage_rows):
+    path = os.path.join(directory, "deck_header_only.pptx")
+    with open(path, "wb") as f:
+        f.write(make_deck(seed=0, stage_tables=stage_tables, stage_rows=stage_rows, stage_header_only=True))
+    for engine in ("python-pptx", "lazy"):
+        tables = _extract(path, engine)["project_stage_tables"]
+        assert len(tables) == 1, f"{engine} 引擎未將專案階段表格合併為一個"
+        rows = [list(row) for row in tables[0]]
+        assert rows[:2] == [PROJECT_STAGE_HEADER, PROJECT_STAGE_SUBHEADER], f"{engine} 引擎合併後的表頭不正確"
+        assert len(rows) == 2 + stage_tables * stage_rows, f"{engine} 引擎合併後重複保留了子表頭"
+
+def _best_time(path, engine, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _extract(path, engine)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="PPT 擷取引擎比對與效能量測")
+    parser.add_argument("--images", default="0,4,16", help="每張專案階段投影片的圖片數")
+    parser.add_argument("--image-size", type=int, default=1024)
+    parser.add_argument("--stage-tables", type=int, default=10)
+    parser.add_argument("--stage-rows", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    # 只輸出警告以上的日誌，避免擷取過程的日誌影響量測結果
+    logging.getLogger(ROOT_LOGGER_NAME).setLevel(logging.WARNING)
+
+    print(f"{'images/slide':>12} {'size (MB)':>10} {'python-pptx (s)':>16} {'lazy (s)':>10} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        _check_header_only_stage_table(directory, args.stage_tables, args.stage_rows)
+        for images in [int(n) for n in args.images.split(",")]:
+            path = os.path.join(directory, f"deck_{images}.pptx")
+            with open(path, "wb") as f:
+                f.write(make_deck(seed=images, stage_tables=args.stage_tables, stage_rows=args.stage_rows,
+                                  images_per_slide=images, image_size=args.image_size))
+
+            expected = _extract(path, "python-pptx")
+            actual = _extract(path, "lazy")
+            assert actual == expected, f"lazy 引擎的擷取結果與 python-pptx 不一致 ({path})"
+
+            pptx_time = _best_time(path, "python-pptx", args.repeat)
+            lazy_time = _best_time(path, "lazy", args.repeat)
+            size_mb = os.path.getsize(path) / (1024 * 1024)
+            print(f"{images:>12} {size_mb:>10.1f} {pptx_time:>16.3f} {lazy_time:>10.3f} {pptx_time / lazy_time:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
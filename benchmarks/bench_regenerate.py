@@ -0,0 +1,78 @@
+# PMO_Report_Automation/benchmarks/bench_regenerate.py
+
+# 比較更換單一 PPT 後「完整重建」(POST /process-files/ 上傳所有檔案) 與
+# 「重新產生」(POST /reports/{report_id}/regenerate 只上傳變更的 PPT) 的耗時，並確認兩者產生的報告內容相同。
+# 預設停用 PPT 擷取快取 (PMO_DECK_CACHE_ENABLED=0)，完整重建會重新擷取所有 PPT；加上 --cache 可保留。
+# 報告快取 (PMO_REPORT_CACHE_ENABLED=0) 一律停用，否則重新產生會直接命中完整重建的報告。
+# 用法：python -m benchmarks.bench_regenerate [--decks 10] [--stage-tables 6] [--stage-rows 20] [--repeat 5]
+
+import argparse
+import io
+import os
+import statistics
+import time
+import zipfile
+
+def _document_xml(docx_bytes):
+    with zipfile.ZipFile(io.BytesIO(docx_bytes)) as zf:
+        return zf.read("word/document.xml")
+
+def _post(client, url, files, data=None):
+    start = time.perf_counter()
+    response = client.post(url, files=files, data=data)
+    elapsed = time.perf_counter() - start
+    if response.status_code != 200:
+        raise RuntimeError(f"{url} 回傳 {response.status_code}：{response.text[:200]}")
+    return response, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="報告重新產生與完整重建的耗時比較")
+    parser.add_argument("--decks", type=int, default=10)
+    parser.add_argument("--stage-tables", type=int, default=6)
+    parser.add_argument("--stage-rows", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cache", action="store_true", help="保留 PPT 擷取快取")
+    args = parser.parse_args()
+
+    os.environ.setdefault("PMO_LOG_LEVEL", "WARNING")
+    os.environ["PMO_REPORT_CACHE_ENABLED"] = "0"
+    if not args.cache:
+        os.environ["PMO_DECK_CACHE_ENABLED"] = "0"
+
+    from fastapi.testclient import TestClient
+    from backend.main import app
+    from benchmarks.synthetic import make_deck, make_template
+
+    template_bytes = make_template()
+    decks = [(f"deck{i}.pptx", make_deck(seed=i, stage_tables=args.stage_tables, stage_rows=args.stage_rows))
+             for i in range(args.decks)]
+
+    full_times = []
+    regenerate_times = []
+    with TestClient(app) as client:
+        files = [("word_template", ("template.docx", template_bytes))] + [("ppt_files", deck) for deck in decks]
+        response, _ = _post(client, "/process-files/", files)
+        report_id = response.headers["X-Report-Id"]
+
+        for r in range(args.repeat):
+            # 第 1 個 PPT 換成新內容 (每輪不同，避免命中先前的結果)
+            changed = ("deck0.pptx", make_deck(seed=1000 + r, stage_tables=args.stage_tables, stage_rows=args.stage_rows))
+
+            full_files = [("word_template", ("template.docx", template_bytes)), ("ppt_files", changed)]
+            full_files += [("ppt_files", deck) for deck in decks[1:]]
+            full, elapsed = _post(client, "/process-files/", full_files)
+            full_times.append(elapsed)
+
+            regenerated, elapsed = _post(client, f"/reports/{report_id}/regenerate", [("ppt_files", changed)])
+            regenerate_times.append(elapsed)
+            assert regenerated.headers["X-Extracted-Decks"] == "1"
+            assert _document_xml(regenerated.content) == _document_xml(full.content), "重新產生的報告與完整重建不同"
+
+    print(f"decks={args.decks} stage_tables={args.stage_tables} stage_rows={args.stage_rows} cache={'on' if args.cache else 'off'}")
+    print(f"完整重建：median {statistics.median(full_times) * 1000:.1f} ms")
+    print(f"重新產生：median {statistics.median(regenerate_times) * 1000:.1f} ms "
+          f"({statistics.median(full_times) / statistics.median(regenerate_times):.2f}x)")
+    print("報告內容一致。")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# PMO_Report_Automation/benchmarks/bench_render.py
+
+# 量測報告寫入階段 (render_report) 的耗時與輸出的 word/document.xml 大小。
+# 用法：python -m benchmarks.bench_render [--decks 3] [--stage-tables 3] [--stage-rows 20] [--repeat 5]
+
+import argparse
+import io
+import logging
+import statistics
+import time
+import zipfile
+
+from docx import Document
+
+from backend.cache import sha256_hex
+from backend.log import ROOT_LOGGER_NAME
+from backend.pipeline import extract_deck, render_report
+from benchmarks.synthetic import make_deck
+
+def _blank_template():
+    output = io.BytesIO()
+    Document().save(output)
+    return output.getvalue()
+
+def main():
+    parser = argparse.ArgumentParser(description="報告寫入階段效能量測")
+    parser.add_argument("--decks", type=int, default=3)
+    parser.add_argument("--stage-tables", type=int, default=3)
+    parser.add_argument("--stage-rows", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    # 只輸出警告以上的日誌，避免擷取過程的日誌影響量測結果
+    logging.getLogger(ROOT_LOGGER_NAME).setLevel(logging.WARNING)
+
+    template_bytes = _blank_template()
+    template_id = sha256_hex(template_bytes)
+    decks = [extract_deck(f"deck{i}.pptx", make_deck(seed=i, stage_tables=args.stage_tables, stage_rows=args.stage_rows))
+             for i in range(args.decks)]
+    # 第一次執行會解析範本並建立基底，不列入量測
+    report = render_report(template_id, template_bytes, decks)
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        report = render_report(template_id, template_bytes, decks)
+        timings.append(time.perf_counter() - start)
+
+    with zipfile.ZipFile(io.BytesIO(report)) as zf:
+        document_xml_size = len(zf.read("word/document.xml"))
+
+    print(f"decks={args.decks} stage_tables={args.stage_tables} stage_rows={args.stage_rows}")
+    print(f"render_report: median {statistics.median(timings) * 1000:.1f} ms, min {min(timings) * 1000:.1f} ms")
+    print(f"document.xml: {document_xml_size} bytes, .docx: {len(report)} bytes")
+
+if __name__ == "__main__":
+    main()
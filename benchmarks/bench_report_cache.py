@@ -0,0 +1,95 @@
+# PMO_Report_Automation/benchmarks/bench_report_cache.py
+
+# 量測整份報告快取：同一組範本與 PPT 重複送出 POST /process-files/ 時，
+# 快取未命中 (產生報告)、快取命中 (回傳快取的 .docx) 與 GET /reports/{report_id}/download 附 If-None-Match (304) 的耗時。
+# 並確認：快取命中回傳的位元組與第一次產生的報告完全相同；清除快取後重新產生的報告，zip 內各檔案內容與快取的報告相同
+# (.docx 的 zip 標頭含寫入時間，重新產生的檔案無法逐位元組比較)。
+# 預設停用 PPT 擷取快取 (PMO_DECK_CACHE_ENABLED=0)，快取未命中時量到的是完整的擷取與寫入。
+# 用法：python -m benchmarks.bench_report_cache [--decks 10] [--stage-tables 6] [--stage-rows 20] [--repeat 5]
+
+import argparse
+import io
+import os
+import statistics
+import tempfile
+import time
+import zipfile
+
+def _zip_members(docx_bytes):
+    with zipfile.ZipFile(io.BytesIO(docx_bytes)) as zf:
+        return {name: zf.read(name) for name in zf.namelist()}
+
+def _timed(call):
+    start = time.perf_counter()
+    response = call()
+    return response, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="整份報告快取的耗時量測")
+    parser.add_argument("--decks", type=int, default=10)
+    parser.add_argument("--stage-tables", type=int, default=6)
+    parser.add_argument("--stage-rows", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ.setdefault("PMO_LOG_LEVEL", "WARNING")
+    os.environ["PMO_DECK_CACHE_ENABLED"] = "0"
+    os.environ["PMO_REPORT_CACHE_ENABLED"] = "1"
+    os.environ["PMO_REPORT_CACHE_DIR"] = tempfile.mkdtemp(prefix="pmo_bench_report_cache_")
+
+    from fastapi.testclient import TestClient
+    from backend.main import app, report_cache
+    from benchmarks.synthetic import make_deck, make_template
+
+    template_bytes = make_template()
+    decks = [(f"deck{i}.pptx", make_deck(seed=i, stage_tables=args.stage_tables, stage_rows=args.stage_rows))
+             for i in range(args.decks)]
+    files = [("word_template", ("template.docx", template_bytes))] + [("ppt_files", deck) for deck in decks]
+
+    def post():
+        response = client.post("/process-files/", files=files)
+        if response.status_code != 200:
+            raise RuntimeError(f"/process-files/ 回傳 {response.status_code}：{response.text[:200]}")
+        return response
+
+    miss_times, hit_times, not_modified_times = [], [], []
+    with TestClient(app) as client:
+        for _ in range(args.repeat):
+            report_cache.clear()
+            first, elapsed = _timed(post)
+            assert first.headers["X-Report-Cache"] == "miss"
+            miss_times.append(elapsed)
+
+            cached, elapsed = _timed(post)
+            assert cached.headers["X-Report-Cache"] == "hit"
+            assert cached.content == first.content, "快取命中回傳的報告與第一次產生的報告不同"
+            assert cached.headers["ETag"] == first.headers["ETag"]
+            hit_times.append(elapsed)
+
+            download_url = f"/reports/{cached.headers['X-Report-Id']}/download"
+            not_modified, elapsed = _timed(lambda: client.get(download_url, headers={"If-None-Match": first.headers["ETag"]}))
+            assert not_modified.status_code == 304 and not not_modified.content
+            not_modified_times.append(elapsed)
+
+        downloaded = client.get(download_url)
+        assert downloaded.status_code == 200 and downloaded.content == first.content
+
+        # 清除快取後重新產生，與快取的報告比較 zip 內各檔案內容
+        report_cache.clear()
+        fresh = post()
+        assert fresh.headers["X-Report-Cache"] == "miss"
+        assert _zip_members(fresh.content) == _zip_members(cached.content), "重新產生的報告內容與快取的報告不同"
+
+    miss_ms = statistics.median(miss_times) * 1000
+    hit_ms = statistics.median(hit_times) * 1000
+    not_modified_ms = statistics.median(not_modified_times) * 1000
+    print(f"decks={args.decks} stage_tables={args.stage_tables} stage_rows={args.stage_rows} "
+          f"report={len(first.content) / 1024:.0f} KB")
+    print(f"{'':>14} {'p50 (ms)':>9}")
+    print(f"{'miss':>14} {miss_ms:>9.1f}")
+    print(f"{'hit':>14} {hit_ms:>9.1f}  ({miss_ms / hit_ms:.1f}x)")
+    print(f"{'304 download':>14} {not_modified_ms:>9.1f}")
+    print("快取的報告與重新產生的報告內容一致。")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# PMO_Report_Automation/benchmarks/bench_startup.py
+
+# 量測服務冷啟動：
+#   1. 匯入 backend.main 的耗時 (python -X importtime)，列出其直接匯入的模組中耗時最多者；
+#   2. 以 uvicorn 子行程啟動服務，依預熱模式 (PMO_WARMUP_MODE) 分別量測
+#      「開始接受連線」(GET / 回應) 的時間，以及啟動後立即送出第一份報告 (與等待預熱完成後送出) 的完成時間。
+# 每種模式重複 --repeat 次並取中位數；時間皆自啟動子行程起算。
+# 用法：python -m benchmarks.bench_startup [--modes off,background,startup] [--repeat 3] [--executor thread]
+
+import argparse
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# 回傳 (匯入 backend.main 的毫秒數, [(backend.main 直接匯入的模組, 毫秒)])
+def _import_profile(top=8):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import backend.main"],
+                            capture_output=True, text=True, env=dict(os.environ, PMO_LOG_LEVEL="WARNING"))
+    entries = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+        if match:
+            entries.append((match.group(3), len(match.group(2)), int(match.group(1))))
+
+    # importtime 先列出子模組再列出匯入它們的模組：backend.main 與前一個同層項目之間、縮排多一層的項目即為其直接匯入的模組
+    main_index = next(i for i, (name, _, _) in enumerate(entries) if name == "backend.main")
+    _, main_indent, total = entries[main_index]
+    first = max((i + 1 for i, (_, indent, _) in enumerate(entries[:main_index]) if indent <= main_indent), default=0)
+    children = [(name, micros) for name, indent, micros in entries[first:main_index] if indent == main_indent + 2]
+    return total / 1000, sorted(children, key=lambda item: -item[1])[:top]
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _wait_until(client, url, predicate, timeout=60.0):
+    import httpx
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            response = client.get(url)
+            if predicate(response):
+                return response
+        except httpx.TransportError:
+            pass
+        time.sleep(0.005)
+    raise RuntimeError(f"等待 {url} 逾時")
+
+def _post_report(client, base_url, template_bytes, deck_bytes):
+    files = [("word_template", ("template.docx", template_bytes)), ("ppt_files", ("deck.pptx", deck_bytes))]
+    response = client.post(f"{base_url}/process-files/", files=files, timeout=120)
+    if response.status_code != 200:
+        raise RuntimeError(f"報告產生失敗：{response.status_code} {response.text[:200]}")
+
+# 啟動一次服務並量測；after_warmup 為 True 時等待 /healthz 顯示預熱完成後才送出報告
+def _measure(mode, executor_mode, template_bytes, deck_bytes, after_warmup):
+    import httpx
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, PMO_WARMUP_MODE=mode, PMO_EXECUTOR_MODE=executor_mode, PMO_LOG_LEVEL="WARNING",
+                   PMO_DECK_CACHE_DIR=os.path.join(tmp, "decks"), PMO_TEMPLATE_DIR=os.path.join(tmp, "templates"),
+                   PMO_REPORT_MODEL_DIR=os.path.join(tmp, "models"), PMO_JOBS_DIR=os.path.join(tmp, "jobs"))
+        start = time.perf_counter()
+        server = subprocess.Popen([sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port),
+                                   "--log-level", "warning"], env=env)
+        try:
+            with httpx.Client() as client:
+                _wait_until(client, f"{base_url}/", lambda r: r.status_code == 200)
+                ready = time.perf_counter() - start
+                if after_warmup and mode != "off":
+                    _wait_until(client, f"{base_url}/healthz",
+                                lambda r: r.json()["warmup"]["status"] in ("done", "failed"))
+                request_start = time.perf_counter()
+                _post_report(client, base_url, template_bytes, deck_bytes)
+                done = time.perf_counter()
+        finally:
+            server.terminate()
+            server.wait()
+    return ready, done - start, done - request_start
+
+def main():
+    parser = argparse.ArgumentParser(description="服務冷啟動與第一份報告的耗時量測")
+    parser.add_argument("--modes", default="off,background,startup")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--executor", default="thread", choices=("thread", "process"))
+    args = parser.parse_args()
+
+    from benchmarks.synthetic import make_deck, make_template
+    template_bytes = make_template()
+    deck_bytes = make_deck(seed=1)
+
+    total_ms, packages = _import_profile()
+    print(f"import backend.main：{total_ms:.0f} ms")
+    for name, micros in packages:
+        print(f"  {name:<24} {micros / 1000:>7.1f} ms")
+
+    print(f"\nexecutor={args.executor} repeat={args.repeat} (毫秒，自啟動子行程起算)")
+    print(f"{'warmup':>10} {'ready':>7} {'1st report':>11} {'(request)':>10} {'after warm':>11} {'(request)':>10}")
+    for mode in args.modes.split(","):
+        immediate = [_measure(mode, args.executor, template_bytes, deck_bytes, False) for _ in range(args.repeat)]
+        warmed = [_measure(mode, args.executor, template_bytes, deck_bytes, True) for _ in range(args.repeat)]
+        median = lambda samples, i: statistics.median(sample[i] for sample in samples) * 1000
+        print(f"{mode:>10} {median(immediate, 0):>7.0f} {median(immediate, 1):>11.0f} {median(immediate, 2):>10.0f} "
+              f"{median(warmed, 1):>11.0f} {median(warmed, 2):>10.0f}")
+
+if __name__ == "__main__":
+    main()
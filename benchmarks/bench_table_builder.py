@@ -0,0 +1,247 @@
+# PMO_Report_Automation/benchmarks/bench_table_builder.py
+
+# 比較逐格建立 (原始實作，見 _legacy_add_filtered_tables) 與整批建立 (add_filtered_tables) Word 表格的耗時。
+# 原始實作逐一設定每個文字區塊的字型，目前的實作改由報告樣式提供字型 (XML 不同)，
+# 因此比對兩者產生的表格結構與各儲存格文字須完全相同。
+# 用法：python -m benchmarks.bench_table_builder [--rows 100,200,2000] [--max-cellwise-rows 200]
+
+import argparse
+import random
+import re
+import time
+
+from docx import Document
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Cm, Pt
+from docx.text.paragraph import Paragraph
+
+from backend.logic import add_filtered_tables
+from benchmarks.synthetic import OWNERS, PROJECT_STAGE_HEADER, PROJECT_STAGE_SUBHEADER, STATUSES
+
+# --- 原始實作 (逐格建立表格) 的凍結副本；除移除 print 輸出外與原始程式碼相同 ---
+
+def _legacy_clean_text(text):
+    if not isinstance(text, str):
+        text = str(text)
+    try:
+        cleaned_text = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\u200b\ufeff\u200c\u200d\u00ad]', '', text)
+        cleaned_text = cleaned_text.replace('\u3000', ' ')
+        return cleaned_text
+    except Exception:
+        return ""
+
+def _legacy_set_run_fonts(run, ascii_font, east_asia_font, hansi_font):
+    try:
+        rpr = run._element.get_or_add_rPr()
+        rFonts_element = rpr.find(qn('w:rFonts'))
+        if rFonts_element is not None:
+            rpr.remove(rFonts_element)
+        r_fonts = OxmlElement('w:rFonts')
+        r_fonts.set(qn('w:ascii'), ascii_font)
+        r_fonts.set(qn('w:eastAsia'), east_asia_font)
+        r_fonts.set(qn('w:hAnsi'), hansi_font)
+        rpr.append(r_fonts)
+        run.font.name = ascii_font
+    except Exception:
+        pass
+
+def _legacy_is_row_empty(row_data):
+    return all(not cell.strip() for cell in row_data)
+
+def _legacy_add_filtered_tables(doc, tables_data_list):
+    predefined_widths_map = {
+        10: [Cm(1.24), Cm(0.81), Cm(0.81), Cm(1.38), Cm(4.69), Cm(2.56), Cm(2.25), Cm(0.75), Cm(2.25), Cm(2.29)],
+        2: [Cm(2), Cm(17.03)],
+    }
+
+    for table_data in tables_data_list:
+        if not table_data:
+            continue
+
+        # 過濾空白行
+        last_valid_row_idx = -1
+        for r_idx in range(len(table_data) - 1, -1, -1):
+            if not _legacy_is_row_empty(table_data[r_idx]):
+                last_valid_row_idx = r_idx
+                break
+
+        table_data_to_use = table_data[:last_valid_row_idx + 1] if last_valid_row_idx != -1 else []
+        if not table_data_to_use:
+            continue
+
+        rows = len(table_data_to_use)
+        cols = len(table_data_to_use[0]) if rows > 0 else 0
+        if cols == 0:
+            continue
+
+        # 建立表格
+        doc_table = doc.add_table(rows=rows, cols=cols)
+        doc_table.style = "Table Grid"
+        doc_table.autofit = False
+
+        tbl = doc_table._tbl
+        tblPr = tbl.tblPr
+        if tblPr is None:
+            tblPr = OxmlElement('w:tblPr')
+            tbl.insert(0, tblPr)
+
+        tblW_existing = tblPr.find(qn('w:tblW'))
+        if tblW_existing is not None:
+            tblPr.remove(tblW_existing)
+
+        tblW = OxmlElement('w:tblW')
+        tblW.set(qn('w:type'), 'dxa')
+        tblW.set(qn('w:w'), str(int(19.03 * 567)))  # 11361 dxa
+        tblPr.append(tblW)
+
+        # 欄寬設定
+        if cols in predefined_widths_map:
+            current_column_widths_cm = predefined_widths_map[cols]
+        else:
+            col_width = Cm(19.03 / cols)
+            current_column_widths_cm = [col_width] * cols
+
+        # 寫入內容
+        for r in range(rows):
+            for c in range(cols):
+                cell_text = table_data_to_use[r][c] if c < len(table_data_to_use[r]) else ""
+                word_cell = doc_table.cell(r, c)
+                paragraph = word_cell.paragraphs[0]
+                paragraph.clear()
+                cleaned_text = _legacy_clean_text(cell_text)
+
+                # 特殊換行處理（第4欄、第9~10欄）
+                if c == 4:
+                    first_match = re.search(r'(\d+、)', cleaned_text)
+                    if first_match:
+                        temp_placeholder = "__FIRST_MATCH_PLACEHOLDER__"
+                        temp_text = cleaned_text.replace(first_match.group(0), temp_placeholder, 1)
+                        formatted_text = re.sub(r'(\d+、)', r'\n\1', temp_text)
+                        formatted_text = formatted_text.replace(temp_placeholder, first_match.group(0))
+                    else:
+                        formatted_text = cleaned_text
+                    lines_to_add = formatted_text.splitlines()
+                else:
+                    lines_to_add = cleaned_text.splitlines()
+
+                # 第 9、10 欄特殊處理
+                if c in [8, 9]:
+                    if r == 0:
+                        for idx, line in enumerate(lines_to_add):
+                            if not line.strip():
+                                continue
+                            if idx > 0:
+                                paragraph.add_run().add_break()
+                            run = paragraph.add_run(line.strip())
+                            _legacy_set_run_fonts(run, 'Times New Roman', '標楷體', 'Times New Roman')
+                            run.font.size = Pt(12)
+                    else:
+                        for idx, line in enumerate(lines_to_add):
+                            if not line.strip():
+                                continue
+                            if idx == 0:
+                                run = paragraph.add_run(line.strip())
+                                _legacy_set_run_fonts(run, 'Times New Roman', '標楷體', 'Times New Roman')
+                                run.font.size = Pt(12)
+                            else:
+                                para = word_cell.add_paragraph()
+                                para.paragraph_format.space_before = Pt(12)
+                                run = para.add_run(line.strip())
+                                _legacy_set_run_fonts(run, 'Times New Roman', '標楷體', 'Times New Roman')
+                                run.font.size = Pt(12)
+                else:
+                    for idx, line in enumerate(lines_to_add):
+                        if not line.strip():
+                            continue
+                        if idx > 0:
+                            paragraph.add_run().add_break()
+                        run = paragraph.add_run(line.strip())
+                        _legacy_set_run_fonts(run, 'Times New Roman', '標楷體', 'Times New Roman')
+                        run.font.size = Pt(12)
+
+                # 表頭網底
+                if r == 0:
+                    tcPr = word_cell._tc.get_or_add_tcPr()
+                    shd = OxmlElement('w:shd')
+                    shd.set(qn('w:val'), 'clear')
+                    shd.set(qn('w:color'), 'auto')
+                    shd.set(qn('w:fill'), 'D9D9D9')  # 淺灰色
+                    tcPr.append(shd)
+
+        # 合併欄位（僅適用 10 欄的表格）
+        if cols == 10 and rows > 1:
+            for col_idx in [0, 8, 9]:
+                if col_idx < cols:
+                    try:
+                        doc_table.cell(1, col_idx).merge(doc_table.cell(rows - 1, col_idx))
+                    except Exception:
+                        pass
+
+        # 設定每一欄的寬度
+        for i, width_cm in enumerate(current_column_widths_cm):
+            if i < cols:
+                for cell in doc_table.columns[i].cells:
+                    cell.width = width_cm
+
+# --- 量測 ---
+
+# 產生合併後的 10 欄專案階段表格
+def make_project_stage_table(rows, seed=0):
+    rnd = random.Random(seed)
+    table = [list(PROJECT_STAGE_HEADER), list(PROJECT_STAGE_SUBHEADER)]
+    for r in range(rows - 2):
+        table.append([
+            "階段1", str(r + 1), "開發", f"工作項目 {r}",
+            f"1、需求確認 2、程式修改 3、測試驗證 {rnd.randrange(100)}",
+            rnd.choice(OWNERS), "2024/01/01", rnd.choice(STATUSES), "2024/06/30",
+            f"備註 {r}\n追蹤事項 {rnd.randrange(100)}",
+        ])
+    return table
+
+# 表格結構與各儲存格的段落文字 (合併儲存格、欄寬與網底)
+def _table_contents(doc):
+    contents = []
+    for table in doc.tables:
+        for tr in table._tbl.tr_lst:
+            row = []
+            for tc in tr.tc_lst:
+                tcPr = tc.tcPr
+                v_merge = tcPr.find(qn('w:vMerge')) if tcPr is not None else None
+                shd = tcPr.find(qn('w:shd')) if tcPr is not None else None
+                row.append((
+                    [Paragraph(p, None).text for p in tc.iterchildren(qn('w:p'))],
+                    None if v_merge is None else v_merge.get(qn('w:val'), "continue"),
+                    tc.width,
+                    None if shd is None else shd.get(qn('w:fill')),
+                ))
+            contents.append(row)
+    return contents
+
+def _render(builder, table):
+    doc = Document()
+    start = time.perf_counter()
+    builder(doc, [table])
+    elapsed = time.perf_counter() - start
+    return elapsed, _table_contents(doc)
+
+def main():
+    parser = argparse.ArgumentParser(description="Word 表格建立效能量測")
+    parser.add_argument("--rows", default="100,200,2000")
+    parser.add_argument("--max-cellwise-rows", type=int, default=200,
+                        help="逐格建立的耗時隨列數平方成長，超過此列數只量測整批建立")
+    args = parser.parse_args()
+
+    print(f"{'rows':>6} {'cellwise (s)':>13} {'bulk (s)':>10} {'speedup':>8}")
+    for rows in [int(n) for n in args.rows.split(",")]:
+        table = make_project_stage_table(rows, seed=rows)
+        bulk_time, bulk_contents = _render(add_filtered_tables, table)
+        if rows > args.max_cellwise_rows:
+            print(f"{rows:>6} {'-':>13} {bulk_time:>10.3f} {'-':>8}")
+            continue
+        cellwise_time, cellwise_contents = _render(_legacy_add_filtered_tables, table)
+        assert bulk_contents == cellwise_contents, f"{rows} 列表格的整批建立結果與逐格建立不一致"
+        print(f"{rows:>6} {cellwise_time:>13.3f} {bulk_time:>10.3f} {cellwise_time / bulk_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
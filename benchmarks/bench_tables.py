@@ -0,0 +1,112 @@
+# PMO_Report_Automation/benchmarks/bench_tables.py
+
+# 量測擷取出的表格所佔的記憶體：原始實作以列的列表保存每個表格，跨頁的專案階段表格以 extend 複製列合併；
+# 新的實作以 Table 保存 (儲存格文字以 sys.intern 去重、合併時只記錄列範圍)。
+# 以 tracemalloc 量測擷取結果保留的記憶體與擷取期間的峰值，另比較行程池傳回結果時的 pickle 大小與擷取耗時。
+# 兩者寫入 Word 的表格 XML 須完全相同。PPT 只掃描一次，量測範圍不含 .pptx 解析。
+# 用法：python -m benchmarks.bench_tables [--stage-tables 120] [--stage-rows 40] [--modification-tables 20] [--repeat 3]
+
+import argparse
+import gc
+import io
+import pickle
+import statistics
+import time
+import tracemalloc
+
+from docx import Document
+from docx.oxml.ns import qn
+from lxml import etree
+from pptx import Presentation
+
+from backend import logic
+from backend.logic import RelevantTablesCollector, add_filtered_tables, collect
+from backend.scanner import scan_presentation
+from benchmarks.synthetic import make_deck, make_template
+
+
+# 原始實作的表格：列的列表，合併時以 extend 複製列
+class _LegacyTable(list):
+    def __init__(self, rows=()):
+        super().__init__(rows)
+
+    def extend_from(self, other, start=0):
+        self.extend(other[start:])
+
+
+def _collect_tables(scanned_slides, legacy):
+    table_class = logic.Table
+    if legacy:
+        logic.Table = _LegacyTable
+    try:
+        return collect(scanned_slides, [RelevantTablesCollector()])[0]
+    finally:
+        logic.Table = table_class
+
+# 回傳 (擷取結果, 保留的位元組數, 峰值位元組數, 秒數)
+def _measure(scanned_slides, legacy):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    tables = _collect_tables(scanned_slides, legacy)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tables, retained, peak, elapsed
+
+def _tables_xml(template_bytes, tables):
+    doc = Document(io.BytesIO(template_bytes))
+    add_filtered_tables(doc, tables["project_stage_tables_data"], text_cleaned=True)
+    add_filtered_tables(doc, tables["program_modifications_table_data"], text_cleaned=True)
+    return b"".join(etree.tostring(child) for child in doc.element.body if child.tag == qn("w:tbl"))
+
+def main():
+    parser = argparse.ArgumentParser(description="擷取出的表格的記憶體量測")
+    parser.add_argument("--stage-tables", type=int, default=120)
+    parser.add_argument("--stage-rows", type=int, default=40)
+    parser.add_argument("--modification-tables", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    deck_bytes = make_deck(seed=1, stage_tables=args.stage_tables, stage_rows=args.stage_rows,
+                           modification_tables=args.modification_tables)
+    scanned_slides = list(scan_presentation(Presentation(io.BytesIO(deck_bytes))))
+
+    results = {}
+    for name, legacy in (("legacy", True), ("compact", False)):
+        samples = []
+        tables = None
+        for _ in range(args.repeat):
+            # 先釋放前一輪的結果，否則去重後的字串仍被前一輪的結果參照，不會計入本輪
+            tables = None
+            tables, *sample = _measure(scanned_slides, legacy)
+            samples.append(sample)
+        results[name] = {
+            "tables": tables,
+            "retained": statistics.median(sample[0] for sample in samples),
+            "peak": statistics.median(sample[1] for sample in samples),
+            "ms": statistics.median(sample[2] for sample in samples) * 1000,
+            "pickle": len(pickle.dumps(tables, protocol=pickle.HIGHEST_PROTOCOL)),
+        }
+
+    legacy_tables = results["legacy"]["tables"]
+    compact_tables = results["compact"]["tables"]
+    for key in ("project_stage_tables_data", "program_modifications_table_data"):
+        assert [list(map(list, table)) for table in legacy_tables[key]] == \
+               [table.to_lists() for table in compact_tables[key]], f"{key} 的內容與原始實作不同"
+    template_bytes = make_template()
+    assert _tables_xml(template_bytes, legacy_tables) == _tables_xml(template_bytes, compact_tables), \
+        "寫入 Word 的表格與原始實作不同"
+
+    stage_rows = sum(len(table) for table in compact_tables["project_stage_tables_data"])
+    print(f"project_stage_tables={len(compact_tables['project_stage_tables_data'])} (merged rows={stage_rows}) "
+          f"program_modification_tables={len(compact_tables['program_modifications_table_data'])}")
+    print(f"{'':>8} {'retained (KB)':>14} {'peak (KB)':>10} {'pickle (KB)':>12} {'collect (ms)':>13}")
+    for name, result in results.items():
+        print(f"{name:>8} {result['retained'] / 1024:>14.0f} {result['peak'] / 1024:>10.0f} "
+              f"{result['pickle'] / 1024:>12.0f} {result['ms']:>13.1f}")
+    print(f"retained: {results['legacy']['retained'] / results['compact']['retained']:.2f}x smaller; 輸出一致。")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+# PMO_Report_Automation/benchmarks/suite.py
+
+# 可重現的整體效能量測：以合成 PPT 與 Word 範本執行完整的報告產生流程，
+#   inprocess  直接呼叫 extract_deck 與 render_report (不含 HTTP 與上傳處理)
+#   app        透過 TestClient 呼叫 POST /process-files/ (含上傳暫存、工作執行池與回應)
+# 輸出各情境的吞吐量 (PPT/秒)、p50/p95 延遲與 RSS 峰值，可存成 JSON 並與先前的結果比較。
+# app 模式預設停用 PPT 擷取快取與報告快取 (PMO_DECK_CACHE_ENABLED=0、PMO_REPORT_CACHE_ENABLED=0)，
+# 否則重複執行只會量到快取命中；加上 --cache 可保留。
+# 用法：
+#   python -m benchmarks.suite [--scenarios small,medium] [--modes inprocess,app] [--repeat 10] [--save results.json]
+#   python -m benchmarks.suite --compare results.json [--threshold 0.15]
+#   python -m benchmarks.suite --scenarios custom --decks 4 --stage-tables 8 --stage-rows 30 --images-per-slide 2
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+# 情境：PPT 數量與每份 PPT 的結構 (make_deck 的參數)
+SCENARIOS = {
+    "small": {"decks": 1, "deck": {"stage_tables": 3, "stage_rows": 10}},
+    "medium": {"decks": 3, "deck": {"stage_tables": 6, "stage_rows": 20}},
+    "large": {"decks": 5, "deck": {"stage_tables": 12, "stage_rows": 30, "modification_tables": 2, "filler_slides": 10}},
+    "images": {"decks": 2, "deck": {"stage_tables": 3, "stage_rows": 10, "images_per_slide": 2, "image_size": 512}},
+}
+
+MODES = ("inprocess", "app")
+
+# 與基準比較的指標：名稱 → 數值越大是否越好
+COMPARED_METRICS = {"p50_ms": False, "p95_ms": False, "throughput_decks_per_s": True}
+
+
+# 依最近排名法計算百分位數
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+def _summarize(latencies, deck_count, sampler):
+    ordered = sorted(latencies)
+    return {
+        "runs": len(latencies),
+        "decks": deck_count,
+        "p50_ms": _percentile(ordered, 50) * 1000,
+        "p95_ms": _percentile(ordered, 95) * 1000,
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "throughput_decks_per_s": deck_count * len(latencies) / sum(latencies),
+        "peak_rss_mb": sampler.peak_rss / 1024 / 1024,
+        "peak_rss_delta_mb": sampler.peak_delta / 1024 / 1024,
+    }
+
+def _scenario_inputs(name, spec):
+    from benchmarks.synthetic import make_deck, make_template
+
+    decks = [(f"{name}_{i}.pptx", make_deck(seed=i, **spec["deck"])) for i in range(spec["decks"])]
+    template = make_template(seed=0, **spec.get("template", {}))
+    return template, decks
+
+def _run_inprocess(template_bytes, decks, repeat, warmup):
+    from backend.cache import sha256_hex
+    from backend.memory import PeakMemorySampler
+    from backend.pipeline import extract_deck, render_report
+
+    template_id = sha256_hex(template_bytes)
+
+    def once():
+        extracted = [extract_deck(filename, ppt_bytes) for filename, ppt_bytes in decks]
+        return render_report(template_id, template_bytes, extracted)
+
+    for _ in range(warmup):
+        once()
+    latencies = []
+    with PeakMemorySampler() as sampler:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            once()
+            latencies.append(time.perf_counter() - start)
+    return _summarize(latencies, len(decks), sampler)
+
+def _run_app(client, template_bytes, decks, repeat, warmup):
+    from backend.memory import PeakMemorySampler
+
+    files = [("word_template", ("template.docx", template_bytes))]
+    files += [("ppt_files", (filename, ppt_bytes)) for filename, ppt_bytes in decks]
+
+    def once():
+        response = client.post("/process-files/", files=files)
+        if response.status_code != 200:
+            raise RuntimeError(f"/process-files/ 回傳 {response.status_code}：{response.text[:200]}")
+
+    for _ in range(warmup):
+        once()
+    latencies = []
+    with PeakMemorySampler() as sampler:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            once()
+            latencies.append(time.perf_counter() - start)
+    return _summarize(latencies, len(decks), sampler)
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _environment(args):
+    from backend import config
+
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "executor_mode": config.EXECUTOR_MODE,
+        "executor_max_workers": config.EXECUTOR_MAX_WORKERS,
+        "extract_engine": config.EXTRACT_ENGINE,
+        "deck_cache_enabled": config.DECK_CACHE_ENABLED,
+        "report_cache_enabled": config.REPORT_CACHE_ENABLED,
+        "repeat": args.repeat,
+        "warmup": args.warmup,
+    }
+
+# 與基準結果比較，回傳退步的項目
+def compare(results, baseline, threshold):
+    regressions = []
+    print(f"\n與基準比較 (容許 {threshold:.0%})：")
+    print(f"{'case':>20} {'metric':>24} {'baseline':>10} {'current':>10} {'change':>8}")
+    for case, current in results.items():
+        previous = baseline.get(case)
+        if previous is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            flag = " !" if worse > threshold else ""
+            if flag:
+                regressions.append((case, metric, old, new))
+            print(f"{case:>20} {metric:>24} {old:>10.2f} {new:>10.2f} {change:>+7.1%}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="報告產生流程的整體效能量測")
+    parser.add_argument("--scenarios", default="small,medium", help=f"以逗號分隔：{', '.join(SCENARIOS)}, custom")
+    parser.add_argument("--modes", default=",".join(MODES), help="以逗號分隔：inprocess, app")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--cache", action="store_true", help="app 模式保留 PPT 擷取快取")
+    parser.add_argument("--save", help="將結果寫入 JSON 檔")
+    parser.add_argument("--compare", help="與先前存下的 JSON 結果比較；有退步時結束代碼為 1")
+    parser.add_argument("--threshold", type=float, default=0.15, help="視為退步的變化比例")
+    custom = parser.add_argument_group("custom 情境")
+    custom.add_argument("--decks", type=int, default=2)
+    custom.add_argument("--stage-tables", type=int, default=3)
+    custom.add_argument("--stage-rows", type=int, default=10)
+    custom.add_argument("--overview-tables", type=int, default=1)
+    custom.add_argument("--modification-tables", type=int, default=1)
+    custom.add_argument("--filler-slides", type=int, default=0)
+    custom.add_argument("--images-per-slide", type=int, default=0)
+    custom.add_argument("--image-size", type=int, default=256)
+    custom.add_argument("--template-paragraphs", type=int, default=10)
+    custom.add_argument("--template-images", type=int, default=0)
+    args = parser.parse_args()
+
+    scenarios = dict(SCENARIOS)
+    scenarios["custom"] = {
+        "decks": args.decks,
+        "deck": {
+            "stage_tables": args.stage_tables,
+            "stage_rows": args.stage_rows,
+            "overview_tables": args.overview_tables,
+            "modification_tables": args.modification_tables,
+            "filler_slides": args.filler_slides,
+            "images_per_slide": args.images_per_slide,
+            "image_size": args.image_size,
+        },
+        "template": {"paragraphs": args.template_paragraphs, "images": args.template_images},
+    }
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [name for name in names if name not in scenarios] + [mode for mode in modes if mode not in MODES]
+    if unknown:
+        parser.error(f"未知的情境或模式：{', '.join(unknown)}")
+
+    # 設定須在匯入 backend 之前決定
+    os.environ.setdefault("PMO_LOG_LEVEL", "WARNING")
+    if "app" in modes and not args.cache:
+        os.environ["PMO_DECK_CACHE_ENABLED"] = "0"
+        os.environ["PMO_REPORT_CACHE_ENABLED"] = "0"
+
+    client = None
+    if "app" in modes:
+        from fastapi.testclient import TestClient
+        from backend.main import app
+        client = TestClient(app)
+        client.__enter__()
+
+    results = {}
+    try:
+        print(f"{'case':>20} {'p50 (ms)':>10} {'p95 (ms)':>10} {'decks/s':>9} {'peak RSS (MB)':>14}")
+        for name in names:
+            template_bytes, decks = _scenario_inputs(name, scenarios[name])
+            for mode in modes:
+                if mode == "inprocess":
+                    result = _run_inprocess(template_bytes, decks, args.repeat, args.warmup)
+                else:
+                    result = _run_app(client, template_bytes, decks, args.repeat, args.warmup)
+                case = f"{name}/{mode}"
+                result["scenario"] = scenarios[name]
+                results[case] = result
+                print(f"{case:>20} {result['p50_ms']:>10.1f} {result['p95_ms']:>10.1f} "
+                      f"{result['throughput_decks_per_s']:>9.2f} {result['peak_rss_mb']:>14.1f}")
+    finally:
+        if client is not None:
+            client.__exit__(None, None, None)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"environment": _environment(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n結果已寫入 {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline.get("results", {}), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} 項指標退步超過 {args.threshold:.0%}。")
+            sys.exit(1)
+        print("\n沒有超過容許範圍的退步。")
+
+if __name__ == "__main__":
+    main()
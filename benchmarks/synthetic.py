@@ -0,0 +1,113 @@
+# PMO_Report_Automation/benchmarks/synthetic.py
+
+# 產生結構與實際專案月報相近的合成 PPT，供效能量測使用。
+
+import io
+import random
+
+from pptx import Presentation
+from pptx.util import Inches
+
+PROJECT_STAGE_HEADER = ["專案階段", "項次", "類別", "工作項目", "工作說明", "負責單位", "開始日期", "狀態", "預計完成", "備註"]
+PROJECT_STAGE_SUBHEADER = ["", "", "", "", "", "", "", "", "(實際)", "(說明)"]
+OWNERS = ["EY", "建置廠商", "第一保"]
+STATUSES = ["●正常完成", "●部分延遲", "●嚴重延遲"]
+
+def _add_table(slide, rows):
+    cols = max(len(row) for row in rows)
+    table = slide.shapes.add_table(len(rows), cols, Inches(0.2), Inches(1), Inches(9.5), Inches(5)).table
+    for r, row in enumerate(rows):
+        for c, value in enumerate(row):
+            table.cell(r, c).text = value
+    return table
+
+def _png_bytes(rnd, size):
+    from PIL import Image
+    buf = io.BytesIO()
+    Image.effect_noise((size, size), 64 + rnd.randrange(64)).convert("RGB").save(buf, "PNG")
+    return buf.getvalue()
+
+# 產生一份合成 PPT，回傳 .pptx 位元組。
+# stage_tables / modification_tables / overview_tables 分別為專案階段、程式修改、工作總覽表格數；
+# filler_slides 為不含擷取目標的一般投影片數 (用於調整總投影片數)；images_per_slide 與 image_size 控制內嵌圖片的份量；
+# summary_lines 為「本月概要」的行數；stage_header_only 為 True 時，專案階段表格前另有一個只有表頭一行的專案階段表格
+def make_deck(seed=0, stage_tables=3, stage_rows=10, modification_tables=1, images_per_slide=0, image_size=256,
+              overview_tables=1, filler_slides=0, summary_lines=8, stage_header_only=False):
+    rnd = random.Random(seed)
+    ppt = Presentation()
+    blank = ppt.slide_layouts[6]
+
+    slide = ppt.slides.add_slide(blank)
+    text_frame = slide.shapes.add_textbox(Inches(0.5), Inches(0.5), Inches(9), Inches(4)).text_frame
+    text_frame.text = "本月概要"
+    for i in range(summary_lines):
+        text_frame.add_paragraph().text = f"完成第 {i+1} 項工作　說明 {rnd.randrange(1000)}"
+    text_frame.add_paragraph().text = "本期主要成果"
+    text_frame.add_paragraph().text = "(此段不應被擷取)"
+
+    for o in range(overview_tables):
+        slide = ppt.slides.add_slide(blank)
+        _add_table(slide, [
+            ["工作總覽", ""],
+            ["時間:", "2024/05"],
+            ["階段:", "系統測試"],
+            ["總體狀態:", "正常"],
+            ["問題:", "無"],
+            ["說明:", f"第 {seed} 份合成月報" + (f" ({o + 1})" if o else "")],
+        ])
+
+    if stage_header_only:
+        _add_table(ppt.slides.add_slide(blank), [PROJECT_STAGE_HEADER])
+
+    for t in range(stage_tables):
+        slide = ppt.slides.add_slide(blank)
+        rows = [PROJECT_STAGE_HEADER, PROJECT_STAGE_SUBHEADER]
+        for r in range(stage_rows):
+            rows.append([
+                f"階段{t+1}", str(r + 1), "開發", f"工作項目 {t}-{r}",
+                f"1、需求確認 2、程式修改 3、測試驗證 {rnd.randrange(100)}",
+                rnd.choice(OWNERS), "2024/01/01", rnd.choice(STATUSES), "2024/06/30",
+                f"備註 {r}\n追蹤事項 {rnd.randrange(100)}",
+            ])
+        _add_table(slide, rows)
+        for _ in range(images_per_slide):
+            slide.shapes.add_picture(io.BytesIO(_png_bytes(rnd, image_size)), Inches(8), Inches(6), Inches(1))
+
+    for m in range(modification_tables):
+        slide = ppt.slides.add_slide(blank)
+        slide.shapes.add_textbox(Inches(0.5), Inches(0.2), Inches(9), Inches(0.8)).text_frame.text = \
+            "修改因重跑過程發現的問題所產生的程式修改"
+        rows = [["項次", "程式名稱", "修改說明"]]
+        for r in range(5):
+            rows.append([str(r + 1), f"PGM{m}{r:03d}", f"修正第 {r} 個問題"])
+        _add_table(slide, rows)
+
+    for f in range(filler_slides):
+        slide = ppt.slides.add_slide(blank)
+        text_frame = slide.shapes.add_textbox(Inches(0.5), Inches(0.5), Inches(9), Inches(5)).text_frame
+        text_frame.text = f"補充說明 {f + 1}"
+        for i in range(6):
+            text_frame.add_paragraph().text = f"說明事項 {i + 1}：{rnd.randrange(10000)}"
+        for _ in range(images_per_slide):
+            slide.shapes.add_picture(io.BytesIO(_png_bytes(rnd, image_size)), Inches(8), Inches(6), Inches(1))
+
+    output = io.BytesIO()
+    ppt.save(output)
+    return output.getvalue()
+
+# 產生一份合成 Word 範本，回傳 .docx 位元組；paragraphs 為範本內既有的段落數，images 為內嵌圖片數
+def make_template(seed=0, paragraphs=10, images=0, image_size=256):
+    from docx import Document
+    from docx.shared import Inches as DocxInches
+
+    rnd = random.Random(seed)
+    doc = Document()
+    doc.add_heading("專案管理月報", 1)
+    for i in range(paragraphs):
+        doc.add_paragraph(f"範本說明第 {i + 1} 段：{rnd.randrange(10000)}")
+    for _ in range(images):
+        doc.add_picture(io.BytesIO(_png_bytes(rnd, image_size)), width=DocxInches(1))
+
+    output = io.BytesIO()
+    doc.save(output)
+    return output.getvalue()